@@ -0,0 +1,3 @@
+from pyetbd.cli import main
+
+main()
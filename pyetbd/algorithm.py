@@ -1,6 +1,8 @@
+from dataclasses import dataclass
 from pyetbd.settings_classes import ScheduleSettings, ExperimentSettings
 from pyetbd.organisms import Organism
 from pyetbd.rules import selection
+from pyetbd.utils.instrumentation import Instrumentation
 from pyetbd.algorithm_strategies import (
     fdf_sampling_strategies,
     fitness_calculation_strategies,
@@ -11,6 +13,22 @@ from pyetbd.algorithm_strategies import (
 )
 
 
+@dataclass
+class StrategyBundle:
+    """
+    The six strategies the algorithm uses for one set of schedule settings.
+    """
+
+    fdf_sampling_strategy: fdf_sampling_strategies.SampleFDF
+    fitness_calculation_strategy: (
+        fitness_calculation_strategies.FitnessCalculationStrategy
+    )
+    selection_strategy: selection_strategies.SelectionStrategy
+    recombination_strategy: recombination_strategies.RecombinationStrategy
+    mutation_strategy: mutation_strategies.MutationStrategy
+    punishment_strategy: punishment_strategies.PunishmentStrategy
+
+
 class Algorithm:
     """The Algorithm class is responsible for running the reinforcement and punishment algorithms.
 
@@ -20,6 +38,8 @@ class Algorithm:
         ScheduleData: The settings from the schedule running the algorithm.
         Organism: The organism going through the algorithm.
         strategy_map: A dictionary that maps the strings from the input '.json' file to the corresponding strategy classes.
+        strategy_cache: A dictionary that maps the id of a settings object to the settings and the StrategyBundle compiled for them.
+        instrumentation: The instrumentation that times each phase of the algorithm, or None if the run isn't instrumented.
 
     """
 
@@ -28,14 +48,28 @@ class Algorithm:
         "exponential_fdf": fdf_sampling_strategies.ExponentialFDF,
         "rla": punishment_strategies.RLAPunishment,
         "fitness_search": selection_strategies.FitnessSearchSelection,
+        "fitness_exact": selection_strategies.FitnessExactSelection,
         "circular_landscape": fitness_calculation_strategies.CircularFitnessCalculation,
         "linear_landscape": fitness_calculation_strategies.LinearFitnessCalculation,
         "bitwise": recombination_strategies.BitwiseRecombination,
+        "bitwise_integer": recombination_strategies.BitwiseIntegerRecombination,
         "bit_flip": mutation_strategies.BitFlipMutation,
+        "bit_flip_integer": mutation_strategies.BitFlipIntegerMutation,
     }
 
     def __init__(self, organism: Organism):
         self.organism = organism
+        self.strategy_cache: dict[
+            int, tuple[ScheduleSettings | ExperimentSettings, StrategyBundle]
+        ] = {}
+        self.instrumentation: Instrumentation | None = None
+
+    def bind_arrangement(
+        self, settings: list[ScheduleSettings | ExperimentSettings]
+    ) -> None:
+        """Compiles the strategies for every settings object an arrangement can deliver, so that no strategy objects are constructed while the arrangement runs."""
+        for schedule_settings in settings:
+            self._get_strategies(schedule_settings)
 
     def set_schedule(
         self, schedule_settings: ScheduleSettings | ExperimentSettings
@@ -44,34 +78,83 @@ class Algorithm:
         self.schedule_setttings = schedule_settings
         self._set_strategies()
 
+    def _get_strategies(
+        self, schedule_settings: ScheduleSettings | ExperimentSettings
+    ) -> StrategyBundle:
+        """Gets the strategies for the schedule settings from the cache, compiling them the first time the settings object is seen.
+
+        The cache is keyed by the identity of the settings object, which is kept alive by the cache so its id cannot be reused.
+        """
+        cached = self.strategy_cache.get(id(schedule_settings))
+        if cached is None:
+            cached = (schedule_settings, self._compile_strategies(schedule_settings))
+            self.strategy_cache[id(schedule_settings)] = cached
+
+        return cached[1]
+
     def _set_strategies(self) -> None:
         """Sets the strategies for the algorithm based on the schedule data."""
+        strategies = self._get_strategies(self.schedule_setttings)
+
+        self.fdf_sampling_strategy = strategies.fdf_sampling_strategy
+        self.fitness_calculation_strategy = strategies.fitness_calculation_strategy
+        self.selection_strategy = strategies.selection_strategy
+        self.recombination_strategy = strategies.recombination_strategy
+        self.mutation_strategy = strategies.mutation_strategy
+        self.punishment_strategy = strategies.punishment_strategy
 
-        self.fdf_sampling_strategy = self.strategy_map[
-            self.schedule_setttings.fdf_type
-        ](self.schedule_setttings)
-        self.fitness_calculation_strategy = self.strategy_map[
-            self.schedule_setttings.fitness_landscape
+    def _compile_strategies(
+        self, schedule_settings: ScheduleSettings | ExperimentSettings
+    ) -> StrategyBundle:
+        """Creates the strategies for the schedule settings."""
+
+        fdf_sampling_strategy = self.strategy_map[schedule_settings.fdf_type](
+            schedule_settings
+        )
+        fitness_calculation_strategy = self.strategy_map[
+            schedule_settings.fitness_landscape
         ](self.organism)
-        self.selection_strategy = self.strategy_map[
-            self.schedule_setttings.selection_type
-        ](
+        selection_strategy = self.strategy_map[schedule_settings.selection_type](
             self.organism,
-            self.schedule_setttings,
-            self.fdf_sampling_strategy.get_sample_func(),
+            schedule_settings,
+            fdf_sampling_strategy.get_sample_func(),
+            fdf_sampling_strategy.get_pmf_func(),
         )
-        self.recombination_strategy = self.strategy_map[
-            self.schedule_setttings.recombination_method
+        recombination_strategy = self.strategy_map[
+            schedule_settings.recombination_method
         ](self.organism)
-        self.mutation_strategy = self.strategy_map[
-            self.schedule_setttings.mutation_method
-        ](self.organism, self.schedule_setttings)
-        self.punishment_strategy = self.strategy_map[
-            self.schedule_setttings.punishment_type
-        ](self.organism, self.schedule_setttings)
+        mutation_strategy = self.strategy_map[schedule_settings.mutation_method](
+            self.organism, schedule_settings
+        )
+
+        # the recombination strategy has to produce the genotypes the mutation strategy expects
+        if (
+            recombination_strategy.integer_genotypes
+            != mutation_strategy.integer_genotypes
+        ):
+            raise ValueError(
+                "Giddydowned: 'bitwise_integer' recombination must be paired with 'bit_flip_integer' mutation (and 'bitwise' with 'bit_flip')."
+            )
+
+        punishment_strategy = self.strategy_map[schedule_settings.punishment_type](
+            self.organism, schedule_settings, fdf_sampling_strategy.get_sample_func()
+        )
+
+        return StrategyBundle(
+            fdf_sampling_strategy,
+            fitness_calculation_strategy,
+            selection_strategy,
+            recombination_strategy,
+            mutation_strategy,
+            punishment_strategy,
+        )
 
     def run_reinforcement(self, reinforced: bool) -> None:
         """Runs the reinforcement algorithm."""
+        if self.instrumentation is not None:
+            self._run_reinforcement_instrumented(reinforced)
+            return
+
         if reinforced:
             # calculate the fitness values for the population
             self.organism.fitness_values = (
@@ -92,12 +175,33 @@ class Algorithm:
         # mutate the offspring based on the mutation strategy and replace the population with the offspring
         self.organism.population = self.mutation_strategy.mutate()
 
-    def run_punishment(self, punished: bool) -> None:
-        """Runs the punishment algorithm."""
-        # perform the punishment on the population
+    def _run_reinforcement_instrumented(self, reinforced: bool) -> None:
+        """Runs the reinforcement algorithm like run_reinforcement, lapping the instrumentation after each phase and counting the FDF draws of the selection."""
+        instrumentation = self.instrumentation
+        if reinforced:
+            self.organism.fitness_values = (
+                self.fitness_calculation_strategy.calculate_fitness()
+            )
+            instrumentation.lap("fitness_calculation")
 
-        # replace the organism's population with the new population from the punishment strategy
-        pass
+            self.organism.parents, draws = self.selection_strategy.select_counted()
+            instrumentation.fdf_draws += draws
+
+        else:
+            self.organism.parents = selection.randomly_select_parents(
+                self.organism.population
+            )
+        instrumentation.lap("selection")
+
+        self.organism.offspring_genos = self.recombination_strategy.recombine()
+        instrumentation.lap("recombination")
+        self.organism.population = self.mutation_strategy.mutate()
+        instrumentation.lap("mutation")
+
+    def run_punishment(self, punished: bool) -> None:
+        """Runs the punishment algorithm on the population from the reinforcement algorithm, which the punishment strategy updates in place."""
+        if punished:
+            self.organism.population = self.punishment_strategy.punish()
 
     def run(
         self,
@@ -113,8 +217,13 @@ class Algorithm:
         # run the reinforcement algorithm
         self.run_reinforcement(reinforced)
 
-        # set the schedule
-        self.set_schedule(punishment_schedule_settings)
+        # only the punishment strategy of the punishment schedule is needed, and only when punishment is delivered
+        if punished:
+            self.punishment_strategy = self._get_strategies(
+                punishment_schedule_settings
+            ).punishment_strategy
 
         # run the punishment algorithm
         self.run_punishment(punished)
+        if self.instrumentation is not None:
+            self.instrumentation.lap("punishment")
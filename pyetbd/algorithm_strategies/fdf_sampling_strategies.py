@@ -28,6 +28,13 @@ class SampleFDF(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_pmf_func(self) -> Callable:
+        """
+        An abstract method for getting the probability mass function of the samples.
+        """
+        ...
+
 
 class LinearFDF(SampleFDF):
     """
@@ -45,6 +52,15 @@ class LinearFDF(SampleFDF):
         """
         return fdfs.sample_linear_fdf
 
+    def get_pmf_func(self) -> Callable:
+        """
+        A method for getting the probability mass function of a linear fdf.
+
+        Returns:
+            Callable: A function that returns the probability of drawing a fitness value from a linear fdf.
+        """
+        return fdfs.linear_fdf_pmf
+
 
 class ExponentialFDF(SampleFDF):
     """
@@ -59,3 +75,12 @@ class ExponentialFDF(SampleFDF):
             Callable: A function that returns a sample from an exponential fdf.
         """
         return fdfs.sample_exponential_fdf
+
+    def get_pmf_func(self) -> Callable:
+        """
+        A method for getting the probability mass function of an exponential fdf.
+
+        Returns:
+            Callable: A function that returns the probability of drawing a fitness value from an exponential fdf.
+        """
+        return fdfs.exponential_fdf_pmf
@@ -10,8 +10,13 @@ class MutationStrategy(ABC):
     An abstract class representing a mutation strategy.
 
     This abstract class is used to ensure that any mutation strategy that inherits from it will work in the algorithm class.
+
+    Attributes:
+        integer_genotypes (bool): Whether the strategy mutates integer genotypes instead of arrays of bits.
     """
 
+    integer_genotypes = False
+
     def __init__(self, organism: Organism, schedule_settings: ScheduleSettings):
         """
         The constructor for the MutationStrategy class.
@@ -43,3 +48,21 @@ class BitFlipMutation(MutationStrategy):
         return mutation.bit_flip_mutate(
             self.organism.offspring_genos, self.schedule_settings.mut_rate
         )
+
+
+class BitFlipIntegerMutation(MutationStrategy):
+    """
+    A class representing a bit flip mutation strategy that keeps the genotypes as integers.
+    """
+
+    integer_genotypes = True
+
+    def mutate(self) -> ndarray:
+        """
+        A method for mutating an organism using bit flip mutation on integer genotypes.
+        """
+        return mutation.bit_flip_integer_mutate(
+            self.organism.offspring_genos,
+            self.organism.bin_length,
+            self.schedule_settings.mut_rate,
+        )
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Callable
 from pyetbd.rules import punishment
 from pyetbd.organisms import Organism
 from pyetbd.settings_classes import ScheduleSettings
@@ -12,16 +13,23 @@ class PunishmentStrategy(ABC):
     This abstract class is used to ensure that any punishment strategy that inherits from it will work in the algorithm class.
     """
 
-    def __init__(self, organism: Organism, schedule_settings: ScheduleSettings):
+    def __init__(
+        self,
+        organism: Organism,
+        schedule_settings: ScheduleSettings,
+        sample_func: Callable,
+    ):
         """
         The constructor for the PunishmentStrategy class.
 
         Parameters:
             organism (Organism): The organism.
             schedule_settings (ScheduleSettings): The schedule data.
+            sample_func (Callable): The sample function.
         """
         self.organism = organism
         self.schedule_settings = schedule_settings
+        self.sample_func = sample_func
 
     @abstractmethod
     def punish(self) -> ndarray:
@@ -33,12 +41,38 @@ class PunishmentStrategy(ABC):
 
 class RLAPunishment(PunishmentStrategy):
     """
-    A class representing a reinforcement learning algorithm punishment strategy.
+    A class representing a punishment strategy that replaces the behaviors near the punished behavior with random behaviors (see rules.punishment.rla_punishment).
     """
 
     def punish(self) -> ndarray:
         """
-        A method for punishing an organism using the RL algorithm.
+        A method for punishing an organism. The population is updated in place.
+
+        Returns:
+            ndarray: The punished population.
         """
+        circular = self.schedule_settings.fitness_landscape == "circular_landscape"
 
-        pass
+        bound_punishment = punishment.BOUND_RLA_PUNISHMENTS.get(self.sample_func)
+        if bound_punishment is not None:
+            bound_punishment(
+                self.organism.population,
+                self.organism.emitted,
+                self.schedule_settings.fdf_mean,
+                circular,
+                self.organism.low_pheno,
+                self.organism.high_pheno,
+            )
+
+        else:
+            punishment.rla_punishment(
+                self.organism.population,
+                self.organism.emitted,
+                self.schedule_settings.fdf_mean,
+                self.sample_func,
+                circular,
+                self.organism.low_pheno,
+                self.organism.high_pheno,
+            )
+
+        return self.organism.population
@@ -9,8 +9,13 @@ class RecombinationStrategy(ABC):
     An abstract class representing a recombination strategy.
 
     This abstract class is used to ensure that any recombination strategy that inherits from it will work in the algorithm class.
+
+    Attributes:
+        integer_genotypes (bool): Whether the strategy produces integer genotypes instead of arrays of bits.
     """
 
+    integer_genotypes = False
+
     def __init__(self, organism: Organism):
         """
         The constructor for the RecombinationStrategy class.
@@ -37,8 +42,22 @@ class BitwiseRecombination(RecombinationStrategy):
         """
         A method for recombining an organism using bitwise recombination.
         """
-        return recombination.recombine_parents(
-            self.organism.parents,
-            self.organism.bin_length,
-            recombination.bitwise_combine,
+        return recombination.bitwise_recombine(
+            self.organism.parents, self.organism.bin_length
+        )
+
+
+class BitwiseIntegerRecombination(RecombinationStrategy):
+    """
+    A class representing a bitwise recombination strategy that keeps the genotypes as integers.
+    """
+
+    integer_genotypes = True
+
+    def recombine(self) -> ndarray:
+        """
+        A method for recombining an organism using bitwise recombination on integer genotypes.
+        """
+        return recombination.bitwise_integer_recombine(
+            self.organism.parents, self.organism.bin_length
         )
@@ -18,6 +18,7 @@ class SelectionStrategy(ABC):
         organism: Organism,
         schedule_settings: ScheduleSettings,
         sample_func: Callable,
+        pmf_func: Callable | None = None,
     ):
         """
         The constructor for the SelectionStrategy class.
@@ -26,10 +27,12 @@ class SelectionStrategy(ABC):
             organism (Organism): The organism.
             schedule_settings (ScheduleSettings): The schedule data.
             sample_func (Callable): The sample function.
+            pmf_func (Callable, optional): The probability mass function of the samples.
         """
         self.organism = organism
         self.schedule_settings = schedule_settings
         self.sample_func = sample_func
+        self.pmf_func = pmf_func
 
     @abstractmethod
     def select(self) -> ndarray:
@@ -38,6 +41,14 @@ class SelectionStrategy(ABC):
         """
         pass
 
+    def select_counted(self) -> tuple[ndarray, int]:
+        """
+        A method for selecting an organism that also counts the fitness values drawn from the FDF. Used by instrumented runs.
+
+        By default every parent is one draw.
+        """
+        return self.select(), 2 * len(self.organism.population)
+
 
 class FitnessSearchSelection(SelectionStrategy):
     """
@@ -48,9 +59,63 @@ class FitnessSearchSelection(SelectionStrategy):
         """
         A method for selecting an organism using fitness search selection.
         """
+        bound_selection = selection.BOUND_SEARCH_SELECTIONS.get(self.sample_func)
+        if bound_selection is not None:
+            return bound_selection(
+                self.organism.population,
+                self.organism.fitness_values,
+                self.schedule_settings.fdf_mean,
+            )
+
         return selection.fitness_search_selection(
             self.organism.population,
             self.organism.fitness_values,
             self.schedule_settings.fdf_mean,
             self.sample_func,
         )
+
+    def select_counted(self) -> tuple[ndarray, int]:
+        """
+        A method for selecting an organism using fitness search selection that also counts the fitness values drawn from the FDF, including the draws that matched no member of the population.
+        """
+        bound_selection = selection.BOUND_COUNTED_SEARCH_SELECTIONS.get(
+            self.sample_func
+        )
+        if bound_selection is not None:
+            return bound_selection(
+                self.organism.population,
+                self.organism.fitness_values,
+                self.schedule_settings.fdf_mean,
+            )
+
+        return selection.counted_fitness_search_selection(
+            self.organism.population,
+            self.organism.fitness_values,
+            self.schedule_settings.fdf_mean,
+            self.sample_func,
+        )
+
+
+class FitnessExactSelection(SelectionStrategy):
+    """
+    A class representing a selection strategy that samples parents from the same distribution as fitness search selection without the search.
+    """
+
+    def select(self) -> ndarray:
+        """
+        A method for selecting an organism by sampling the FDF over the fitness values present in the population.
+        """
+        bound_selection = selection.BOUND_EXACT_SELECTIONS.get(self.pmf_func)
+        if bound_selection is not None:
+            return bound_selection(
+                self.organism.population,
+                self.organism.fitness_values,
+                self.schedule_settings.fdf_mean,
+            )
+
+        return selection.fitness_exact_selection(
+            self.organism.population,
+            self.organism.fitness_values,
+            self.schedule_settings.fdf_mean,
+            self.pmf_func,
+        )
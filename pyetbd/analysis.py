@@ -0,0 +1,380 @@
+import re
+import warnings
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+import numpy as np
+
+# pandas is only imported when a table is read or built
+if TYPE_CHECKING:
+    import pandas as pd
+
+# the columns of the outputs that aren't swept parameters
+OUTPUT_COLUMNS = ["Rep", "Sch", "Bin", "Gen", "Emissions"]
+SCHEDULE_COLUMN = re.compile(r"^[BRP]\d+$")
+
+
+@dataclass
+class RunCounts:
+    """
+    A class representing the binned response and reinforcer counts of the runs of an experiment, or of every point of a sweep, as dense arrays.
+
+    Runs that are missing from the data, e.g. because a sweep point has fewer repetitions than another, have no bins.
+
+    Attributes:
+        responses (np.ndarray): The (points, reps, arrangements, bins, schedules) response counts.
+        reinforcers (np.ndarray): The (points, reps, arrangements, bins, schedules) reinforcer counts.
+        num_bins (np.ndarray): The (points, reps, arrangements) number of bins of each run.
+        points (pd.Index | None): The values of the swept parameters at each point, or None if the data isn't from a sweep.
+    """
+
+    responses: np.ndarray
+    reinforcers: np.ndarray
+    num_bins: np.ndarray
+    points: "pd.Index | None" = None
+
+
+def get_run_counts(data: "pd.DataFrame", bin_width: int | None = None) -> RunCounts:
+    """
+    Gets the counts of the runs in a table of outputs in one pass, without grouping the table.
+
+    The table can be the binned data of a summary workbook's Data sheet (from DataSaver.get_summary or Experiment.run_summary), the results of a sweep (from load_sweep), where the swept parameters make up the points, or the per-generation output of an experiment (from load_output), which is summed into bins of bin_width generations of each run.
+
+    Args:
+        data (pd.DataFrame): The outputs.
+        bin_width (int, optional): The number of generations in each bin of per-generation output. Not used by binned data.
+
+    Returns:
+        RunCounts: The counts.
+    """
+    import pandas as pd
+
+    if any(name is not None for name in data.index.names):
+        data = data.reset_index()
+
+    num_schedules = sum(1 for column in data.columns if re.match(r"^B\d+$", column))
+    parameters = [
+        column
+        for column in data.columns
+        if column not in OUTPUT_COLUMNS and not SCHEDULE_COLUMN.match(column)
+    ]
+
+    if "Bin" in data:
+        bins = data["Bin"].to_numpy(np.int64)
+    elif "Gen" in data:
+        if bin_width is None:
+            raise ValueError(
+                "Giddydowned: The bin width is needed to bin per-generation output."
+            )
+        bins = data["Gen"].to_numpy(np.int64) // bin_width
+    else:
+        # the bins of each run are in order
+        bins = data.groupby(parameters + ["Rep", "Sch"], sort=False).cumcount()
+        bins = bins.to_numpy(np.int64)
+
+    if parameters:
+        point_codes, points = pd.factorize(
+            pd.MultiIndex.from_frame(data[parameters]), sort=True
+        )
+        points = points.set_names(parameters)
+        if len(parameters) == 1:
+            points = points.get_level_values(0)
+    else:
+        point_codes, points = np.zeros(len(data), dtype=np.int64), None
+
+    reps = data["Rep"].to_numpy(np.int64)
+    arrangements = data["Sch"].to_numpy(np.int64)
+    shape = (
+        point_codes.max() + 1,
+        reps.max() + 1,
+        arrangements.max() + 1,
+        bins.max() + 1,
+    )
+
+    # sum the rows into their (point, rep, arrangement, bin) cells
+    cells = np.ravel_multi_index((point_codes, reps, arrangements, bins), shape)
+    size = int(np.prod(shape))
+
+    def count(prefix: str) -> np.ndarray:
+        return np.stack(
+            [
+                np.bincount(
+                    cells, weights=data[f"{prefix}{i+1}"].to_numpy(), minlength=size
+                )
+                for i in range(num_schedules)
+            ],
+            axis=-1,
+        ).reshape(shape + (num_schedules,))
+
+    filled = np.bincount(cells, minlength=size).reshape(shape) > 0
+    num_bins = np.where(
+        filled.any(axis=-1), shape[-1] - np.argmax(filled[..., ::-1], axis=-1), 0
+    )
+
+    return RunCounts(count("B"), count("R"), num_bins, points)
+
+
+def get_bin_mask(
+    counts: RunCounts, exclude_bins: int = 0, last_bins: int | None = None
+) -> np.ndarray:
+    """
+    Gets which bins of each run are analyzed.
+
+    Args:
+        counts (RunCounts): The counts.
+        exclude_bins (int, optional): The number of bins at the start of each run to leave out, e.g. while the behavior settles. Defaults to 0.
+        last_bins (int, optional): The number of bins at the end of each run to analyze. Defaults to None, which analyzes every bin after the excluded ones.
+
+    Returns:
+        np.ndarray: The (points, reps, arrangements, bins) mask of the analyzed bins.
+    """
+    bins = np.arange(counts.responses.shape[3])
+    num_bins = counts.num_bins[..., None]
+
+    mask = (bins >= exclude_bins) & (bins < num_bins)
+    if last_bins is not None:
+        mask &= bins >= num_bins - last_bins
+
+    return mask
+
+
+def get_log_ratios(
+    counts: RunCounts,
+    exclude_bins: int = 0,
+    last_bins: int | None = None,
+    schedules: tuple[int, int] = (1, 2),
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gets the log response and reinforcement ratios of each run, from the counts summed over the analyzed bins.
+
+    Args:
+        counts (RunCounts): The counts.
+        exclude_bins (int, optional): The number of bins at the start of each run to leave out. Defaults to 0.
+        last_bins (int, optional): The number of bins at the end of each run to analyze. Defaults to None, which analyzes every bin after the excluded ones.
+        schedules (tuple[int, int], optional): The numbers of the two schedules, as in the B1 and B2 columns. Defaults to (1, 2).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (points, reps, arrangements) log10 response ratios and log10 reinforcement ratios. A ratio with a zero count is NaN.
+    """
+    first, second = schedules[0] - 1, schedules[1] - 1
+    mask = get_bin_mask(counts, exclude_bins, last_bins)[..., None]
+
+    responses = np.where(mask, counts.responses, 0).sum(axis=3)
+    reinforcers = np.where(mask, counts.reinforcers, 0).sum(axis=3)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_b = np.log10(responses[..., first] / responses[..., second])
+        log_r = np.log10(reinforcers[..., first] / reinforcers[..., second])
+
+    log_b[~np.isfinite(log_b)] = np.nan
+    log_r[~np.isfinite(log_r)] = np.nan
+
+    return log_b, log_r
+
+
+def _get_fit_sums(log_b: np.ndarray, log_r: np.ndarray) -> np.ndarray:
+    """
+    Gets the sums a least-squares fit needs from the runs with both ratios, summed over the last axis.
+
+    Returns:
+        np.ndarray: The count, sum of x, sum of y, sum of x squared, sum of x times y and sum of y squared along a new last axis.
+    """
+    valid = np.isfinite(log_b) & np.isfinite(log_r)
+    x = np.where(valid, log_r, 0.0)
+    y = np.where(valid, log_b, 0.0)
+
+    return np.stack(
+        [
+            valid.sum(axis=-1),
+            x.sum(axis=-1),
+            y.sum(axis=-1),
+            (x * x).sum(axis=-1),
+            (x * y).sum(axis=-1),
+            (y * y).sum(axis=-1),
+        ],
+        axis=-1,
+    ).astype(np.float64)
+
+
+def _fit_sums(sums: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fits lines to the sums from _get_fit_sums.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The slopes, intercepts and coefficients of determination, which are NaN without two distinct reinforcement ratios.
+    """
+    n, sx, sy, sxx, sxy, syy = np.moveaxis(sums, -1, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cxx = sxx - sx * sx / n
+        cxy = sxy - sx * sy / n
+        cyy = syy - sy * sy / n
+
+        fitted = (n >= 2) & (cxx > 1e-12 * np.maximum(sxx, 1.0))
+        slope = np.where(fitted, cxy / cxx, np.nan)
+        intercept = np.where(fitted, (sy - slope * sx) / n, np.nan)
+        r_squared = np.where(fitted, cxy * cxy / (cxx * cyy), np.nan)
+
+    return slope, intercept, r_squared
+
+
+def fit_matching(log_b: np.ndarray, log_r: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Fits the generalized matching law, log(B1/B2) = a log(R1/R2) + log b, to the runs of each point, across every repetition and schedule arrangement.
+
+    Args:
+        log_b (np.ndarray): The (points, reps, arrangements) log response ratios from get_log_ratios.
+        log_r (np.ndarray): The (points, reps, arrangements) log reinforcement ratios from get_log_ratios.
+
+    Returns:
+        dict[str, np.ndarray]: The sensitivity a, the bias log b, the r_squared of the fit and the n of runs fitted at each point.
+    """
+    sums = _get_fit_sums(log_b, log_r).sum(axis=1)
+    sensitivity, bias, r_squared = _fit_sums(sums)
+
+    return {
+        "sensitivity": sensitivity,
+        "bias": bias,
+        "r_squared": r_squared,
+        "n": sums[..., 0].astype(np.int64),
+    }
+
+
+def bootstrap_matching(
+    log_b: np.ndarray,
+    log_r: np.ndarray,
+    num_samples: int = 1000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Gets percentile bootstrap confidence intervals of the sensitivity and bias of each point by resampling its repetitions with replacement.
+
+    A resample only needs how many times each repetition was drawn, so the fits of every resample of every point are computed together from the sums of each repetition. The points with the same number of repetitions share the resamples.
+
+    Args:
+        log_b (np.ndarray): The (points, reps, arrangements) log response ratios from get_log_ratios.
+        log_r (np.ndarray): The (points, reps, arrangements) log reinforcement ratios from get_log_ratios.
+        num_samples (int, optional): The number of resamples. Defaults to 1000.
+        confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+        seed (int, optional): The seed of the resamples. Defaults to None.
+
+    Returns:
+        dict[str, np.ndarray]: The sensitivity_low, sensitivity_high, bias_low and bias_high of each point.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Giddydowned: The confidence must be between 0 and 1.")
+
+    rng = np.random.default_rng(seed)
+    rep_sums = _get_fit_sums(log_b, log_r)
+
+    # move the repetitions with runs to fit to the front
+    has_runs = rep_sums[..., 0] > 0
+    order = np.argsort(~has_runs, axis=1, kind="stable")
+    rep_sums = np.take_along_axis(rep_sums, order[..., None], axis=1)
+    num_reps = has_runs.sum(axis=1)
+
+    quantiles = [(1 - confidence) / 2, (1 + confidence) / 2]
+    intervals = np.full((2, 2, len(num_reps)), np.nan)
+    for reps in np.unique(num_reps[num_reps > 0]):
+        points = num_reps == reps
+        draws = rng.multinomial(reps, np.full(reps, 1 / reps), size=num_samples)
+
+        sums = np.einsum("sr,prc->psc", draws, rep_sums[points, :reps])
+        sensitivity, bias, _ = _fit_sums(sums)
+
+        # points whose resamples can't all be fitted get NaN intervals
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            intervals[0][:, points] = np.nanquantile(sensitivity, quantiles, axis=1)
+            intervals[1][:, points] = np.nanquantile(bias, quantiles, axis=1)
+
+    return {
+        "sensitivity_low": intervals[0][0],
+        "sensitivity_high": intervals[0][1],
+        "bias_low": intervals[1][0],
+        "bias_high": intervals[1][1],
+    }
+
+
+def get_ratios(
+    data: "pd.DataFrame",
+    exclude_bins: int = 0,
+    last_bins: int | None = None,
+    schedules: tuple[int, int] = (1, 2),
+    bin_width: int | None = None,
+) -> "pd.DataFrame":
+    """
+    Gets the response and reinforcement ratios of every run in a table of outputs.
+
+    Args:
+        data (pd.DataFrame): The outputs (see get_run_counts).
+        exclude_bins (int, optional): The number of bins at the start of each run to leave out. Defaults to 0.
+        last_bins (int, optional): The number of bins at the end of each run to analyze. Defaults to None, which analyzes every bin after the excluded ones.
+        schedules (tuple[int, int], optional): The numbers of the two schedules, as in the B1 and B2 columns. Defaults to (1, 2).
+        bin_width (int, optional): The number of generations in each bin of per-generation output. Not used by binned data.
+
+    Returns:
+        pd.DataFrame: The response and reinforcement ratios and their log10 of each run, indexed by the swept parameters, the repetition and the schedule arrangement. A ratio with a zero count is NaN.
+    """
+    import pandas as pd
+
+    counts = get_run_counts(data, bin_width)
+    log_b, log_r = get_log_ratios(counts, exclude_bins, last_bins, schedules)
+
+    runs = np.nonzero(counts.num_bins > 0)
+    index = pd.DataFrame({"Rep": runs[1], "Sch": runs[2]})
+    if counts.points is not None:
+        points = counts.points.to_frame(index=False).iloc[runs[0]]
+        index = pd.concat([points.reset_index(drop=True), index], axis=1)
+
+    b_name = f"B{schedules[0]}/B{schedules[1]}"
+    r_name = f"R{schedules[0]}/R{schedules[1]}"
+    return pd.DataFrame(
+        {
+            b_name: 10 ** log_b[runs],
+            r_name: 10 ** log_r[runs],
+            f"log10({b_name})": log_b[runs],
+            f"log10({r_name})": log_r[runs],
+        },
+        index=pd.MultiIndex.from_frame(index),
+    )
+
+
+def analyze_matching(
+    data: "pd.DataFrame",
+    exclude_bins: int = 0,
+    last_bins: int | None = None,
+    schedules: tuple[int, int] = (1, 2),
+    bin_width: int | None = None,
+    num_samples: int = 1000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> "pd.DataFrame":
+    """
+    Fits the generalized matching law to the runs in a table of outputs, with bootstrap confidence intervals across the repetitions.
+
+    Every point of a sweep gets its own fit, so the results of thousands of points are analyzed in one pass.
+
+    Args:
+        data (pd.DataFrame): The outputs (see get_run_counts).
+        exclude_bins (int, optional): The number of bins at the start of each run to leave out. Defaults to 0.
+        last_bins (int, optional): The number of bins at the end of each run to analyze. Defaults to None, which analyzes every bin after the excluded ones.
+        schedules (tuple[int, int], optional): The numbers of the two schedules, as in the B1 and B2 columns. Defaults to (1, 2).
+        bin_width (int, optional): The number of generations in each bin of per-generation output. Not used by binned data.
+        num_samples (int, optional): The number of bootstrap resamples. Defaults to 1000. 0 leaves out the confidence intervals.
+        confidence (float, optional): The confidence level of the intervals. Defaults to 0.95.
+        seed (int, optional): The seed of the bootstrap resamples. Defaults to None.
+
+    Returns:
+        pd.DataFrame: The sensitivity, bias (log b), r_squared and n of runs of each point, and the confidence intervals, indexed by the swept parameters.
+    """
+    import pandas as pd
+
+    counts = get_run_counts(data, bin_width)
+    log_b, log_r = get_log_ratios(counts, exclude_bins, last_bins, schedules)
+
+    results = fit_matching(log_b, log_r)
+    if num_samples > 0:
+        results.update(bootstrap_matching(log_b, log_r, num_samples, confidence, seed))
+
+    return pd.DataFrame(results, index=counts.points)
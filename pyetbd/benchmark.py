@@ -0,0 +1,403 @@
+import contextlib
+import io
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import timeit
+from dataclasses import replace
+from typing import Callable
+import numba
+import numpy as np
+from pyetbd.compiled_arrangement import CompiledSchedules
+from pyetbd.experiment import Experiment
+from pyetbd.organisms import Organism
+from pyetbd.result_cache import get_code_version
+from pyetbd.rules import fdfs, fitness_calculation, mutation, recombination, selection
+from pyetbd.schedules import (
+    RandomIntervalSchedule,
+    Schedule,
+    build_response_class_table,
+)
+from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
+from pyetbd.utils import binary_converter as bc
+from pyetbd.utils import random_streams
+
+# the values each benchmark is swept over
+BENCHMARK_GRID = {
+    "pop_size": [100, 1000],
+    "high_pheno": [1023, 4095],
+    "fdf_mean": [50.0, 200.0],
+    "schedules": [2, 4],
+}
+# a single small case of every benchmark for a quick check
+QUICK_BENCHMARK_GRID = {
+    "pop_size": [100],
+    "high_pheno": [1023],
+    "fdf_mean": [50.0],
+    "schedules": [2],
+}
+BENCHMARK_ENGINES = ["python", "compiled"]
+
+
+def _time(func: Callable, repeat: int, number: int) -> tuple[float, float]:
+    """
+    Times a function like timeit, after one call to load or compile any jitted kernels it uses.
+
+    Args:
+        func (Callable): The function to time.
+        repeat (int): The number of timings.
+        number (int): The number of calls in each timing.
+
+    Returns:
+        tuple[float, float]: The best and the median time per call, in seconds.
+    """
+    func()
+    timings = [t / number for t in timeit.Timer(func).repeat(repeat, number)]
+    return min(timings), statistics.median(timings)
+
+
+def _create_arrangement(num_schedules: int, high_pheno: int) -> list[Schedule]:
+    """
+    Creates an arrangement of random interval schedules with response classes spread over the phenotypes.
+
+    Args:
+        num_schedules (int): The number of schedules.
+        high_pheno (int): The maximum possible phenotype.
+
+    Returns:
+        list[Schedule]: The schedule arrangement.
+    """
+    class_width = (high_pheno + 1) // num_schedules
+    return [
+        RandomIntervalSchedule(
+            ScheduleSettings(
+                mean=20 * (i + 1),
+                response_class_lower_bound=i * class_width,
+                response_class_upper_bound=i * class_width + 41,
+            )
+        )
+        for i in range(num_schedules)
+    ]
+
+
+def benchmark_kernels(
+    pop_size: int, high_pheno: int, fdf_mean: float, repeat: int = 5
+) -> list[dict]:
+    """
+    Times the rule kernels of one generation of the algorithm on a random population.
+
+    Args:
+        pop_size (int): The population size.
+        high_pheno (int): The maximum possible phenotype.
+        fdf_mean (float): The mean of the FDF.
+        repeat (int, optional): The number of timings of each kernel. Defaults to 5.
+
+    Returns:
+        list[dict]: The result of each kernel.
+    """
+    organism = Organism(pop_size, 0, high_pheno)
+    population = organism.population
+    emitted = int(population[0])
+    fitness_values = fitness_calculation.get_circular_fitness_values(
+        population, emitted, high_pheno
+    )
+    parents = selection.BOUND_SEARCH_SELECTIONS[fdfs.sample_linear_fdf](
+        population, fitness_values, fdf_mean
+    )
+    children_genos = recombination.bitwise_recombine(parents, organism.bin_length)
+
+    kernels = {
+        "fitness_calculation": lambda: fitness_calculation.get_circular_fitness_values(
+            population, emitted, high_pheno
+        ),
+        "fitness_search_selection": lambda: selection.BOUND_SEARCH_SELECTIONS[
+            fdfs.sample_linear_fdf
+        ](population, fitness_values, fdf_mean),
+        "fitness_exact_selection": lambda: selection.BOUND_EXACT_SELECTIONS[
+            fdfs.linear_fdf_pmf
+        ](population, fitness_values, fdf_mean),
+        "recombination": lambda: recombination.bitwise_recombine(
+            parents, organism.bin_length
+        ),
+        "bit_flip_mutate": lambda: mutation.bit_flip_mutate(children_genos, 0.1),
+        "binary_conversion": lambda: bc.convert_binary_to_decimal(children_genos),
+    }
+
+    params = {"pop_size": pop_size, "high_pheno": high_pheno, "fdf_mean": fdf_mean}
+    # keep each timing around a millisecond so the fast kernels aren't dominated by the call overhead
+    number = max(1, 100_000 // pop_size)
+    results = []
+    for name, kernel in kernels.items():
+        best, median = _time(kernel, repeat, number)
+        results.append(
+            {"benchmark": name, "params": params, "seconds": best, "median": median}
+        )
+
+    return results
+
+
+def benchmark_schedules(
+    num_schedules: int, high_pheno: int, repeat: int = 5, emissions: int = 10_000
+) -> dict:
+    """
+    Times the schedule evaluation of the python engine: the response class lookup and the CompiledSchedules.run call that advances every schedule in an arrangement for an emitted behavior.
+
+    Args:
+        num_schedules (int): The number of schedules in the arrangement.
+        high_pheno (int): The maximum possible phenotype.
+        repeat (int, optional): The number of timings. Defaults to 5.
+        emissions (int, optional): The number of emitted behaviors evaluated in each timing. Defaults to 10,000.
+
+    Returns:
+        dict: The result, with the time per emitted behavior.
+    """
+    arrangement = _create_arrangement(num_schedules, high_pheno)
+    # look up the response classes in a table like the experiments do
+    table = build_response_class_table(arrangement, 2 ** len(bin(high_pheno)[2:]))
+    schedules = CompiledSchedules(arrangement)
+    emitted = np.random.randint(0, high_pheno + 1, emissions).tolist()
+
+    def evaluate():
+        for behavior in emitted:
+            schedules.run(int(table[behavior]))
+
+    best, median = _time(evaluate, repeat, 1)
+    return {
+        "benchmark": "run_schedules",
+        "params": {"schedules": num_schedules, "high_pheno": high_pheno},
+        "seconds": best / emissions,
+        "median": median / emissions,
+    }
+
+
+def benchmark_experiment(
+    engine: str,
+    pop_size: int,
+    high_pheno: int,
+    fdf_mean: float,
+    num_schedules: int,
+    gens: int = 2000,
+    reps: int = 2,
+) -> dict:
+    """
+    Times a whole Experiment.run and reports its throughput in generations per second. The experiment is summary-only, so the throughput isn't dominated by writing the per-generation output.
+
+    Args:
+        engine (str): The engine to run the experiment with.
+        pop_size (int): The population size.
+        high_pheno (int): The maximum possible phenotype.
+        fdf_mean (float): The mean of the FDF.
+        num_schedules (int): The number of schedules in the arrangement.
+        gens (int, optional): The number of generations of each repetition. Defaults to 2000.
+        reps (int, optional): The number of repetitions. Defaults to 2.
+
+    Returns:
+        dict: The result, with the time per generation and the generations per second.
+    """
+    settings = ExperimentSettings(
+        file_stub="benchmark",
+        reps=reps,
+        gens=gens,
+        pop_size=pop_size,
+        high_pheno=high_pheno,
+        fdf_mean=fdf_mean,
+        engine=engine,
+        summary_only=True,
+        seed=0,
+    )
+
+    def run_experiment(settings, output_dir):
+        experiment = Experiment(
+            settings,
+            [_create_arrangement(num_schedules, high_pheno)],
+            False,
+            output_dir,
+        )
+        # hide the messages the run prints
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            experiment.run()
+            return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # load or compile the kernels first
+        run_experiment(replace(settings, reps=1, gens=2), temp_dir + "/")
+        elapsed = run_experiment(settings, temp_dir + "/")
+    total_gens = reps * gens
+
+    return {
+        "benchmark": "experiment_run",
+        "params": {
+            "engine": engine,
+            "pop_size": pop_size,
+            "high_pheno": high_pheno,
+            "fdf_mean": fdf_mean,
+            "schedules": num_schedules,
+        },
+        "seconds": elapsed / total_gens,
+        "median": elapsed / total_gens,
+        "gens_per_second": total_gens / elapsed,
+    }
+
+
+def get_environment() -> dict:
+    """
+    Gets the versions and the machine the benchmarks ran on, so results from different commits and machines can be told apart.
+
+    Returns:
+        dict: The environment.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "code_version": get_code_version(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_benchmarks(
+    grid: dict[str, list] | None = None,
+    engines: list[str] | None = None,
+    gens: int = 2000,
+    log_progress: bool = True,
+) -> dict:
+    """
+    Runs the benchmark suite: every rule kernel over pop_size, high_pheno and fdf_mean, the schedule evaluation over the schedules per arrangement, and Experiment.run with each engine over the whole grid.
+
+    Args:
+        grid (dict[str, list], optional): The values of pop_size, high_pheno, fdf_mean and schedules to sweep. Defaults to BENCHMARK_GRID.
+        engines (list[str], optional): The engines to time Experiment.run with. Defaults to BENCHMARK_ENGINES.
+        gens (int, optional): The number of generations of each repetition of the timed experiments. Defaults to 2000.
+        log_progress (bool, optional): Flag indicating whether to print each result. Defaults to True.
+
+    Returns:
+        dict: The environment and the results, which can be saved with save_results.
+    """
+    grid = BENCHMARK_GRID if grid is None else grid
+    engines = BENCHMARK_ENGINES if engines is None else engines
+    random_streams.seed_stream(0)
+    results = []
+
+    def add(result):
+        results.append(result)
+        if log_progress:
+            print(format_result(result))
+
+    for pop_size, high_pheno, fdf_mean in itertools.product(
+        grid["pop_size"], grid["high_pheno"], grid["fdf_mean"]
+    ):
+        for result in benchmark_kernels(pop_size, high_pheno, fdf_mean):
+            add(result)
+
+    for num_schedules, high_pheno in itertools.product(
+        grid["schedules"], grid["high_pheno"]
+    ):
+        add(benchmark_schedules(num_schedules, high_pheno))
+
+    for engine, pop_size, high_pheno, fdf_mean, num_schedules in itertools.product(
+        engines,
+        grid["pop_size"],
+        grid["high_pheno"],
+        grid["fdf_mean"],
+        grid["schedules"],
+    ):
+        add(
+            benchmark_experiment(
+                engine, pop_size, high_pheno, fdf_mean, num_schedules, gens
+            )
+        )
+
+    return {"environment": get_environment(), "results": results}
+
+
+def format_result(result: dict) -> str:
+    """
+    Formats a result as a line of text.
+
+    Args:
+        result (dict): The result.
+
+    Returns:
+        str: The formatted result.
+    """
+    params = " ".join(f"{name}={value}" for name, value in result["params"].items())
+    line = f"{result['benchmark']:<26} {params:<70} {result['seconds'] * 1e6:>12.2f} us"
+    if "gens_per_second" in result:
+        line += f" {result['gens_per_second']:>12,.0f} gens/s"
+
+    return line
+
+
+def save_results(results: dict, path: str) -> None:
+    """
+    Saves the results of run_benchmarks as JSON.
+
+    Args:
+        results (dict): The results.
+        path (str): The path of the '.json' file.
+    """
+    with open(path, "w") as f:
+        json.dump(results, f, indent=4)
+
+
+def load_results(path: str) -> dict:
+    """
+    Loads results saved by save_results.
+
+    Args:
+        path (str): The path of the '.json' file.
+
+    Returns:
+        dict: The results.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float = 0.1
+) -> list[tuple[dict, float]]:
+    """
+    Compares two sets of results and finds the benchmarks that got slower.
+
+    Args:
+        baseline (dict): The results to compare against, e.g. from the previous commit.
+        current (dict): The new results.
+        threshold (float, optional): How much slower a benchmark has to get to count as a regression, as a fraction of its baseline time. Defaults to 0.1.
+
+    Returns:
+        list[tuple[dict, float]]: The current result and the ratio of its time to the baseline time of each regression.
+    """
+
+    def get_key(result):
+        return result["benchmark"], json.dumps(result["params"], sort_keys=True)
+
+    baseline_times = {
+        get_key(result): result["seconds"] for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        baseline_time = baseline_times.get(get_key(result))
+        if baseline_time is None:
+            continue
+
+        ratio = result["seconds"] / baseline_time
+        if ratio > 1 + threshold:
+            regressions.append((result, ratio))
+
+    return regressions
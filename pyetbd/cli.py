@@ -0,0 +1,182 @@
+import argparse
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    Runs the experiments in an input file.
+    """
+    from pyetbd.experiment_runner import ExperimentRunner
+
+    runner = ExperimentRunner(
+        args.input_file,
+        args.output_dir,
+        not args.quiet,
+        args.jobs,
+        args.resume,
+        args.cache_dir,
+        args.cache_size * 2**20,
+    )
+    runner.giddyup()
+
+
+def sweep(args: argparse.Namespace) -> None:
+    """
+    Runs the parameter sweeps in an input file.
+    """
+    from pyetbd.sweep import SweepRunner
+
+    runner = SweepRunner(args.input_file, args.output_dir, not args.quiet, args.jobs)
+    runner.giddyup()
+
+
+def benchmark(args: argparse.Namespace) -> None:
+    """
+    Runs the benchmark suite, saves the results and compares them with a baseline.
+    """
+    from pyetbd import benchmark
+
+    grid = benchmark.QUICK_BENCHMARK_GRID if args.quick else None
+    results = benchmark.run_benchmarks(grid, gens=args.gens)
+    benchmark.save_results(results, args.output)
+    print(f"Saved the results to {args.output}")
+
+    if args.compare:
+        baseline = benchmark.load_results(args.compare)
+        regressions = benchmark.compare_results(baseline, results, args.threshold)
+        print(f"{len(regressions)} regressions against {args.compare}")
+        for result, ratio in regressions:
+            print(f"{benchmark.format_result(result)} {ratio:.2f}x slower")
+
+
+def precompile(args: argparse.Namespace) -> None:
+    """
+    Compiles the jitted kernels into the on-disk cache.
+    """
+    from pyetbd.precompile import precompile
+
+    print("Compiling kernels...")
+    print(r"Compile time elapsed: %.3f" % precompile())
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """
+    Creates the parser for the pyetbd command line interface.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pyetbd",
+        description="McDowell's (2004) ETBD implemented in Python.",
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run the experiments in an input '.json' file."
+    )
+    run_parser.add_argument("input_file", help="The path to the input '.json' file.")
+    run_parser.add_argument(
+        "-o",
+        "--output-dir",
+        default="",
+        help="The directory to save the output in (must end with a '/'). Defaults to the current directory.",
+    )
+    run_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of worker processes to run the repetitions and schedule arrangements on. Without a seed, parallel repetitions don't carry their population and schedule state over like serial ones. Defaults to 1.",
+    )
+    run_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Don't log the progress."
+    )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume interrupted experiments from their checkpoints and skip the ones that already finished.",
+    )
+    run_parser.add_argument(
+        "--cache-dir",
+        help="A directory to cache the results of seeded experiments in, so that only the repetitions and schedule arrangements whose settings changed are run again.",
+    )
+    run_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="The size in MB the result cache is kept under. Defaults to 1024.",
+    )
+    run_parser.set_defaults(func=run)
+
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        help="Run the parameter sweeps in an input '.json' file and save the results of each sweep to one table.",
+    )
+    sweep_parser.add_argument("input_file", help="The path to the input '.json' file.")
+    sweep_parser.add_argument(
+        "-o",
+        "--output-dir",
+        default="",
+        help="The directory to save the results in (must end with a '/'). Defaults to the current directory.",
+    )
+    sweep_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of worker processes to run the points of the sweeps on. Defaults to 1.",
+    )
+    sweep_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Don't log the progress."
+    )
+    sweep_parser.set_defaults(func=sweep)
+
+    benchmark_parser = subparsers.add_parser(
+        "benchmark",
+        help="Time the rule kernels and the generations per second of each engine, and save the results as JSON.",
+    )
+    benchmark_parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark_results.json",
+        help="The path to save the results to. Defaults to 'benchmark_results.json'.",
+    )
+    benchmark_parser.add_argument(
+        "--compare",
+        help="The results of an earlier run (e.g. from the previous commit) to report regressions against.",
+    )
+    benchmark_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="How much slower a benchmark has to get to count as a regression, as a fraction. Defaults to 0.1.",
+    )
+    benchmark_parser.add_argument(
+        "--gens",
+        type=int,
+        default=2000,
+        help="The number of generations of each repetition of the timed experiments. Defaults to 2000.",
+    )
+    benchmark_parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Only run the smallest case of every benchmark.",
+    )
+    benchmark_parser.set_defaults(func=benchmark)
+
+    precompile_parser = subparsers.add_parser(
+        "precompile",
+        help="Compile the jitted kernels into the on-disk cache so that later runs start without compiling.",
+    )
+    precompile_parser.set_defaults(func=precompile)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = create_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
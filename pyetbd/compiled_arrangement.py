@@ -0,0 +1,259 @@
+import numpy as np
+from pyetbd.organisms import Organism
+from pyetbd.schedules import (
+    Schedule,
+    IntervalSchedule,
+    RandomSchedule,
+    build_response_class_table,
+)
+from pyetbd.settings_classes import ScheduleSettings, ExperimentSettings
+from pyetbd.rules import generation
+from pyetbd.data_saver import create_block
+
+
+class CompiledSchedules:
+    """
+    Represents the schedules of an arrangement as a struct of arrays, which rules.generation.run_schedules advances by one generation with a single jitted call instead of a method call per schedule.
+
+    The counts and count requirements are copied from the Schedule objects by load and back to them by store, so the schedules carry their state between runs (and into checkpoints) just like in the python engine.
+
+    Args:
+        arrangement (list[Schedule]): The schedules in the arrangement.
+
+    Attributes:
+        arrangement (list[Schedule]): The schedules in the arrangement.
+        kinds (np.ndarray): INTERVAL or RATIO for each schedule.
+        variabilities (np.ndarray): FIXED or RANDOM for each schedule.
+        means (np.ndarray): The mean count requirement of each schedule.
+        is_reinforcement (np.ndarray): Whether each schedule delivers reinforcement (or punishment).
+        counts (np.ndarray): The count of each schedule.
+        count_requirements (np.ndarray): The current count requirement of each schedule.
+    """
+
+    def __init__(self, arrangement: list[Schedule]):
+        self.arrangement = arrangement
+        self.kinds = np.array(
+            [
+                (
+                    generation.INTERVAL
+                    if isinstance(schedule, IntervalSchedule)
+                    else generation.RATIO
+                )
+                for schedule in arrangement
+            ],
+            dtype=np.int8,
+        )
+        self.variabilities = np.array(
+            [
+                (
+                    generation.RANDOM
+                    if isinstance(schedule, RandomSchedule)
+                    else generation.FIXED
+                )
+                for schedule in arrangement
+            ],
+            dtype=np.int8,
+        )
+        self.means = np.array(
+            [schedule.settings.mean for schedule in arrangement], dtype=np.float64
+        )
+        self.is_reinforcement = np.array(
+            [schedule.settings.is_reinforcement_schedule for schedule in arrangement],
+            dtype=np.bool_,
+        )
+        self.counts = np.zeros(len(arrangement), dtype=np.int64)
+        self.count_requirements = np.zeros(len(arrangement), dtype=np.float64)
+        self.load()
+
+    def load(self) -> None:
+        """
+        Copies the counts and count requirements from the Schedule objects.
+        """
+        for i, schedule in enumerate(self.arrangement):
+            self.counts[i] = schedule.count
+            self.count_requirements[i] = schedule.current_count_requirement
+
+    def store(self) -> None:
+        """
+        Copies the counts and count requirements back to the Schedule objects.
+        """
+        for i, schedule in enumerate(self.arrangement):
+            schedule.count = int(self.counts[i])
+            if isinstance(schedule, RandomSchedule):
+                schedule.current_count_requirement = float(self.count_requirements[i])
+
+    def run(self, membership: int) -> tuple[int, int]:
+        """
+        Advances every schedule by one generation.
+
+        Args:
+            membership (int): The response class membership of the emitted behavior, from the response class table.
+
+        Returns:
+            tuple[int, int]: The schedules that delivered reinforcement and the schedules that delivered punishment, with bit i set for schedule i.
+        """
+        return generation.run_schedules(
+            membership,
+            self.kinds,
+            self.variabilities,
+            self.means,
+            self.is_reinforcement,
+            self.counts,
+            self.count_requirements,
+        )
+
+
+class CompiledArrangement:
+    """
+    Represents a schedule arrangement compiled into arrays so that whole runs of generations can be executed by the jitted kernel in rules.generation.
+
+    Args:
+        arrangement (list[Schedule]): The schedules in the arrangement.
+        settings (ExperimentSettings): The settings of the experiment running the arrangement.
+        organism (Organism): The organism going through the algorithm.
+        response_class_table (np.ndarray, optional): The response class table of the arrangement. Built from the schedules if not given.
+
+    Attributes:
+        arrangement (list[Schedule]): The schedules in the arrangement.
+        settings (ExperimentSettings): The settings of the experiment running the arrangement.
+        organism (Organism): The organism going through the algorithm.
+        response_class_table (np.ndarray): The table from build_response_class_table, with bit i of each phenotype's entry set when it is in the response class of schedule i.
+        schedules (CompiledSchedules): The schedules of the arrangement as arrays.
+    """
+
+    def __init__(
+        self,
+        arrangement: list[Schedule],
+        settings: ExperimentSettings,
+        organism: Organism,
+        response_class_table: np.ndarray | None = None,
+    ):
+        self.arrangement = arrangement
+        self.settings = settings
+        self.organism = organism
+        self.response_class_table = (
+            build_response_class_table(arrangement, 2**organism.bin_length)
+            if response_class_table is None
+            else response_class_table
+        )
+        self.schedules = CompiledSchedules(arrangement)
+        self._compile_strategies()
+
+    def _compile_strategies(self) -> None:
+        """
+        Converts the strategy settings into per-slot arrays of codes. Slot 0 holds the experiment settings and slot i + 1 holds the settings of schedule i.
+        """
+        slots: list[ScheduleSettings] = [self.settings] + [
+            schedule.settings for schedule in self.arrangement
+        ]
+
+        for slot in slots:
+            # raise an error if a strategy has no compiled equivalent
+            try:
+                generation.SELECTION_CODES[slot.selection_type]
+                generation.FDF_CODES[slot.fdf_type]
+                generation.LANDSCAPE_CODES[slot.fitness_landscape]
+                recombination_code = generation.RECOMBINATION_CODES[
+                    slot.recombination_method
+                ]
+                mutation_code = generation.MUTATION_CODES[slot.mutation_method]
+                generation.PUNISHMENT_CODES[slot.punishment_type]
+            except KeyError as e:
+                raise ValueError(
+                    f"Giddydowned: {e} is not supported by the compiled engine."
+                )
+
+            # the integer recombination and mutation rules only work as a pair
+            if recombination_code != mutation_code:
+                raise ValueError(
+                    "Giddydowned: 'bitwise_integer' recombination must be paired with 'bit_flip_integer' mutation (and 'bitwise' with 'bit_flip')."
+                )
+
+        self.fdf_codes = np.array(
+            [generation.FDF_CODES[slot.fdf_type] for slot in slots], dtype=np.int8
+        )
+        self.fdf_means = np.array([slot.fdf_mean for slot in slots], dtype=np.float64)
+        self.landscape_codes = np.array(
+            [generation.LANDSCAPE_CODES[slot.fitness_landscape] for slot in slots],
+            dtype=np.int8,
+        )
+        self.selection_codes = np.array(
+            [generation.SELECTION_CODES[slot.selection_type] for slot in slots],
+            dtype=np.int8,
+        )
+        self.integer_genotypes = np.array(
+            [
+                generation.RECOMBINATION_CODES[slot.recombination_method] == 1
+                for slot in slots
+            ],
+            dtype=np.bool_,
+        )
+        self.mut_rates = np.array([slot.mut_rate for slot in slots], dtype=np.float64)
+
+    def create_outputs(
+        self, num_rows: int, dtype: np.dtype = np.int8
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Creates the output arrays for a run of the arrangement.
+
+        Args:
+            num_rows (int): The number of output rows in the run (the number of generations, or of bins when the outputs are binned).
+            dtype (np.dtype, optional): The type of the behavior, reinforcement and punishment arrays. Defaults to np.int8.
+
+        Returns:
+            tuple[np.ndarray, ...]: The emissions, behavior, reinforcement and punishment arrays.
+        """
+        return create_block(num_rows, len(self.arrangement), dtype)
+
+    def run(
+        self,
+        first_gen: int,
+        last_gen: int,
+        outputs: tuple[np.ndarray, ...],
+        bin_offset: int = 0,
+        bin_width: int = 1,
+    ):
+        """
+        Runs the arrangement on the organism from first_gen up to (but not including) last_gen.
+
+        The schedule counters are read from, and written back to, the Schedule objects so that their state carries over between runs just like in the python engine.
+
+        Args:
+            first_gen (int): The first generation to run.
+            last_gen (int): The generation to stop at.
+            outputs (tuple[np.ndarray, ...]): The output arrays from create_outputs.
+            bin_offset (int, optional): The offset of generation 0 within its output bin. Defaults to 0.
+            bin_width (int, optional): The number of generations summed into each output row. Defaults to 1 (a row per generation).
+        """
+        self.schedules.load()
+        emissions, behavior, reinforcement, punishment = outputs
+
+        self.organism.population = generation.run_generations(
+            self.organism.population,
+            first_gen,
+            last_gen,
+            bin_offset,
+            bin_width,
+            self.organism.bin_length,
+            self.organism.low_pheno,
+            self.organism.high_pheno,
+            self.schedules.kinds,
+            self.schedules.variabilities,
+            self.schedules.means,
+            self.schedules.is_reinforcement,
+            self.response_class_table,
+            self.schedules.counts,
+            self.schedules.count_requirements,
+            self.fdf_codes,
+            self.fdf_means,
+            self.landscape_codes,
+            self.selection_codes,
+            self.integer_genotypes,
+            self.mut_rates,
+            emissions,
+            behavior,
+            reinforcement,
+            punishment,
+        )
+        self.organism.emitted = emissions[(last_gen - 1 + bin_offset) // bin_width]
+        self.schedules.store()
@@ -1,41 +1,303 @@
+from typing import TYPE_CHECKING
 from pyetbd.settings_classes import ExperimentSettings
-import pandas as pd
+from pyetbd.output_formats import OutputWriter, get_output_writer
+import numpy as np
+
+# pandas (and openpyxl through it) is only imported when the data is saved, so running an experiment doesn't pay for it
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def create_block(
+    num_rows: int, num_schedules: int, dtype: np.dtype = np.int8
+) -> tuple[np.ndarray, ...]:
+    """
+    Creates the arrays that hold the data for a whole run of a schedule arrangement.
+
+    Args:
+        num_rows (int): The number of output rows in the run (one per generation, or one per bin in summary-only mode).
+        num_schedules (int): The number of schedules in the arrangement.
+        dtype (np.dtype, optional): The type of the behavior, reinforcement and punishment arrays. Defaults to np.int8.
+
+    Returns:
+        tuple[np.ndarray, ...]: The emissions, behavior, reinforcement and punishment arrays.
+    """
+    shape = (num_rows, num_schedules)
+    return (
+        np.zeros(num_rows, dtype=np.int64),
+        np.zeros(shape, dtype=dtype),
+        np.zeros(shape, dtype=dtype),
+        np.zeros(shape, dtype=dtype),
+    )
 
 
 class DataSaver:
-    def __init__(self, exp_settings: ExperimentSettings, output_dir: str):
+    """
+    Streams the data from an experiment to disk and saves the summary workbook at the end.
+
+    Every (rep, schedule arrangement) pair owns a contiguous block of rows in the output, and each block is appended to the output (a CSV file by default, see output_formats) as soon as it has been written with write_block, so only the blocks that haven't been flushed are held in memory and a crash loses only the blocks that were still running. Blocks that finish ahead of an earlier block are held until the earlier block arrives, so the rows are always in order.
+
+    In summary-only mode the engines sum the outputs into bins of bin_width generations as they run (see get_block_layout), no per-generation output is written, and only the bins are kept for the summary workbook.
+
+    Args:
+        exp_settings (ExperimentSettings): The settings for the experiment.
+        output_dir (str): The directory to save the experiment data.
+        num_arrangements (int, optional): The number of schedule arrangements. Defaults to the number of arrangements in exp_settings.schedules.
+
+    Attributes:
+        settings (ExperimentSettings): The settings for the experiment.
+        output_dir (str): The directory to save the experiment data.
+        num_arrangements (int): The number of schedule arrangements in the experiment.
+        num_schedules (int): The number of schedules in each arrangement.
+        writer (OutputWriter): The writer of the output format from the settings, which the blocks are streamed to.
+        pending_blocks (dict[tuple[int, int], tuple]): The blocks that are waiting for an earlier block to be flushed.
+        binned_blocks (dict[tuple[int, int], tuple]): The binned blocks of each (rep, schedule arrangement) in summary-only mode.
+        next_block (int): The index of the next block to flush, in row order.
+    """
+
+    def __init__(
+        self,
+        exp_settings: ExperimentSettings,
+        output_dir: str,
+        num_arrangements: int | None = None,
+    ):
         self.settings = exp_settings
-        self.data_output = {
-            "Rep": [],
-            "Sch": [],
-            "Gen": [],
-            "Emissions": [],
-        }
+        self.num_arrangements = (
+            len(self.settings.schedules)
+            if num_arrangements is None
+            else num_arrangements
+        )
         self.output_dir = output_dir
+        # the stream is opened by add_schedule_outputs once the number of schedules is known
+        self.num_schedules = 0
+        self.writer: OutputWriter | None = None
+        self.pending_blocks: dict[tuple[int, int], tuple] = {}
+        self.binned_blocks: dict[tuple[int, int], tuple] = {}
+        self.next_block = 0
+
+    def get_columns(self) -> list[str]:
+        """
+        Gets the names of the output columns.
+
+        Returns:
+            list[str]: The Rep, Sch, Gen and Emissions columns followed by the B, R and P columns of each schedule.
+        """
+        columns = ["Rep", "Sch", "Gen", "Emissions"]
+        for i in range(self.num_schedules):
+            columns += [f"B{i+1}", f"R{i+1}", f"P{i+1}"]
+
+        return columns
+
+    def get_column_types(self) -> dict[str, np.dtype]:
+        """
+        Gets the names and types of the output columns.
+
+        Returns:
+            dict[str, np.dtype]: The Rep, Sch, Gen and Emissions columns followed by the B, R and P columns of each schedule.
+        """
+        return {
+            column: np.dtype(np.int32 if i < 4 else np.int8)
+            for i, column in enumerate(self.get_columns())
+        }
 
-    def _format_data(self) -> pd.DataFrame:
-        """Formats data_output into 500 generation bins.
+    def get_row(self, rep: int, sch: int, gen: int) -> int:
+        """
+        Gets the index of the row holding the data for a generation.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            gen (int): The generation.
+
+        Returns:
+            int: The index of the row.
+        """
+        return (rep * self.num_arrangements + sch) * self.settings.gens + gen
+
+    def get_block_layout(self, rep: int, sch: int) -> tuple[int, int, int]:
+        """
+        Gets how the generations of a block map to its output rows: generation gen goes to row (gen + bin_offset) // bin_width.
+
+        The raw output has a row per generation. In summary-only mode the rows are the bins of the Data sheet: global row index // bin_width, grouped by rep and schedule arrangement, so every block can be binned on its own.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+
+        Returns:
+            tuple[int, int, int]: The bin offset, the bin width and the number of output rows of the block.
+        """
+        if not self.settings.summary_only:
+            return 0, 1, self.settings.gens
+
+        bin_width = self.settings.bin_width
+        bin_offset = self.get_row(rep, sch, 0) % bin_width
+        num_rows = (bin_offset + self.settings.gens - 1) // bin_width + 1
+
+        return bin_offset, bin_width, num_rows
+
+    def create_block(self, rep: int, sch: int, num_schedules: int) -> tuple:
+        """
+        Creates the arrays that hold the output of a block, with the number of rows from get_block_layout.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            num_schedules (int): The number of schedules in the arrangement.
+
+        Returns:
+            tuple: The emissions, behavior, reinforcement and punishment arrays.
+        """
+        num_rows = self.get_block_layout(rep, sch)[2]
+        return create_block(num_rows, num_schedules, self.get_output_type())
+
+    def get_output_type(self) -> np.dtype:
+        """
+        Gets the type of the behavior, reinforcement and punishment outputs, which are wider in summary-only mode because they hold bin sums.
+
+        Returns:
+            np.dtype: The type of the outputs.
+        """
+        return np.dtype(np.int32 if self.settings.summary_only else np.int8)
+
+    def write_block(
+        self,
+        rep: int,
+        sch: int,
+        emissions: np.ndarray,
+        behavior: np.ndarray,
+        reinforcement: np.ndarray,
+        punishment: np.ndarray,
+    ) -> None:
+        """
+        Writes the data for a whole run of a schedule arrangement, flushing it (and any blocks that were waiting for it) to the output if every earlier block has been flushed. In summary-only mode the binned block is kept for the summary workbook instead.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            emissions (np.ndarray): The emitted behavior of each generation.
+            behavior (np.ndarray): A (gens, schedules) array of response class membership.
+            reinforcement (np.ndarray): A (gens, schedules) array of delivered reinforcement.
+            punishment (np.ndarray): A (gens, schedules) array of delivered punishment.
+        """
+        if self.settings.summary_only:
+            self.binned_blocks[(rep, sch)] = (behavior, reinforcement, punishment)
+            return
+
+        self.pending_blocks[(rep, sch)] = (
+            emissions,
+            behavior,
+            reinforcement,
+            punishment,
+        )
+
+        while True:
+            key = divmod(self.next_block, self.num_arrangements)
+            if key not in self.pending_blocks:
+                break
+
+            self._flush_block(*key, *self.pending_blocks.pop(key))
+            self.next_block += 1
+
+    def _flush_block(
+        self,
+        rep: int,
+        sch: int,
+        emissions: np.ndarray,
+        behavior: np.ndarray,
+        reinforcement: np.ndarray,
+        punishment: np.ndarray,
+    ) -> None:
+        """
+        Appends a block to the output.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            emissions (np.ndarray): The emitted behavior of each generation.
+            behavior (np.ndarray): A (gens, schedules) array of response class membership.
+            reinforcement (np.ndarray): A (gens, schedules) array of delivered reinforcement.
+            punishment (np.ndarray): A (gens, schedules) array of delivered punishment.
+        """
+        gens = self.settings.gens
+        block_columns = {
+            "Rep": np.full(gens, rep, dtype=np.int32),
+            "Sch": np.full(gens, sch, dtype=np.int32),
+            "Gen": np.arange(gens, dtype=np.int32),
+            "Emissions": emissions.astype(np.int32),
+        }
+        for i in range(self.num_schedules):
+            block_columns[f"B{i+1}"] = np.ascontiguousarray(behavior[:, i])
+            block_columns[f"R{i+1}"] = np.ascontiguousarray(reinforcement[:, i])
+            block_columns[f"P{i+1}"] = np.ascontiguousarray(punishment[:, i])
+
+        # the rows keep their index in the whole experiment
+        self.writer.write_block(self.get_row(rep, sch, 0), block_columns)
+
+    def _format_data(self) -> "pd.DataFrame":
+        """Formats the flushed data into bins of bin_width generations.
+
+        The output is read back one block at a time, and bins that are split across blocks are summed again once every block has been binned.
 
         Returns:
             pd.DataFrame: The formatted data output.
         """
-        df = pd.DataFrame(self.data_output)
+        import pandas as pd
+
+        if self.settings.summary_only:
+            return self._format_binned_data()
 
-        df["bin"] = df.index // 500
+        binned_chunks = []
+        bin_width = self.settings.bin_width
+        for chunk in self.writer.iter_chunks(max(self.settings.gens, bin_width)):
+            # widen the int8 columns before summing
+            chunk = chunk.astype(np.int64)
+            chunk["bin"] = chunk.index // bin_width
+            binned_chunks.append(chunk.groupby(["Rep", "Sch", "bin"]).sum())
 
-        formatted_df = df.groupby(["Rep", "Sch", "bin"]).sum().reset_index()
+        formatted_df = (
+            pd.concat(binned_chunks).groupby(level=[0, 1, 2]).sum().reset_index()
+        )
 
         formatted_df.drop(columns=["Gen", "Emissions", "bin"], inplace=True)
 
         return formatted_df
 
-    def _format_experiment_settings(self) -> pd.DataFrame:
+    def _format_binned_data(self) -> "pd.DataFrame":
+        """Formats the blocks binned by the engines in summary-only mode into the same table as _format_data.
+
+        Returns:
+            pd.DataFrame: The formatted data output.
+        """
+        import pandas as pd
+
+        formatted_blocks = []
+        for rep in range(self.settings.reps):
+            for sch in range(self.num_arrangements):
+                behavior, reinforcement, punishment = self.binned_blocks[(rep, sch)]
+                num_rows = len(behavior)
+
+                block_columns = {
+                    "Rep": np.full(num_rows, rep, dtype=np.int64),
+                    "Sch": np.full(num_rows, sch, dtype=np.int64),
+                }
+                for i in range(self.num_schedules):
+                    block_columns[f"B{i+1}"] = behavior[:, i].astype(np.int64)
+                    block_columns[f"R{i+1}"] = reinforcement[:, i].astype(np.int64)
+                    block_columns[f"P{i+1}"] = punishment[:, i].astype(np.int64)
+
+                formatted_blocks.append(pd.DataFrame(block_columns))
+
+        return pd.concat(formatted_blocks, ignore_index=True)
+
+    def _format_experiment_settings(self) -> "pd.DataFrame":
         """
         Formats the experiment settings into a pandas DataFrame.
 
         Returns:
             pd.DataFrame: The formatted experiment settings DataFrame.
         """
+        import pandas as pd
 
         schedule_dicts = []
         arrangement_index = []
@@ -64,7 +326,7 @@ class DataSaver:
 
     def add_schedule_outputs(self, num_schedules: int) -> None:
         """
-        Adds empty lists for each schedule output.
+        Opens the output stream in the output format from the settings, with B, R and P columns for each schedule. No output stream is opened in summary-only mode.
 
         Args:
             num_schedules (int): The number of schedules.
@@ -72,28 +334,106 @@ class DataSaver:
         Returns:
             None
         """
-        for i in range(num_schedules):
-            self.data_output[f"B{i+1}"] = []
-            self.data_output[f"R{i+1}"] = []
-            self.data_output[f"P{i+1}"] = []
+        self.num_schedules = num_schedules
+        self.pending_blocks = {}
+        self.binned_blocks = {}
+        self.next_block = 0
+        self.writer = None
+
+        # summary-only mode doesn't write any per-generation output
+        if self.settings.summary_only:
+            return
+
+        self.writer = self._create_writer()
+        self.writer.open()
+
+    def _create_writer(self) -> OutputWriter:
+        """
+        Creates the writer of the output format from the settings.
+
+        Returns:
+            OutputWriter: The writer.
+        """
+        num_rows = self.settings.reps * self.num_arrangements * self.settings.gens
+        return get_output_writer(self.settings.output_format)(
+            f"{self.output_dir}{self.settings.file_stub}",
+            self.get_column_types(),
+            num_rows,
+        )
+
+    def get_checkpoint(self) -> dict:
+        """
+        Gets the state of the data saved so far, so an interrupted run can be resumed from it. Every block written so far must have been flushed.
+
+        Returns:
+            dict: The state of the data saver and of its output stream.
+        """
+        if self.pending_blocks:
+            raise ValueError(
+                "Giddydowned: The experiment data can't be checkpointed while blocks are waiting to be flushed."
+            )
+
+        return {
+            "num_schedules": self.num_schedules,
+            "next_block": self.next_block,
+            "binned_blocks": self.binned_blocks,
+            "writer": None if self.writer is None else self.writer.get_checkpoint(),
+        }
+
+    def resume(self, checkpoint: dict) -> None:
+        """
+        Restores the state from get_checkpoint and reopens the output stream, so the rest of the blocks are written after the checkpointed ones. Used instead of add_schedule_outputs.
+
+        Args:
+            checkpoint (dict): The state from get_checkpoint.
+        """
+        self.num_schedules = checkpoint["num_schedules"]
+        self.pending_blocks = {}
+        self.binned_blocks = checkpoint["binned_blocks"]
+        self.next_block = checkpoint["next_block"]
+        self.writer = None
+
+        if self.settings.summary_only:
+            return
+
+        self.writer = self._create_writer()
+        self.writer.resume(checkpoint["writer"])
+
+    def get_summary(self) -> "pd.DataFrame":
+        """
+        Closes the output stream and gets the binned data of the summary workbook's Data sheet.
+
+        Every block must have been written by the time this is called.
+
+        Returns:
+            pd.DataFrame: The binned data.
+        """
+        num_written = (
+            len(self.binned_blocks) if self.settings.summary_only else self.next_block
+        )
+        if num_written != self.settings.reps * self.num_arrangements:
+            raise ValueError(
+                "Giddydowned: The experiment data can't be saved before every repetition and schedule arrangement has been written."
+            )
+
+        if self.writer is not None:
+            self.writer.close()
+
+        return self._format_data()
 
     def save_data(self) -> None:
         """
-        Save the data to a CSV file and an Excel file.
+        Closes the output stream and saves the summary Excel file from the streamed data.
 
-        This method saves the data stored in `self.data_output` to a CSV file
-        and an Excel file. The CSV file is saved with the file stub specified
-        in `self.settings.file_stub`, while the Excel file is saved with the
-        same file stub but with the extension '.xlsx'. The data is saved in
-        two sheets in the Excel file: 'Data' and 'Settings'.
+        Every block must have been written by the time this is called. The Excel file is saved with the file stub specified in `self.settings.file_stub` and the extension '.xlsx', with two sheets: 'Data' and 'Settings'.
         """
-        df = pd.DataFrame(self.data_output)
-        df.to_csv(f"{self.output_dir}{self.settings.file_stub}.csv")
+        import pandas as pd
 
+        summary = self.get_summary()
         with pd.ExcelWriter(
             f"{self.output_dir}{self.settings.file_stub}.xlsx"
         ) as writer:
-            self._format_data().to_excel(writer, sheet_name="Data", index=False)
+            summary.to_excel(writer, sheet_name="Data", index=False)
             self._format_experiment_settings().to_excel(
                 writer, sheet_name="Settings", index=False
             )
@@ -22,4 +22,12 @@ DEFAULTS = {
     "excluded_lower_bound": 0,
     "excluded_upper_bound": 0,
     "is_reinforcement_schedule": True,
+    "engine": "python",
+    "seed": None,
+    "output_format": "csv",
+    "bin_width": 500,
+    "summary_only": False,
+    "checkpoint": False,
+    "checkpoint_gens": 0,
+    "instrument": False,
 }
@@ -1,9 +1,29 @@
+import json
+import os
+import pickle
+import time
+from concurrent.futures import Executor
+from copy import deepcopy
+from dataclasses import asdict, replace
+from typing import TYPE_CHECKING
+import numpy as np
 from pyetbd.organisms import Organism
-from pyetbd.schedules import Schedule
+from pyetbd.schedules import Schedule, build_response_class_table
 from pyetbd.settings_classes import ExperimentSettings
 from pyetbd.algorithm import Algorithm
-from pyetbd.utils import progress_logger, timer
+from pyetbd.utils import random_streams
+from pyetbd.utils.progress import ProgressCounters, ProgressMonitor
+from pyetbd.utils.instrumentation import Instrumentation, format_report
 from pyetbd.data_saver import DataSaver
+from pyetbd.compiled_arrangement import (
+    CompiledArrangement,
+    CompiledSchedules,
+)
+from pyetbd.result_cache import ResultCache, get_code_version, hash_inputs
+
+# pandas is only imported when the data is saved
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class Experiment:
@@ -15,6 +35,7 @@ class Experiment:
         schedule_arrangements (list[list[Schedule]]): The schedule arrangements to run the organism on.
         log_progress (bool): Flag indicating whether to log the progress of the experiment.
         output_dir (str): The directory to save the experiment data.
+        result_cache (ResultCache, optional): The cache to reuse the output blocks of identical runs from. Defaults to None, which runs every block.
 
     Attributes:
         settings (ExperimentSettings): The settings for the experiment.
@@ -22,12 +43,28 @@ class Experiment:
         log_progress (bool): Flag indicating whether to log the progress of the experiment.
         output_dir (str): The directory to save the experiment data.
         organism (Organism): The organism used in the experiment.
+        response_class_tables (list[np.ndarray]): The response class table of each schedule arrangement.
         algorithm (Algorithm): The algorithm object used to implement the rules on the AO.
-        progress_logger (ProgressLogger): The progress logger used in the experiment.
+        progress_monitor (ProgressMonitor | None): The monitor reporting the progress of the experiment in this process.
+        progress_counters (ProgressCounters | None): The counters the generations run by each (repetition, schedule arrangement) are counted in, from slot progress_offset on.
+        progress_offset (int): The first slot of the experiment in the progress counters.
+        current_block (tuple[int, int, tuple] | None): The repetition, schedule arrangement index and output block being run, or last written. The block may still be filling up, so it is only for monitoring.
         data_saver (DataSaver): The data saver used in the experiment.
+        save_checkpoints (bool): Whether the running experiment is saving checkpoints.
+        result_cache (ResultCache | None): The cache the output blocks of seeded runs are reused from and stored in.
+        instrumentation (Instrumentation | None): The instrumentation that times each phase of the run, or None if the settings don't ask for it.
+        report (dict | None): The report of the last run, from get_report.
 
     Methods:
         run: Runs the experiment.
+        get_work_units: Gets the units of work that can run independently of each other.
+        run_work_unit: Runs a unit of work and returns its output blocks.
+        run_summary: Runs the experiment in summary-only mode and returns the binned data.
+        get_checkpoint_path: Gets the path of the checkpoint file of the experiment.
+        get_report: Gets the report of a run.
+        get_progress_task: Gets the name, number of blocks and generations per block the progress monitor tracks.
+        set_progress: Sets the progress counters and monitor of the experiment.
+        log_message: Prints a message without mixing it into the progress report.
     """
 
     def __init__(
@@ -36,40 +73,49 @@ class Experiment:
         schedule_arrangements: list[list[Schedule]],
         log_progress: bool,
         output_dir: str,
+        result_cache: ResultCache | None = None,
     ):
         self.settings = settings
         self.schedule_arrangements = schedule_arrangements
         self.log_progress = log_progress
         self.output_dir = output_dir
+        self.result_cache = result_cache
+        self.save_checkpoints = False
+        self.instrumentation = Instrumentation() if settings.instrument else None
+        self.report = None
         self._create_organism()
+        self._create_response_class_tables()
         self._create_data_saver()
         self._create_algorithm()
-        self._create_progress_logger()
+        self.set_progress(None)
+        self.current_block = None
 
     def _create_organism(self) -> None:
         """
-        Creates a new organism and assigns it to the `organism` attribute.
+        Creates a new organism with the population size and phenotype range from the settings and assigns it to the `organism` attribute.
         """
-        self.organism = Organism()
+        self.organism = Organism(
+            self.settings.pop_size, self.settings.low_pheno, self.settings.high_pheno
+        )
 
-    def _create_algorithm(self) -> None:
+    def _create_response_class_tables(self) -> None:
         """
-        Creates an instance of the Algorithm class using the current organism. The algorithm class is responsible for implementing the rules of the ETBD algorithm on the organism.
+        Creates the response class table of each schedule arrangement and binds the schedules to it, so the response class membership of an emitted behavior is a single array index.
         """
-        self.algorithm = Algorithm(self.organism)
+        self.response_class_tables = []
+        for arrangement in self.schedule_arrangements:
+            table = build_response_class_table(arrangement, 2**self.organism.bin_length)
+            for i, schedule in enumerate(arrangement):
+                schedule.bind_response_class_table(table, i)
 
-    def _create_progress_logger(self) -> None:
-        """
-        Creates a progress logger object and initializes progress bars.
+            self.response_class_tables.append(table)
 
-        The progress logger is responsible for tracking the progress of the experiment.
-        It creates progress bars based on the number of repetitions, schedule arrangements,
-        and generations specified in the settings.
+    def _create_algorithm(self) -> None:
         """
-        self.progress_logger = progress_logger.ProgressLogger(self.settings.file_stub)
-        self.progress_logger.create_progress_bars(
-            self.settings.reps, len(self.schedule_arrangements), self.settings.gens
-        )
+        Creates an instance of the Algorithm class using the current organism. The algorithm class is responsible for implementing the rules of the ETBD algorithm on the organism.
+        """
+        self.algorithm = Algorithm(self.organism)
+        self.algorithm.instrumentation = self.instrumentation
 
     def _create_data_saver(self) -> None:
         """
@@ -77,131 +123,809 @@ class Experiment:
         The DataSaver object is initialized with the experiment settings and output directory.
         The DataSaver object is responsible for storing and saving the data from each experiment.
         """
-        self.data_saver = DataSaver(self.settings, self.output_dir)
-        self.data_saver.add_schedule_outputs(len(self.schedule_arrangements[0]))
+        self.data_saver = DataSaver(
+            self.settings, self.output_dir, len(self.schedule_arrangements)
+        )
 
-    @timer.timer
-    def run(self) -> None:
+    def run(self, executor: Executor | None = None, resume: bool = False) -> None:
         """
         Runs the experiment.
 
         The experiment runs the genetic algorithm on each schedule arrangement for the specified number of repetitions
-        and generations. It logs the progress if enabled and saves the experiment data at the end.
+        and generations. It streams the data of each finished block to disk and saves the summary workbook at the end.
+
+        If log_progress is set and the experiment has no progress monitor from a runner, a monitor reports the progress of the run while it runs.
+
+        Once the experiment is saved, its report is printed and kept in the report attribute. When the settings ask for instrumentation, the report breaks the time down into the phases of the run and is also saved to '<file_stub>_report.json'.
+
+        When the settings ask for checkpoints, the state of the run is saved to the checkpoint file after every (repetition, schedule arrangement) and every checkpoint_gens generations, and the file is removed once the summary workbook is saved. A run resumed from the checkpoint gives output identical to a run that was never interrupted.
+
+        Args:
+            executor (Executor, optional): A process pool to run the work units of the experiment on. If not given, the experiment runs serially in this process.
+            resume (bool, optional): Whether to continue an interrupted run from its checkpoint file instead of starting from the beginning. Defaults to False.
         """
+        start = time.perf_counter()
 
-        for rep in range(self.settings.reps):
-            for arrangement in self.schedule_arrangements:
-                if self.settings.reinitialize_population:
-                    self.organism.init_population()
-
-                for gen in range(self.settings.gens):
-                    # emit the response
-                    self.organism.emit()
-
-                    # update the data_output with the current repetition, schedule arrangement, generation, and emitted response
-                    self.data_saver.data_output["Rep"].append(rep)
-                    self.data_saver.data_output["Sch"].append(
-                        self.schedule_arrangements.index(arrangement)
-                    )
-                    self.data_saver.data_output["Gen"].append(gen)
-                    self.data_saver.data_output["Emissions"].append(
-                        self.organism.emitted
-                    )
-
-                    # initialize reinforcement and punishment flags and schedules
-                    reinforcement_available = False
-                    schedule_to_deliver_reinforcement = (
-                        self.settings
-                    )  # default to the experiment settings
-                    punishment_available = False
-                    schedule_to_deliver_punishment = self.settings
-
-                    # run each schedule in the arrangement
-                    for schedule in arrangement:
-                        # update whether the emitted response is in the response class
-                        if schedule.in_response_class(self.organism.emitted):
-                            self.data_saver.data_output[
-                                f"B{arrangement.index(schedule)+1}"
-                            ].append(1)
-
-                        else:
-                            self.data_saver.data_output[
-                                f"B{arrangement.index(schedule)+1}"
-                            ].append(0)
-
-                        # run the schedule and update the data_output if the schedule is a reinforcement schedule
-                        if schedule.settings.is_reinforcement_schedule:
-                            # update the data_output to indicate that punishment was not delivered because the schedule is not a punishment schedule
-                            self.data_saver.data_output[
-                                f"P{arrangement.index(schedule)+1}"
-                            ].append(0)
-                            # run the schedule and find out if reinforcement is available
-                            reinforced = schedule.run(self.organism.emitted)
-
-                            if reinforced:
-                                # update the schedule to deliver reinforcement
-                                schedule_to_deliver_reinforcement = schedule.settings
-                                # update the reinforcement flag to indicate to the algorithm that reinforcement should be delivered
-                                reinforcement_available = True
-                                # update the data_output to indicate that reinforcement was delivered
-                                self.data_saver.data_output[
-                                    f"R{arrangement.index(schedule)+1}"
-                                ].append(1)
-
-                            else:
-                                # update the data_output to indicate that reinforcement was not delivered
-                                self.data_saver.data_output[
-                                    f"R{arrangement.index(schedule)+1}"
-                                ].append(0)
-
-                        # run the schedule and update the data_output if the schedule is a punishment schedule
-                        else:
-                            # update the data_output to indicate that reinforcement was not delivered because the schedule is not a reinforcement schedule
-                            self.data_saver.data_output[
-                                f"R{arrangement.index(schedule)+1}"
-                            ].append(0)
-                            # run the schedule and find out if punishment is available
-                            punished = schedule.run(self.organism.emitted)
-
-                            if punished:
-                                # update the schedule to deliver punishment
-                                schedule_to_deliver_punishment = schedule.settings
-                                # update the punishment flag to indicate to the algorithm that punishment should be delivered
-                                punishment_available = True
-                                # update the data_output to indicate that punishment was delivered
-                                self.data_saver.data_output[
-                                    f"P{arrangement.index(schedule)+1}"
-                                ].append(1)
-
-                            else:
-                                # update the data_output to indicate that punishment was not delivered
-                                self.data_saver.data_output[
-                                    f"P{arrangement.index(schedule)+1}"
-                                ].append(0)
-
-                    # run the algorithm on the organism
-                    self.algorithm.run(
-                        reinforcement_available,
-                        punishment_available,
-                        schedule_to_deliver_reinforcement,
-                        schedule_to_deliver_punishment,
-                    )
-
-                    # update the progress of the experiment
-                    if gen % 1000 == 0 and self.log_progress:
-                        self.progress_logger.log_progress(
-                            rep, self.schedule_arrangements.index(arrangement), gen
-                        )
-
-        # update the progress of the experiment
-        if self.log_progress:
-            self.progress_logger.log_progress(
-                self.settings.reps,
-                len(self.schedule_arrangements),
-                self.settings.gens,
-                end="\n",
+        if (self.settings.checkpoint or resume) and executor is not None:
+            raise ValueError(
+                "Giddydowned: Checkpoints can only be saved and resumed by serial runs."
             )
 
-        # save the experiment data
-        print("Saving data...")
+        if resume:
+            checkpoint = self._load_checkpoint()
+
+        else:
+            checkpoint = None
+            # allocate the output columns
+            self.data_saver.add_schedule_outputs(len(self.schedule_arrangements[0]))
+
+        own_monitor = self.log_progress and self.progress_monitor is None
+        if own_monitor:
+            progress_monitor = ProgressMonitor([self.get_progress_task()])
+            self.set_progress(progress_monitor.counters, 0, progress_monitor)
+            progress_monitor.start()
+
+        try:
+            if executor is None:
+                self.save_checkpoints = self.settings.checkpoint
+                try:
+                    self._run_serial(checkpoint)
+                finally:
+                    self.save_checkpoints = False
+
+            else:
+                self._run_parallel(executor)
+
+        finally:
+            if own_monitor:
+                progress_monitor.stop()
+                self.set_progress(None)
+
+        # save the summary workbook from the streamed data
+        self.log_message("Saving data...")
+        if self.instrumentation is not None:
+            self.instrumentation.start()
         self.data_saver.save_data()
+        if self.instrumentation is not None:
+            self.instrumentation.lap("output")
+
+        # the run finished, so it doesn't need to be resumed
+        if os.path.exists(self.get_checkpoint_path()):
+            os.remove(self.get_checkpoint_path())
+
+        self.report = self.get_report(time.perf_counter() - start)
+        self.log_message(format_report(self.report))
+        if self.instrumentation is not None:
+            with open(
+                f"{self.output_dir}{self.settings.file_stub}_report.json", "w"
+            ) as f:
+                json.dump(self.report, f, indent=4)
+
+    def get_progress_task(self) -> tuple[str, int, int]:
+        """
+        Gets what a progress monitor tracks of the experiment.
+
+        Returns:
+            tuple[str, int, int]: The file stub, the number of (repetition, schedule arrangement) blocks and the generations per block.
+        """
+        return (
+            self.settings.file_stub,
+            self.settings.reps * len(self.schedule_arrangements),
+            self.settings.gens,
+        )
+
+    def set_progress(
+        self,
+        progress_counters: ProgressCounters | None,
+        progress_offset: int = 0,
+        progress_monitor: ProgressMonitor | None = None,
+    ) -> None:
+        """
+        Sets the counters the progress of the experiment is counted in and the monitor reporting them.
+
+        Args:
+            progress_counters (ProgressCounters | None): The progress counters, or None to not count the progress.
+            progress_offset (int, optional): The first slot of the experiment in the counters. Defaults to 0.
+            progress_monitor (ProgressMonitor, optional): The monitor reporting the counters in this process. Defaults to None.
+        """
+        self.progress_counters = progress_counters
+        self.progress_offset = progress_offset
+        self.progress_monitor = progress_monitor
+
+    def finish_progress(self) -> None:
+        """
+        Counts every block of the experiment as finished, e.g. when the experiment is skipped because it already finished.
+        """
+        for rep in range(self.settings.reps):
+            for sch in range(len(self.schedule_arrangements)):
+                self._set_progress(rep, sch, self.settings.gens)
+
+    def _set_progress(self, rep: int, sch: int, gen: int) -> None:
+        """
+        Sets the number of generations run in a (repetition, schedule arrangement) in the progress counters, if the progress is being counted.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            gen (int): The number of generations run.
+        """
+        if self.progress_counters is not None:
+            self.progress_counters.gens[
+                self.progress_offset + rep * len(self.schedule_arrangements) + sch
+            ] = gen
+
+    def log_message(self, text: str) -> None:
+        """
+        Prints a message, through the progress monitor if there is one so the message isn't mixed into its status line.
+
+        Args:
+            text (str): The message.
+        """
+        if self.progress_monitor is None:
+            print(text)
+        else:
+            self.progress_monitor.write(text)
+
+    def get_report(self, seconds: float) -> dict:
+        """
+        Gets the report of a run: its size, engine, time and throughput, and the time and calls of each phase and the number of FDF draws when the run is instrumented.
+
+        Args:
+            seconds (float): The time the run took.
+
+        Returns:
+            dict: The report.
+        """
+        num_gens = (
+            self.settings.reps * len(self.schedule_arrangements) * self.settings.gens
+        )
+        report = {
+            "file_stub": self.settings.file_stub,
+            "engine": self.settings.engine,
+            "reps": self.settings.reps,
+            "arrangements": len(self.schedule_arrangements),
+            "gens": self.settings.gens,
+            "seconds": seconds,
+            "gens_per_second": num_gens / seconds if seconds > 0 else 0.0,
+        }
+        if self.instrumentation is not None:
+            report["phases"] = self.instrumentation.get_phases()
+            report["fdf_draws"] = self.instrumentation.fdf_draws
+
+        return report
+
+    def _write_block(self, rep: int, sch: int, block: tuple) -> None:
+        """
+        Writes the output block of a (repetition, schedule arrangement) with the data saver and counts the block as finished, timing the writing as output when the run is instrumented.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            block (tuple): The output block.
+        """
+        self._set_progress(rep, sch, self.settings.gens)
+        self.current_block = (rep, sch, block)
+
+        if self.instrumentation is None:
+            self.data_saver.write_block(rep, sch, *block)
+            return
+
+        self.instrumentation.start()
+        self.data_saver.write_block(rep, sch, *block)
+        self.instrumentation.lap("output")
+
+    def run_summary(self) -> "pd.DataFrame":
+        """
+        Runs the experiment serially in summary-only mode and returns the binned data of the Data sheet instead of saving any output.
+
+        Returns:
+            pd.DataFrame: The binned data.
+        """
+        if not self.settings.summary_only:
+            raise ValueError(
+                "Giddydowned: Only summary-only experiments can return their summary without saving their output."
+            )
+
+        self.data_saver.add_schedule_outputs(len(self.schedule_arrangements[0]))
+
+        self._run_serial()
+
+        return self.data_saver.get_summary()
+
+    def get_work_units(self) -> list[tuple[int, list[int]]]:
+        """
+        Gets the units of work that can run independently of each other.
+
+        A unit is a repetition, or a (repetition, schedule arrangement) pair when the population is reinitialized for every arrangement, because the arrangements of a repetition are then independent as well.
+
+        Returns:
+            list[tuple[int, list[int]]]: The repetition and the schedule arrangement indices of each unit.
+        """
+        arrangement_indices = list(range(len(self.schedule_arrangements)))
+
+        if self.settings.reinitialize_population:
+            return [
+                (rep, [sch])
+                for rep in range(self.settings.reps)
+                for sch in arrangement_indices
+            ]
+
+        return [(rep, arrangement_indices) for rep in range(self.settings.reps)]
+
+    def run_work_unit(
+        self, rep: int, arrangement_indices: list[int]
+    ) -> list[tuple[int, int, tuple]]:
+        """
+        Runs a unit of work from get_work_units.
+
+        Args:
+            rep (int): The repetition of the unit.
+            arrangement_indices (list[int]): The indices of the schedule arrangements in the unit.
+
+        Returns:
+            list[tuple[int, int, tuple]]: The repetition, schedule arrangement index and output block of each arrangement in the unit.
+        """
+        blocks = []
+        for i, sch in enumerate(arrangement_indices):
+            block = self._run_block(rep, sch, i == 0)
+            blocks.append((rep, sch, block))
+
+        return blocks
+
+    def get_checkpoint_path(self) -> str:
+        """
+        Gets the path of the checkpoint file of the experiment.
+
+        Returns:
+            str: The path of the checkpoint file.
+        """
+        return f"{self.output_dir}{self.settings.file_stub}.checkpoint"
+
+    def _save_checkpoint(
+        self, block_index: int, gen: int, block: tuple | None = None
+    ) -> None:
+        """
+        Saves the state of the run to the checkpoint file: the position of the run, the population, the schedules, the random state and the data saved so far. The file is replaced atomically, so an interruption while saving leaves the previous checkpoint.
+
+        Args:
+            block_index (int): The index of the (repetition, schedule arrangement) being run, in row order.
+            gen (int): The next generation to run in the block.
+            block (tuple, optional): The output block of the generations run so far when the checkpoint is in the middle of a block.
+        """
+        checkpoint = {
+            "block_index": block_index,
+            "gen": gen,
+            "block": block,
+            "population": self.organism.population,
+            "schedule_arrangements": self.schedule_arrangements,
+            "random_state": random_streams.get_random_state(),
+            "data_saver": self.data_saver.get_checkpoint(),
+        }
+
+        checkpoint_path = self.get_checkpoint_path()
+        with open(f"{checkpoint_path}.tmp", "wb") as f:
+            pickle.dump(checkpoint, f)
+
+        os.replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
+    def _load_checkpoint(self) -> dict:
+        """
+        Loads the checkpoint file and restores the population, the schedules, the random state and the data saver from it.
+
+        Returns:
+            dict: The checkpoint.
+        """
+        try:
+            with open(self.get_checkpoint_path(), "rb") as f:
+                checkpoint = pickle.load(f)
+
+        except FileNotFoundError:
+            raise ValueError(
+                f"Giddydowned: There is no checkpoint to resume '{self.settings.file_stub}' from."
+            )
+
+        self.schedule_arrangements = checkpoint["schedule_arrangements"]
+        self._create_response_class_tables()
+        self.organism.population = checkpoint["population"]
+        self.data_saver.resume(checkpoint["data_saver"])
+        random_streams.set_random_state(checkpoint["random_state"])
+
+        return checkpoint
+
+    def _is_checkpoint_gen(self, gen: int) -> bool:
+        """
+        Checks whether a checkpoint should be saved before a generation in the middle of a block.
+
+        Args:
+            gen (int): The generation.
+
+        Returns:
+            bool: Whether to save a checkpoint.
+        """
+        checkpoint_gens = self.settings.checkpoint_gens
+        return (
+            self.save_checkpoints
+            and checkpoint_gens > 0
+            and gen % checkpoint_gens == 0
+            and 0 < gen < self.settings.gens
+        )
+
+    def _get_gen_chunks(self, first_gen: int) -> list[tuple[int, int]]:
+        """
+        Splits the generations of a block from first_gen on into the chunks the compiled engine runs between progress updates (every 1000 generations) and checkpoints.
+
+        Args:
+            first_gen (int): The first generation to run.
+
+        Returns:
+            list[tuple[int, int]]: The first generation and the generation to stop at of each chunk.
+        """
+        gens = self.settings.gens
+        boundaries = set(range(1000, gens, 1000)) | {gens}
+        boundaries |= {gen for gen in range(gens) if self._is_checkpoint_gen(gen)}
+        boundaries = sorted(gen for gen in boundaries if gen > first_gen)
+
+        return list(zip([first_gen] + boundaries[:-1], boundaries))
+
+    def _run_serial(self, checkpoint: dict | None = None) -> None:
+        """
+        Runs every (repetition, schedule arrangement) of the experiment in row order in this process, saving a checkpoint after each one if checkpoints are being saved.
+
+        Args:
+            checkpoint (dict, optional): The checkpoint to continue from. Runs from the beginning if not given.
+        """
+        num_arrangements = len(self.schedule_arrangements)
+        first_block = 0 if checkpoint is None else checkpoint["block_index"]
+
+        # the blocks before the checkpoint already finished
+        for block_index in range(first_block):
+            self._set_progress(
+                *divmod(block_index, num_arrangements), self.settings.gens
+            )
+
+        for block_index in range(first_block, self.settings.reps * num_arrangements):
+            rep, sch = divmod(block_index, num_arrangements)
+
+            # a checkpoint in the middle of a block continues from the generations it has already run
+            if (
+                checkpoint is not None
+                and block_index == first_block
+                and checkpoint["gen"] > 0
+            ):
+                block = self._run_arrangement_with_engine(
+                    rep,
+                    sch,
+                    self.schedule_arrangements[sch],
+                    checkpoint["gen"],
+                    checkpoint["block"],
+                )
+            else:
+                block = self._run_block(rep, sch, sch == 0)
+
+            self._write_block(rep, sch, block)
+
+            if self.save_checkpoints:
+                self._save_checkpoint(block_index + 1, 0)
+
+    def _run_block(self, rep: int, sch: int, starts_unit: bool) -> tuple:
+        """
+        Prepares and runs a (repetition, schedule arrangement), or reuses its output block from the result cache.
+
+        Only seeded runs are cached, because only they give the same block every time. The population at the end of a cached block is cached with it, so the next arrangement can carry on from it.
+
+        Args:
+            rep (int): The current repetition.
+            sch (int): The index of the schedule arrangement.
+            starts_unit (bool): Whether the arrangement is the first one of its work unit.
+
+        Returns:
+            tuple: The output block of the arrangement.
+        """
+        # the population is drawn from the seeded stream unless it carries over from the previous arrangement
+        carried_population = not (starts_unit or self.settings.reinitialize_population)
+        starting_population = self.organism.population
+        self._start_arrangement(rep, sch, starts_unit)
+
+        if self.result_cache is None or self.settings.seed is None:
+            return self._run_arrangement_with_engine(
+                rep, sch, self.schedule_arrangements[sch]
+            )
+
+        key = self.get_block_key(
+            rep, sch, starting_population if carried_population else None
+        )
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            block, self.organism.population = cached
+            return block
+
+        block = self._run_arrangement_with_engine(
+            rep, sch, self.schedule_arrangements[sch]
+        )
+        self.result_cache.put(key, block, self.organism.population)
+
+        return block
+
+    def get_block_key(
+        self, rep: int, sch: int, starting_population: np.ndarray | None = None
+    ) -> str:
+        """
+        Gets the result cache key of a seeded (repetition, schedule arrangement): the hash of the code version, the settings that affect the run, the random stream, the output layout, the resolved settings and response classes of the arrangement's schedules, and the population the arrangement starts from when it carries over.
+
+        Args:
+            rep (int): The repetition.
+            sch (int): The index of the schedule arrangement.
+            starting_population (np.ndarray, optional): The population carried over from the previous arrangement. None when the arrangement starts from a new population.
+
+        Returns:
+            str: The cache key.
+        """
+        # the file stub only matters through the random stream, and the schedules through their resolved settings
+        settings = {
+            name: value
+            for name, value in asdict(self.settings).items()
+            if name
+            not in [
+                "file_stub",
+                "reps",
+                "schedules",
+                "output_format",
+                "bin_width",
+                "checkpoint",
+                "checkpoint_gens",
+                "instrument",
+            ]
+        }
+        arrangement = self.schedule_arrangements[sch]
+        payload = {
+            "code_version": get_code_version(),
+            "settings": settings,
+            "stream": [
+                self.settings.seed,
+                random_streams.get_experiment_key(self.settings.file_stub),
+                rep,
+                sch,
+            ],
+            "layout": list(self.data_saver.get_block_layout(rep, sch)),
+            "schedules": [
+                [type(schedule).__name__, asdict(schedule.settings)]
+                for schedule in arrangement
+            ],
+        }
+        arrays = [np.asarray(schedule.response_class) for schedule in arrangement]
+        if starting_population is not None:
+            arrays.append(starting_population)
+
+        return hash_inputs(payload, arrays)
+
+    def _start_arrangement(self, rep: int, sch: int, starts_unit: bool) -> None:
+        """
+        Prepares the organism and the schedules before a schedule arrangement is run.
+
+        Without a seed, the population is reinitialized if the settings ask for it and the schedules carry their state over from the previous repetition. With a seed, the random streams are seeded for the (experiment, repetition, schedule arrangement), the schedules of the arrangement are reset, and the population is also reinitialized at the start of every work unit, so a unit gives the same output whether it runs serially, on any number of workers, or on its own.
+
+        Args:
+            rep (int): The current repetition.
+            sch (int): The index of the schedule arrangement.
+            starts_unit (bool): Whether the arrangement is the first one of its work unit.
+        """
+        if self.settings.seed is not None:
+            random_streams.seed_stream(
+                self.settings.seed,
+                random_streams.get_experiment_key(self.settings.file_stub),
+                rep,
+                sch,
+            )
+            for schedule in self.schedule_arrangements[sch]:
+                schedule.reset()
+
+            if starts_unit:
+                self.organism.init_population()
+                return
+
+        if self.settings.reinitialize_population:
+            self.organism.init_population()
+
+    def _run_parallel(self, executor: Executor) -> None:
+        """
+        Runs the work units of the experiment on a process pool and writes their output blocks as they finish.
+
+        Each unit is run by a fresh copy of the experiment in a worker, so every unit starts from a new population and from the initial state of the schedules instead of carrying them over from the previous unit. The output rows are in the same order as in a serial run. Seeded runs start every unit this way in serial runs too, so they give the same output with any number of jobs. Unseeded serial runs carry the state over from one repetition to the next, so a warning is printed when an unseeded run with more than one repetition runs in parallel.
+
+        Args:
+            executor (Executor): The process pool to run the work units on.
+        """
+        if self.settings.seed is None and self.settings.reps > 1:
+            self.log_message(
+                "Warning: Without a seed, the repetitions of a parallel run start from a new population and new schedule counters instead of carrying them over from the previous repetition, so the output differs from a serial run. Set a seed to get the same output with any number of jobs."
+            )
+
+        # without a seed, the forked workers would all start from the random state of this process
+        entropy = random_streams.get_entropy() if self.settings.seed is None else None
+        futures = [
+            executor.submit(
+                _run_work_unit,
+                self.settings,
+                self.schedule_arrangements,
+                rep,
+                arrangement_indices,
+                self.result_cache,
+                self.progress_counters,
+                self.progress_offset,
+                entropy,
+                unit,
+            )
+            for unit, (rep, arrangement_indices) in enumerate(self.get_work_units())
+        ]
+
+        for future in futures:
+            blocks, instrumentation = future.result()
+            if self.instrumentation is not None:
+                self.instrumentation.merge(instrumentation)
+
+            for rep, sch, block in blocks:
+                self._write_block(rep, sch, block)
+
+    def _run_arrangement_with_engine(
+        self,
+        rep: int,
+        sch: int,
+        arrangement: list[Schedule],
+        first_gen: int = 0,
+        block: tuple | None = None,
+    ) -> tuple:
+        """
+        Runs a schedule arrangement with the engine from the settings.
+
+        Args:
+            rep (int): The current repetition.
+            sch (int): The index of the schedule arrangement.
+            arrangement (list[Schedule]): The schedule arrangement to run.
+            first_gen (int, optional): The generation to start from. Defaults to 0.
+            block (tuple, optional): The output block of the generations before first_gen. A new block is used if not given.
+
+        Returns:
+            tuple: The output block of the arrangement.
+        """
+        if self.settings.engine == "compiled":
+            return self._run_arrangement_compiled(
+                rep, sch, arrangement, first_gen, block
+            )
+
+        if self.settings.engine != "python":
+            raise ValueError(
+                f"Giddydowned: {self.settings.engine} is not an engine. The engine must be python or compiled."
+            )
+
+        return self._run_arrangement(rep, sch, arrangement, first_gen, block)
+
+    def _run_arrangement(
+        self,
+        rep: int,
+        sch: int,
+        arrangement: list[Schedule],
+        first_gen: int = 0,
+        block: tuple | None = None,
+    ) -> tuple:
+        """
+        Runs the organism on a schedule arrangement for the specified number of generations, one generation at a time.
+
+        The outputs are summed into the rows from DataSaver.get_block_layout, which are the generations themselves unless the experiment is summary-only.
+
+        Args:
+            rep (int): The current repetition.
+            sch (int): The index of the schedule arrangement.
+            arrangement (list[Schedule]): The schedule arrangement to run.
+            first_gen (int, optional): The generation to start from. Defaults to 0.
+            block (tuple, optional): The output block of the generations before first_gen. A new block is used if not given.
+
+        Returns:
+            tuple: The emissions, behavior, reinforcement and punishment arrays of the arrangement.
+        """
+        bin_offset, bin_width, _ = self.data_saver.get_block_layout(rep, sch)
+        if block is None:
+            block = self.data_saver.create_block(rep, sch, len(arrangement))
+        self.current_block = (rep, sch, block)
+        emissions, behavior, reinforcement, punishment = block
+        response_class_table = self.response_class_tables[sch]
+
+        # compile the strategies for every settings object the arrangement can deliver
+        self.algorithm.bind_arrangement(
+            [self.settings] + [schedule.settings for schedule in arrangement]
+        )
+        # compile the schedules into arrays that are advanced by a single jitted call per generation
+        schedules = CompiledSchedules(arrangement)
+
+        instrumentation = self.instrumentation
+
+        for gen in range(first_gen, self.settings.gens):
+            if instrumentation is not None:
+                instrumentation.start()
+
+            # emit the response
+            self.organism.emit()
+            if instrumentation is not None:
+                instrumentation.lap("emit")
+
+            # update the output block with the emitted response
+            row = (gen + bin_offset) // bin_width
+            emissions[row] = self.organism.emitted
+
+            # look up the response class membership of the emitted response for every schedule at once and run the schedules
+            membership = int(response_class_table[self.organism.emitted])
+            reinforced, punished = schedules.run(membership)
+
+            # initialize reinforcement and punishment flags and schedules
+            reinforcement_available = reinforced != 0
+            schedule_to_deliver_reinforcement = (
+                self.settings
+            )  # default to the experiment settings
+            punishment_available = punished != 0
+            schedule_to_deliver_punishment = self.settings
+
+            # update the output block, delivering the settings of the last schedule that reinforced or punished
+            # the output block is zero-initialized, so only the outputs that occurred are counted
+            for i, schedule in enumerate(arrangement):
+                # update whether the emitted response is in the response class
+                if membership >> i & 1:
+                    behavior[row, i] += 1
+
+                if reinforced >> i & 1:
+                    schedule_to_deliver_reinforcement = schedule.settings
+                    reinforcement[row, i] += 1
+
+                elif punished >> i & 1:
+                    schedule_to_deliver_punishment = schedule.settings
+                    punishment[row, i] += 1
+
+            if instrumentation is not None:
+                instrumentation.lap("schedules")
+
+            # run the algorithm on the organism
+            self.algorithm.run(
+                reinforcement_available,
+                punishment_available,
+                schedule_to_deliver_reinforcement,
+                schedule_to_deliver_punishment,
+            )
+
+            # update the progress of the experiment
+            self._set_progress(rep, sch, gen + 1)
+
+            if self._is_checkpoint_gen(gen + 1):
+                # the checkpoint saves the schedules with the rest of the run
+                schedules.store()
+                self._save_checkpoint(
+                    rep * len(self.schedule_arrangements) + sch, gen + 1, block
+                )
+
+        schedules.store()
+
+        return block
+
+    def _run_arrangement_compiled(
+        self,
+        rep: int,
+        sch: int,
+        arrangement: list[Schedule],
+        first_gen: int = 0,
+        block: tuple | None = None,
+    ) -> tuple:
+        """
+        Runs the organism on a schedule arrangement with the compiled engine, which executes whole runs of generations in a single jitted loop.
+
+        Args:
+            rep (int): The current repetition.
+            sch (int): The index of the schedule arrangement.
+            arrangement (list[Schedule]): The schedule arrangement to run.
+            first_gen (int, optional): The generation to start from. Defaults to 0.
+            block (tuple, optional): The output block of the generations before first_gen. A new block is used if not given.
+
+        Returns:
+            tuple: The emissions, behavior, reinforcement and punishment arrays of the arrangement.
+        """
+        compiled_arrangement = CompiledArrangement(
+            arrangement,
+            self.settings,
+            self.organism,
+            self.response_class_tables[sch],
+        )
+        bin_offset, bin_width, num_rows = self.data_saver.get_block_layout(rep, sch)
+        outputs = block
+        if outputs is None:
+            outputs = compiled_arrangement.create_outputs(
+                num_rows, self.data_saver.get_output_type()
+            )
+        self.current_block = (rep, sch, outputs)
+
+        # run the generations in chunks so that the progress can still be counted and checkpoints saved
+        for chunk_first_gen, chunk_last_gen in self._get_gen_chunks(first_gen):
+            if self.instrumentation is not None:
+                self.instrumentation.start()
+            compiled_arrangement.run(
+                chunk_first_gen, chunk_last_gen, outputs, bin_offset, bin_width
+            )
+            if self.instrumentation is not None:
+                self.instrumentation.lap(
+                    "generations", chunk_last_gen - chunk_first_gen
+                )
+            self._set_progress(rep, sch, chunk_last_gen)
+
+            if self._is_checkpoint_gen(chunk_last_gen):
+                self._save_checkpoint(
+                    rep * len(self.schedule_arrangements) + sch, chunk_last_gen, outputs
+                )
+
+        return outputs
+
+
+def warm_up(warmups: list[tuple[ExperimentSettings, list[list[Schedule]]]]) -> None:
+    """
+    Runs a couple of generations of each experiment so that the jitted kernels it uses are compiled (or loaded from the on-disk cache) before the experiment starts.
+
+    Args:
+        warmups (list[tuple[ExperimentSettings, list[list[Schedule]]]]): The settings and schedule arrangements of each experiment.
+    """
+    for settings, schedule_arrangements in warmups:
+        warmup_settings = replace(settings, reps=1, gens=2)
+        # run copies of the schedules so the warm-up doesn't change their state
+        experiment = Experiment(
+            warmup_settings, deepcopy(schedule_arrangements[:1]), False, ""
+        )
+        experiment.run_work_unit(0, [0])
+
+
+def init_worker(warmups: list[tuple[ExperimentSettings, list[list[Schedule]]]]) -> None:
+    """
+    Initializes a process pool worker by warming up each experiment, so that the jitted kernels are loaded once per worker instead of inside the first work unit.
+
+    Args:
+        warmups (list[tuple[ExperimentSettings, list[list[Schedule]]]]): The settings and schedule arrangements of each experiment the worker will run.
+    """
+    warm_up(warmups)
+
+
+def _run_work_unit(
+    settings: ExperimentSettings,
+    schedule_arrangements: list[list[Schedule]],
+    rep: int,
+    arrangement_indices: list[int],
+    result_cache: ResultCache | None = None,
+    progress_counters: ProgressCounters | None = None,
+    progress_offset: int = 0,
+    entropy: int | None = None,
+    unit: int = 0,
+) -> tuple[list[tuple[int, int, tuple]], Instrumentation | None]:
+    """
+    Runs a unit of work of an experiment in a process pool worker.
+
+    Args:
+        settings (ExperimentSettings): The settings for the experiment.
+        schedule_arrangements (list[list[Schedule]]): The schedule arrangements of the experiment.
+        rep (int): The repetition of the unit.
+        arrangement_indices (list[int]): The indices of the schedule arrangements in the unit.
+        result_cache (ResultCache, optional): The result cache of the experiment. Defaults to None.
+        progress_counters (ProgressCounters, optional): The progress counters of the experiment, attached to the shared memory of the main process. Defaults to None.
+        progress_offset (int, optional): The first slot of the experiment in the progress counters. Defaults to 0.
+        entropy (int, optional): The root seed of an unseeded run, from random_streams.get_entropy. When given, the unit is run on its own stream and its schedules are reset, so the units of the run are independent of each other. Defaults to None.
+        unit (int, optional): The index of the unit, which keys its stream. Defaults to 0.
+
+    Returns:
+        tuple[list[tuple[int, int, tuple]], Instrumentation | None]: The repetition, schedule arrangement index and output block of each arrangement in the unit, and the instrumentation of the unit if the run is instrumented.
+    """
+    if entropy is not None:
+        random_streams.seed_stream(entropy, unit)
+        for sch in arrangement_indices:
+            for schedule in schedule_arrangements[sch]:
+                schedule.reset()
+
+    experiment = Experiment(settings, schedule_arrangements, False, "", result_cache)
+    experiment.set_progress(progress_counters, progress_offset)
+    try:
+        return (
+            experiment.run_work_unit(rep, arrangement_indices),
+            experiment.instrumentation,
+        )
+    finally:
+        if progress_counters is not None:
+            progress_counters.close()
@@ -1,7 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
 import json
-from pyetbd import experiment_runner
+import queue
+
+# the colors of the schedules in the plot of the rates
+PLOT_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
 
 
 class ExperimentGUIData:
@@ -200,6 +203,10 @@ class ExperimentGUI:
         # Set up attributes
         self.data_obj = ExperimentGUIData()
         self.entry_dict = {}
+        # the background process running the experiments and the queue of its messages
+        self.run_process = None
+        self.run_messages = None
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
 
         # Call methods
         self.create_widgets()
@@ -207,6 +214,11 @@ class ExperimentGUI:
     def run(self):
         self.master.mainloop()
 
+    def close(self):
+        # stop a run that's still going so it doesn't outlive the window
+        self.cancel_run()
+        self.master.destroy()
+
     # Widget Creation
 
     def create_widgets(self):
@@ -255,11 +267,15 @@ class ExperimentGUI:
         self.runner_entry = ttk.Entry(frame)
         self.runner_entry.grid(row=0, column=1, sticky="w")
 
-        # Create a button to run the experiments
-        run_experiments_button = ttk.Button(
+        # Create buttons to run the experiments and to cancel the run
+        self.run_experiments_button = ttk.Button(
             frame, text="Run", command=self.run_experiments
         )
-        run_experiments_button.grid(row=1, column=0, columnspan=2)
+        self.run_experiments_button.grid(row=1, column=0)
+        self.cancel_run_button = ttk.Button(
+            frame, text="Cancel", command=self.cancel_run, state="disabled"
+        )
+        self.cancel_run_button.grid(row=1, column=1)
 
         # Create an info frame
         info_frame = ttk.Frame(tab)
@@ -268,10 +284,28 @@ class ExperimentGUI:
         # Create a label for the info frame
         info_label = ttk.Label(
             info_frame,
-            text="Info: Please enter the name of the experiment file to run. Be sure to include the '.json' extension.\nClick the 'Run' button to run the experiments.",
+            text="Info: Please enter the name of the experiment file to run. Be sure to include the '.json' extension.\nClick the 'Run' button to run the experiments. They run in the background, so the window stays responsive and the run can be cancelled.",
         )
         info_label.pack(fill="both", expand=True)
 
+        # Create the progress widgets
+        progress_frame = ttk.Frame(tab)
+        progress_frame.pack(fill="x", padx=10, pady=5)
+        self.run_progressbar = ttk.Progressbar(
+            progress_frame, orient="horizontal", mode="determinate", maximum=1.0
+        )
+        self.run_progressbar.pack(fill="x")
+        self.run_status_label = ttk.Label(progress_frame, text="")
+        self.run_status_label.pack(fill="x")
+
+        # Create a canvas for the plot of the response and reinforcement rates
+        self.rates_canvas = tk.Canvas(tab, height=350, background="white")
+        self.rates_canvas.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Create a text box for the messages of the run
+        self.run_log = tk.Text(tab, height=10, state="disabled")
+        self.run_log.pack(fill="both", expand=True, padx=10, pady=5)
+
     def create_experiment_widgets(self, frame):
         # Create the widgets for the experiment settings
         for i, label in enumerate(self.data_obj.experiment_setting_labels):
@@ -483,26 +517,142 @@ class ExperimentGUI:
         self.data_obj.experiments = []
 
     def run_experiments(self):
+        if self.run_process is not None:
+            return
+
         # Get the filename
         file_name = self.runner_entry.get()
 
+        # Start the run in a background process
+        # the worker (and numba with it) is only imported once experiments are run, so the GUI opens quickly
+        from pyetbd import gui_worker
+
+        self.run_process, self.run_messages = gui_worker.start_run(file_name, "")
+
         # Let the user know the experiments are running
-        frame = tk.Toplevel(self.master)
-        frame.title(f"Running")
-        frame.geometry("400x100")
-        label = ttk.Label(
-            frame, text=f"Running {file_name}... See terminal for progress"
+        self.run_experiments_button.config(state="disabled")
+        self.cancel_run_button.config(state="normal")
+        self.run_progressbar["value"] = 0
+        self.run_status_label.config(text=f"Running {file_name}...")
+        self.rates_canvas.delete("all")
+        self.clear_run_log()
+
+        self.master.after(100, self.poll_run)
+
+    def poll_run(self):
+        if self.run_process is None:
+            return
+
+        # handle every message the run has sent since the last poll
+        finished = False
+        while True:
+            try:
+                message = self.run_messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if message[0] == "progress":
+                _, status, fraction, rates = message
+                self.run_progressbar["value"] = fraction
+                self.run_status_label.config(text=status)
+                if rates is not None:
+                    self.draw_rates(rates)
+            elif message[0] == "message":
+                self.add_to_run_log(message[1])
+            elif message[0] == "error":
+                self.add_to_run_log(message[1])
+                self.finish_run("Giddydowned: The run failed. See the messages below.")
+                finished = True
+            elif message[0] == "done":
+                self.finish_run("\U0001f434 Done Giddyupped! \U0001f434")
+                finished = True
+
+        if finished:
+            return
+
+        if not self.run_process.is_alive():
+            # the process ended without saying it was done
+            self.finish_run("Giddydowned: The run stopped unexpectedly.")
+            return
+
+        self.master.after(100, self.poll_run)
+
+    def cancel_run(self):
+        if self.run_process is None:
+            return
+
+        # terminating the process stops the run immediately, so the output of the experiment it was on is incomplete
+        self.run_process.terminate()
+        self.finish_run(
+            "Cancelled. The output of the experiment that was running is incomplete."
         )
-        label.pack()
-        self.master.update()
 
-        # Run the experiments
-        runner = experiment_runner.ExperimentRunner(file_name, "")
-        runner.giddyup()
+    def finish_run(self, text):
+        self.run_process.join()
+        self.run_process = None
+        self.run_messages = None
+
+        self.run_status_label.config(text=text)
+        self.run_experiments_button.config(state="normal")
+        self.cancel_run_button.config(state="disabled")
+
+    def draw_rates(self, rates):
+        canvas = self.rates_canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        left, right, top, bottom = 60, width - 20, 30, height - 40
+
+        gens = rates["gens"]
+        if len(gens) == 0 or right <= left or bottom <= top:
+            return
+
+        max_gen = max(gens[-1], 1)
+        max_rate = max(
+            [max(r) for r in rates["responses"] + rates["reinforcers"]] + [0.01]
+        )
+
+        def to_point(gen, rate):
+            x = left + (right - left) * gen / max_gen
+            y = bottom - (bottom - top) * rate / max_rate
+            return x, y
+
+        # Draw the axes
+        canvas.create_text(width / 2, 15, text=rates["title"])
+        canvas.create_line(left, top, left, bottom, right, bottom)
+        canvas.create_text(left - 5, top, text=f"{max_rate:.2f}", anchor="e")
+        canvas.create_text(left - 5, bottom, text="0", anchor="e")
+        canvas.create_text(right, bottom + 15, text=f"{max_gen:.0f}", anchor="e")
+        canvas.create_text((left + right) / 2, bottom + 25, text="Generation")
+
+        # Draw the response rates as solid lines and the reinforcement rates as dashed lines
+        for i, (responses, reinforcers) in enumerate(
+            zip(rates["responses"], rates["reinforcers"])
+        ):
+            color = PLOT_COLORS[i % len(PLOT_COLORS)]
+            for line, dash in [(responses, None), (reinforcers, (4, 2))]:
+                points = [to_point(gen, rate) for gen, rate in zip(gens, line)]
+                if len(points) > 1:
+                    canvas.create_line(*points, fill=color, dash=dash)
+
+            canvas.create_text(
+                right,
+                top + 15 * i,
+                text=f"B{i + 1} / R{i + 1}",
+                fill=color,
+                anchor="ne",
+            )
+
+    def add_to_run_log(self, text):
+        self.run_log.config(state="normal")
+        self.run_log.insert("end", f"{text}\n")
+        self.run_log.see("end")
+        self.run_log.config(state="disabled")
 
-        # Let the user know the experiments are done
-        frame.title("Success")
-        label.config(text="\U0001F434 Done Giddyupped! \U0001F434")
+    def clear_run_log(self):
+        self.run_log.config(state="normal")
+        self.run_log.delete("1.0", "end")
+        self.run_log.config(state="disabled")
 
     # Helpers
 
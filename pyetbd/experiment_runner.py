@@ -1,7 +1,12 @@
 import json
-from pyetbd.experiment import Experiment
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pyetbd.experiment import Experiment, init_worker, warm_up
+from pyetbd.result_cache import ResultCache
 from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
-from pyetbd.utils import timer
+from pyetbd.utils import random_streams, timer
+from pyetbd.utils.progress import ProgressMonitor
 from pyetbd.schedules import (
     Schedule,
     RandomIntervalSchedule,
@@ -18,15 +23,31 @@ class ExperimentRunner:
     Args:
         input_file (str): The path to the input file containing experiment settings.
         output_dir (str, optional): The directory where the experiment output will be saved. Defaults to "".
-        log_progress (bool, optional): Flag indicating whether to log the progress of the experiments. Defaults to True.
+        log_progress (bool, optional): Flag indicating whether to report the progress of each experiment and of all of them together while they run. Defaults to True.
+        jobs (int, optional): The number of worker processes to run the repetitions and schedule arrangements on. Defaults to 1, which runs everything serially in this process.
+        resume (bool, optional): Flag indicating whether to resume interrupted experiments from their checkpoints. Experiments that already finished are skipped and the rest run from the beginning. Defaults to False.
+        cache_dir (str, optional): The directory of a result cache that the output blocks of seeded experiments are reused from, so only the repetitions and schedule arrangements whose settings changed are run. Defaults to None, which runs everything.
+        cache_size (int, optional): The size in bytes the result cache is kept under by removing the least recently used blocks. Defaults to 1 GB.
     """
 
     def __init__(
-        self, input_file: str, output_dir: str = "", log_progress: bool = True
+        self,
+        input_file: str,
+        output_dir: str = "",
+        log_progress: bool = True,
+        jobs: int = 1,
+        resume: bool = False,
+        cache_dir: str | None = None,
+        cache_size: int = 2**30,
     ):
         self.input_file = input_file
         self.output_dir = output_dir
         self.log_progress = log_progress
+        self.jobs = jobs
+        self.resume = resume
+        self.result_cache = (
+            None if cache_dir is None else ResultCache(cache_dir, cache_size)
+        )
 
         self._load_input()
 
@@ -48,13 +69,9 @@ class ExperimentRunner:
         experiments = []
 
         for exp in self.settings["experiments"]:
-            # create experiment settings object from json
-            exp_settings = ExperimentSettings(**exp)
-            # create schedule objects from json
-            schedules = self._load_schedules(exp)
-            # create experiment object
-            experiment = Experiment(
-                exp_settings, schedules, self.log_progress, self.output_dir
+            # create experiment object from json
+            experiment = load_experiment(
+                exp, self.output_dir, self.log_progress, self.result_cache
             )
             # add experiment to list of experiments
             experiments.append(experiment)
@@ -62,72 +79,178 @@ class ExperimentRunner:
         # return list of experiment objects
         return experiments
 
-    def _load_schedules(self, exp: dict) -> list[list[Schedule]]:
+    def _run_experiment(
+        self, experiment: Experiment, executor: ProcessPoolExecutor | None = None
+    ) -> None:
         """
-        Loads the schedules for a given experiment.
+        Runs an experiment, or resumes it from its checkpoint when resuming.
 
         Args:
-            exp (dict): The experiment settings.
+            experiment (Experiment): The experiment to run.
+            executor (ProcessPoolExecutor, optional): The process pool to run the experiment on. Defaults to None.
+        """
+        if self.resume:
+            if os.path.exists(experiment.get_checkpoint_path()):
+                experiment.log_message(f"Resuming {experiment.settings.file_stub}...")
+                experiment.run(executor, resume=True)
+                return
+
+            # the checkpoint is removed when the summary workbook is saved, so an experiment with a workbook and no checkpoint already finished
+            if os.path.exists(f"{self.output_dir}{experiment.settings.file_stub}.xlsx"):
+                experiment.log_message(
+                    f"Skipping {experiment.settings.file_stub}, which already finished."
+                )
+                experiment.finish_progress()
+                return
+
+        experiment.run(executor)
+
+    def create_progress_monitor(self, experiments: list[Experiment]) -> ProgressMonitor:
+        """
+        Creates the monitor that reports the progress of the experiments while they run.
+
+        Args:
+            experiments (list[Experiment]): The experiments.
 
         Returns:
-            list[list[Schedule]]: A nested list of Schedule objects.
+            ProgressMonitor: The progress monitor.
         """
-        # the schedule_classes dictionary maps the schedule type and subtype to the corresponding Schedule class
-        schedule_classes = {
-            "random": {
-                "interval": RandomIntervalSchedule,
-                "ratio": RandomRatioSchedule,
-            },
-            "fixed": {"interval": FixedIntervalSchedule, "ratio": FixedRatioSchedule},
-        }
-        schedules = []
-
-        # loop through each schedule arrangement in the experiment settings
-        for sched_arrangement in exp["schedules"]:
-            # create a list to hold the schedule objects
-            arrangement = []
-            # loop through each schedule in the arrangement
-            for sched in sched_arrangement:
-                # create a copy of the experiment settings
-                exp_copy = exp.copy()
-
-                # get a list of field names that are unique to ExperimentSettings
-                experiment_only_fields = set(
-                    ExperimentSettings.__annotations__.keys()
-                ) - set(ScheduleSettings.__annotations__.keys())
-
-                # remove these fields from exp_copy
-                for field in experiment_only_fields:
-                    exp_copy.pop(field, None)
-
-                # create a ScheduleSettings object from the json
-                # this will first look at the experiment settings and then override with the schedule settings if they exist
-                sched_settings = ScheduleSettings(**exp_copy, **sched)
-                try:
-                    # create the schedule object based on the schedule type and subtype using the schedule_classes dictionary
-                    schedule_class = schedule_classes[sched_settings.schedule_type][
-                        sched_settings.schedule_subtype
-                    ]
-                except KeyError:
-                    # raise an error if the schedule type or subtype is invalid
-                    raise ValueError("Invalid schedule type")
-                # add the schedule object to the arrangement list
-                arrangement.append(schedule_class(sched_settings))
-            # add the arrangement list to the schedules list
-            schedules.append(arrangement)
-
-        return schedules
+        return ProgressMonitor(
+            [experiment.get_progress_task() for experiment in experiments]
+        )
 
     @timer.timer
     def giddyup(self) -> None:
         """
         Runs the experiments.
 
-        This method loads the experiments, and then runs each experiment.
+        This method loads the experiments, warms up the jitted kernels, and then runs each experiment. When jobs is greater than 1, the work units of every experiment are shared out across a process pool whose workers load the kernels from the on-disk cache once when they start.
+
+        When the progress is logged, one progress monitor reports the throughput and ETA of the running experiment and of all the experiments together, from counters the workers update in shared memory.
         """
         print("Loading experiments...")
         experiments = self._load_experiments()
-        for experiment in experiments:
-            experiment.run()
+        warmups = [
+            (experiment.settings, experiment.schedule_arrangements)
+            for experiment in experiments
+        ]
+
+        # compile (or load from the cache) the kernels up front so the startup time is reported separately from the simulation time
+        start = time.perf_counter()
+        warm_up(warmups)
+        print(r"Startup time elapsed: %.3f" % (time.perf_counter() - start))
+
+        if self.log_progress:
+            progress_monitor = self.create_progress_monitor(experiments)
+            for experiment, offset in zip(experiments, progress_monitor.offsets):
+                experiment.set_progress(
+                    progress_monitor.counters, offset, progress_monitor
+                )
+            progress_monitor.start()
+
+        try:
+            if self.jobs > 1:
+                with ProcessPoolExecutor(
+                    max_workers=self.jobs, initializer=init_worker, initargs=(warmups,)
+                ) as executor:
+                    for experiment in experiments:
+                        self._run_experiment(experiment, executor)
+
+            else:
+                for experiment in experiments:
+                    self._run_experiment(experiment)
+
+        finally:
+            if self.log_progress:
+                progress_monitor.stop()
 
         print("\U0001F434 Done Giddyupped! \U0001F434")
+
+
+def load_experiment(
+    exp: dict,
+    output_dir: str = "",
+    log_progress: bool = False,
+    result_cache: ResultCache | None = None,
+) -> Experiment:
+    """
+    Loads an experiment from its settings in an input file.
+
+    Args:
+        exp (dict): The experiment settings.
+        output_dir (str, optional): The directory where the experiment output will be saved. Defaults to "".
+        log_progress (bool, optional): Flag indicating whether to log the progress of the experiment. Defaults to False.
+        result_cache (ResultCache, optional): The cache to reuse output blocks from. Defaults to None.
+
+    Returns:
+        Experiment: The experiment.
+    """
+    # create experiment settings object from json
+    exp_settings = ExperimentSettings(**exp)
+    # seed the generation of the response classes if the experiment is seeded
+    if exp_settings.seed is not None:
+        random_streams.seed_stream(
+            exp_settings.seed,
+            random_streams.get_experiment_key(exp_settings.file_stub),
+        )
+    # create schedule objects from json
+    schedules = load_schedules(exp)
+    # create experiment object
+    return Experiment(exp_settings, schedules, log_progress, output_dir, result_cache)
+
+
+def load_schedules(exp: dict) -> list[list[Schedule]]:
+    """
+    Loads the schedules for a given experiment.
+
+    Args:
+        exp (dict): The experiment settings.
+
+    Returns:
+        list[list[Schedule]]: A nested list of Schedule objects.
+    """
+    # the schedule_classes dictionary maps the schedule type and subtype to the corresponding Schedule class
+    schedule_classes = {
+        "random": {
+            "interval": RandomIntervalSchedule,
+            "ratio": RandomRatioSchedule,
+        },
+        "fixed": {"interval": FixedIntervalSchedule, "ratio": FixedRatioSchedule},
+    }
+    schedules = []
+
+    # loop through each schedule arrangement in the experiment settings
+    for sched_arrangement in exp["schedules"]:
+        # create a list to hold the schedule objects
+        arrangement = []
+        # loop through each schedule in the arrangement
+        for sched in sched_arrangement:
+            # create a copy of the experiment settings
+            exp_copy = exp.copy()
+
+            # get a list of field names that are unique to ExperimentSettings
+            experiment_only_fields = set(
+                ExperimentSettings.__annotations__.keys()
+            ) - set(ScheduleSettings.__annotations__.keys())
+
+            # remove these fields from exp_copy
+            for field in experiment_only_fields:
+                exp_copy.pop(field, None)
+
+            # create a ScheduleSettings object from the json
+            # this will first look at the experiment settings and then override with the schedule settings if they exist
+            sched_settings = ScheduleSettings(**exp_copy, **sched)
+            try:
+                # create the schedule object based on the schedule type and subtype using the schedule_classes dictionary
+                schedule_class = schedule_classes[sched_settings.schedule_type][
+                    sched_settings.schedule_subtype
+                ]
+            except KeyError:
+                # raise an error if the schedule type or subtype is invalid
+                raise ValueError("Invalid schedule type")
+            # add the schedule object to the arrangement list
+            arrangement.append(schedule_class(sched_settings))
+        # add the arrangement list to the schedules list
+        schedules.append(arrangement)
+
+    return schedules
@@ -0,0 +1,204 @@
+import io
+import multiprocessing
+import traceback
+from contextlib import redirect_stdout
+import numpy as np
+from pyetbd.experiment import Experiment
+from pyetbd.experiment_runner import ExperimentRunner
+from pyetbd.utils.progress import ProgressMonitor
+
+# the number of points in the plot of the rates
+PLOT_POINTS = 200
+
+
+def downsample_rates(
+    counts: np.ndarray, num_rows: int, bin_width: int, points: int = PLOT_POINTS
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsamples the per-row counts of an output block into at most points rates per generation.
+
+    Args:
+        counts (np.ndarray): The (rows, schedules) counts of an output, e.g. the behavior of each schedule.
+        num_rows (int): The number of rows filled so far.
+        bin_width (int): The number of generations in each row.
+        points (int, optional): The maximum number of points. Defaults to PLOT_POINTS.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The generation at the middle of each point and the (points, schedules) rates.
+    """
+    if num_rows == 0:
+        return np.zeros(0), np.zeros((0, counts.shape[1]))
+
+    group = -(-num_rows // points)
+    starts = np.arange(0, num_rows, group)
+    group_gens = np.diff(np.append(starts, num_rows)) * bin_width
+
+    sums = np.add.reduceat(counts[:num_rows].astype(np.int64), starts, axis=0)
+    gens = starts * bin_width + group_gens / 2
+
+    return gens, sums / group_gens[:, None]
+
+
+class QueueWriter(io.TextIOBase):
+    """
+    A text stream that sends every line written to it to a queue as a ("message", line) message.
+
+    Args:
+        messages (multiprocessing.Queue): The queue to send the lines to.
+    """
+
+    def __init__(self, messages: multiprocessing.Queue):
+        self.messages = messages
+        self.buffer = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        *lines, self.buffer = (self.buffer + text).split("\n")
+        for line in lines:
+            self.messages.put(("message", line))
+
+        return len(text)
+
+
+class QueueProgressMonitor(ProgressMonitor):
+    """
+    A progress monitor that sends the progress to a queue instead of printing it, for the GUI to show.
+
+    Every report is a ("progress", status, fraction done, rates) message. The rates are the response and reinforcement rates of each schedule in the block being run, downsampled by downsample_rates from the output the block has filled so far, so the simulation doesn't wait for the plot.
+
+    Args:
+        experiments (list[Experiment]): The experiments.
+        messages (multiprocessing.Queue): The queue to send the progress to.
+        interval (float, optional): The seconds between reports. Defaults to 0.5.
+    """
+
+    def __init__(
+        self,
+        experiments: list[Experiment],
+        messages: multiprocessing.Queue,
+        interval: float = 0.5,
+    ):
+        super().__init__(
+            [experiment.get_progress_task() for experiment in experiments],
+            interval,
+            QueueWriter(messages),
+        )
+        self.experiments = experiments
+        self.messages = messages
+
+    def render(self, now: float | None = None) -> None:
+        status = self.get_status(now)
+        done = self.samples[-1][1]
+        fraction = done.sum() / self.totals.sum() if self.totals.sum() else 1.0
+        self.messages.put(("progress", status, float(fraction), self.get_rates(done)))
+
+    def get_rates(self, done: np.ndarray) -> dict | None:
+        """
+        Gets the downsampled rates of the block the running experiment is on.
+
+        Args:
+            done (np.ndarray): The generations each experiment has run.
+
+        Returns:
+            dict | None: The title of the block, the generations of the points and the response and reinforcement rates of each schedule, or None if no block has started.
+        """
+        # the running experiment, or the last one that ran
+        started = [i for i in range(len(self.experiments)) if done[i] > 0]
+        if not started:
+            return None
+        running = [i for i in started if done[i] < self.totals[i]]
+        index = running[0] if running else started[-1]
+
+        experiment = self.experiments[index]
+        if experiment.current_block is None:
+            return None
+        rep, sch, block = experiment.current_block
+        _, behavior, reinforcement, _ = block
+
+        # the rows the block has filled so far
+        gens_done = self.counters.gens[
+            self.offsets[index] + rep * len(experiment.schedule_arrangements) + sch
+        ]
+        bin_offset, bin_width, num_rows = experiment.data_saver.get_block_layout(
+            rep, sch
+        )
+        rows_done = 0
+        if gens_done > 0:
+            rows_done = min((gens_done + bin_offset - 1) // bin_width + 1, num_rows)
+
+        gens, response_rates = downsample_rates(behavior, rows_done, bin_width)
+        _, reinforcement_rates = downsample_rates(reinforcement, rows_done, bin_width)
+
+        return {
+            "title": f"{experiment.settings.file_stub}: rep {rep + 1}, arrangement {sch + 1}",
+            "gens": (gens - bin_offset).tolist(),
+            "responses": response_rates.T.tolist(),
+            "reinforcers": reinforcement_rates.T.tolist(),
+        }
+
+
+class BackgroundRunner(ExperimentRunner):
+    """
+    An experiment runner that sends its progress to a queue with a QueueProgressMonitor.
+
+    Args:
+        input_file (str): The path to the input file containing experiment settings.
+        output_dir (str): The directory where the experiment output will be saved.
+        messages (multiprocessing.Queue): The queue to send the progress to.
+    """
+
+    def __init__(
+        self, input_file: str, output_dir: str, messages: multiprocessing.Queue
+    ):
+        super().__init__(input_file, output_dir)
+        self.messages = messages
+
+    def create_progress_monitor(self, experiments: list[Experiment]) -> ProgressMonitor:
+        return QueueProgressMonitor(experiments, self.messages)
+
+
+def run_experiments(
+    input_file: str, output_dir: str, messages: multiprocessing.Queue
+) -> None:
+    """
+    Runs the experiments in an input file in a background process, sending everything it prints to the queue as ("message", line) messages, the progress as ("progress", ...) messages, and then ("done",), or ("error", traceback) if the run failed.
+
+    Args:
+        input_file (str): The path to the input file containing experiment settings.
+        output_dir (str): The directory where the experiment output will be saved.
+        messages (multiprocessing.Queue): The queue to send the messages to.
+    """
+    try:
+        with redirect_stdout(QueueWriter(messages)):
+            BackgroundRunner(input_file, output_dir, messages).giddyup()
+
+    except Exception:
+        messages.put(("error", traceback.format_exc()))
+
+    else:
+        messages.put(("done",))
+
+
+def start_run(
+    input_file: str, output_dir: str = ""
+) -> tuple[multiprocessing.Process, multiprocessing.Queue]:
+    """
+    Starts running the experiments in an input file in a background process. The process is spawned rather than forked, so it doesn't inherit the state of the GUI, and terminating it cancels the run.
+
+    Args:
+        input_file (str): The path to the input file containing experiment settings.
+        output_dir (str, optional): The directory where the experiment output will be saved. Defaults to "".
+
+    Returns:
+        tuple[multiprocessing.Process, multiprocessing.Queue]: The process and the queue of its messages (see run_experiments).
+    """
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    process = context.Process(
+        target=run_experiments, args=(input_file, output_dir, messages)
+    )
+    process.start()
+
+    return process, messages
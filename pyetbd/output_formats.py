@@ -0,0 +1,371 @@
+import os
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Iterator
+import numpy as np
+
+# pandas and pyarrow are only imported when output is written or loaded
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+
+    except ImportError:
+        raise ValueError(
+            "Giddydowned: The 'parquet' and 'feather' output formats need pyarrow. Install it with 'pip install pyarrow' or use the 'npy' output format."
+        )
+
+    return pyarrow
+
+
+class OutputWriter(ABC):
+    """
+    An abstract class representing a format for the per-generation output of an experiment.
+
+    The rows are written one block at a time, in row order, and the writer is closed once every block has been written.
+
+    Args:
+        path_stub (str): The output directory and file stub of the experiment.
+        columns (dict[str, np.dtype]): The name and type of each column.
+        num_rows (int): The number of rows in the whole experiment.
+
+    Attributes:
+        extension (str): The extension added to the path stub.
+        path (str): The path of the output.
+    """
+
+    extension = ""
+
+    def __init__(self, path_stub: str, columns: dict[str, np.dtype], num_rows: int):
+        self.path = f"{path_stub}{self.extension}"
+        self.columns = columns
+        self.num_rows = num_rows
+
+    @abstractmethod
+    def open(self) -> None:
+        """
+        Creates the output, replacing any output from a previous run.
+        """
+        pass
+
+    @abstractmethod
+    def write_block(self, start: int, block_columns: dict[str, np.ndarray]) -> None:
+        """
+        Writes a block of rows.
+
+        Args:
+            start (int): The index of the first row of the block.
+            block_columns (dict[str, np.ndarray]): The values of each column in the block.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Finishes the output once every block has been written.
+        """
+        pass
+
+    def get_checkpoint(self):
+        """
+        Makes sure the blocks written so far are on disk and gets what resume needs to continue the output from them.
+
+        Returns:
+            The state of the output, which must be picklable.
+        """
+        raise ValueError(
+            f"Giddydowned: The '{self.extension[1:]}' output format can't be checkpointed. Use the 'csv' or 'npy' output format."
+        )
+
+    def resume(self, checkpoint) -> None:
+        """
+        Reopens the output of an interrupted run, dropping any rows written after the checkpoint, so that the rest of the blocks can be written. Used instead of open.
+
+        Args:
+            checkpoint: The state from get_checkpoint.
+        """
+        raise ValueError(
+            f"Giddydowned: The '{self.extension[1:]}' output format can't be resumed. Use the 'csv' or 'npy' output format."
+        )
+
+    @abstractmethod
+    def iter_chunks(self, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+        """
+        Reads the written output back a chunk at a time, indexed by row.
+
+        Args:
+            chunk_rows (int): The number of rows in each chunk.
+
+        Yields:
+            pd.DataFrame: The next chunk of rows.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def load(cls, path: str) -> "pd.DataFrame":
+        """
+        Loads the whole output.
+
+        Args:
+            path (str): The path of the output.
+
+        Returns:
+            pd.DataFrame: The output, indexed by row.
+        """
+        pass
+
+
+class CSVWriter(OutputWriter):
+    """
+    A class representing the CSV output format, with the row index as the first, unnamed column.
+    """
+
+    extension = ".csv"
+
+    def open(self) -> None:
+        with open(self.path, "w") as f:
+            f.write("," + ",".join(self.columns) + "\n")
+
+    def write_block(self, start: int, block_columns: dict[str, np.ndarray]) -> None:
+        import pandas as pd
+
+        gens = len(block_columns["Gen"])
+        df = pd.DataFrame(block_columns, index=np.arange(start, start + gens))
+        df.to_csv(self.path, mode="a", header=False)
+
+    def get_checkpoint(self) -> int:
+        # every block is appended and closed, so the size of the file marks the end of the checkpointed rows
+        return os.path.getsize(self.path)
+
+    def resume(self, checkpoint: int) -> None:
+        os.truncate(self.path, checkpoint)
+
+    def iter_chunks(self, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+        import pandas as pd
+
+        yield from pd.read_csv(self.path, index_col=0, chunksize=chunk_rows)
+
+    @classmethod
+    def load(cls, path: str) -> "pd.DataFrame":
+        import pandas as pd
+
+        return pd.read_csv(path, index_col=0)
+
+
+class ParquetWriter(OutputWriter):
+    """
+    A class representing the Parquet output format, with one zstd compressed row group per block. Needs pyarrow.
+
+    The file is only readable once the writer has been closed.
+    """
+
+    extension = ".parquet"
+
+    def open(self) -> None:
+        pa = _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        self.schema = pa.schema(
+            [(name, pa.from_numpy_dtype(dtype)) for name, dtype in self.columns.items()]
+        )
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+    def write_block(self, start: int, block_columns: dict[str, np.ndarray]) -> None:
+        pa = _import_pyarrow()
+
+        self.writer.write_table(pa.Table.from_pydict(block_columns, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def iter_chunks(self, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        start = 0
+        for batch in pq.ParquetFile(self.path).iter_batches(batch_size=chunk_rows):
+            chunk = batch.to_pandas()
+            chunk.index = chunk.index + start
+            start += len(chunk)
+            yield chunk
+
+    @classmethod
+    def load(cls, path: str) -> "pd.DataFrame":
+        _import_pyarrow()
+        import pandas as pd
+
+        return pd.read_parquet(path)
+
+
+class FeatherWriter(OutputWriter):
+    """
+    A class representing the Feather (Arrow IPC) output format, with one zstd compressed record batch per block. Needs pyarrow.
+
+    The file is only readable once the writer has been closed.
+    """
+
+    extension = ".feather"
+
+    def open(self) -> None:
+        pa = _import_pyarrow()
+
+        self.schema = pa.schema(
+            [(name, pa.from_numpy_dtype(dtype)) for name, dtype in self.columns.items()]
+        )
+        self.writer = pa.ipc.new_file(
+            self.path,
+            self.schema,
+            options=pa.ipc.IpcWriteOptions(compression="zstd"),
+        )
+
+    def write_block(self, start: int, block_columns: dict[str, np.ndarray]) -> None:
+        pa = _import_pyarrow()
+
+        self.writer.write_batch(
+            pa.RecordBatch.from_pydict(block_columns, schema=self.schema)
+        )
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def iter_chunks(self, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+        pa = _import_pyarrow()
+
+        start = 0
+        with pa.memory_map(self.path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                chunk = reader.get_batch(i).to_pandas()
+                chunk.index = chunk.index + start
+                start += len(chunk)
+                yield chunk
+
+    @classmethod
+    def load(cls, path: str) -> "pd.DataFrame":
+        _import_pyarrow()
+        import pandas as pd
+
+        return pd.read_feather(path)
+
+
+class NpyWriter(OutputWriter):
+    """
+    A class representing a directory with one '.npy' file per column. The files are preallocated for the whole experiment and written through memory maps, so loading them maps the columns instead of parsing them.
+    """
+
+    extension = "_npy"
+
+    def open(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        # remove the columns of a previous run so they aren't loaded with this one
+        for name in os.listdir(self.path):
+            if name.endswith(".npy"):
+                os.remove(os.path.join(self.path, name))
+
+        self.memmaps = {
+            name: np.lib.format.open_memmap(
+                os.path.join(self.path, f"{name}.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(self.num_rows,),
+            )
+            for name, dtype in self.columns.items()
+        }
+
+    def write_block(self, start: int, block_columns: dict[str, np.ndarray]) -> None:
+        for name, values in block_columns.items():
+            self.memmaps[name][start : start + len(values)] = values
+
+    def close(self) -> None:
+        for memmap in self.memmaps.values():
+            memmap.flush()
+
+        self.memmaps = {}
+
+    def get_checkpoint(self) -> None:
+        for memmap in self.memmaps.values():
+            memmap.flush()
+
+    def resume(self, checkpoint: None) -> None:
+        # the files are preallocated, so rows after the checkpoint are simply overwritten
+        self.memmaps = {
+            name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r+")
+            for name in self.columns
+        }
+
+    def iter_chunks(self, chunk_rows: int) -> Iterator["pd.DataFrame"]:
+        df = self.load(self.path)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start : start + chunk_rows]
+
+    @classmethod
+    def load(cls, path: str) -> "pd.DataFrame":
+        import pandas as pd
+
+        # the directory listing has no order, so put the columns back in the order they were written
+        names = [name[: -len(".npy")] for name in os.listdir(path)]
+        names.sort(key=_get_column_order)
+
+        return pd.DataFrame(
+            {
+                name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                for name in names
+            },
+            copy=False,
+        )
+
+
+def _get_column_order(name: str) -> tuple[int, int, int]:
+    index_columns = ["Rep", "Sch", "Gen", "Emissions"]
+    if name in index_columns:
+        return (0, index_columns.index(name), 0)
+
+    # the schedule columns are B1, R1, P1, B2, ...
+    return (1, int(name[1:]), "BRP".index(name[0]))
+
+
+OUTPUT_WRITERS: dict[str, type[OutputWriter]] = {
+    "csv": CSVWriter,
+    "parquet": ParquetWriter,
+    "feather": FeatherWriter,
+    "npy": NpyWriter,
+}
+
+
+def get_output_writer(output_format: str) -> type[OutputWriter]:
+    """
+    Gets the writer class of an output format.
+
+    Args:
+        output_format (str): The name of the output format.
+
+    Returns:
+        type[OutputWriter]: The writer class.
+    """
+    try:
+        return OUTPUT_WRITERS[output_format]
+
+    except KeyError:
+        raise ValueError(
+            f"Giddydowned: '{output_format}' is not an output format. Use one of {list(OUTPUT_WRITERS)}."
+        )
+
+
+def load_output(
+    output_dir: str, file_stub: str, output_format: str = "csv"
+) -> "pd.DataFrame":
+    """
+    Loads the per-generation output of an experiment.
+
+    Args:
+        output_dir (str): The directory the experiment data was saved in.
+        file_stub (str): The file stub of the experiment.
+        output_format (str, optional): The output format of the experiment. Defaults to "csv".
+
+    Returns:
+        pd.DataFrame: The output, indexed by row. The columns of the 'npy' format are memory-mapped.
+    """
+    writer_class = get_output_writer(output_format)
+    return writer_class.load(f"{output_dir}{file_stub}{writer_class.extension}")
@@ -0,0 +1,88 @@
+import itertools
+import time
+from dataclasses import asdict
+from pyetbd.experiment import warm_up
+from pyetbd.schedules import FixedIntervalSchedule, Schedule
+from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
+from pyetbd.utils import random_streams
+
+# the strategies with jitted rules, paired as they can be used together
+PRECOMPILE_STRATEGIES = {
+    "selection_type": ["fitness_search", "fitness_exact"],
+    "fdf_type": ["linear_fdf", "exponential_fdf"],
+    "fitness_landscape": ["circular_landscape", "linear_landscape"],
+    "genotypes": [("bitwise", "bit_flip"), ("bitwise_integer", "bit_flip_integer")],
+}
+
+
+def _create_arrangement(settings: ExperimentSettings) -> list[Schedule]:
+    """
+    Creates a schedule arrangement that reinforces and punishes every emitted behavior, so that every rule of the algorithm runs in the first generations.
+
+    Args:
+        settings (ExperimentSettings): The settings whose strategies the schedules use.
+
+    Returns:
+        list[Schedule]: The schedule arrangement.
+    """
+    schedule_settings = {
+        name: value
+        for name, value in asdict(settings).items()
+        if name in ScheduleSettings.__annotations__
+    }
+    schedule_settings.update(
+        mean=1,
+        response_class_lower_bound=0,
+        response_class_upper_bound=settings.high_pheno + 1,
+        response_class_size=settings.high_pheno + 1,
+    )
+
+    punishment_settings = {**schedule_settings, "is_reinforcement_schedule": False}
+
+    return [
+        FixedIntervalSchedule(ScheduleSettings(**schedule_settings)),
+        FixedIntervalSchedule(ScheduleSettings(**punishment_settings)),
+    ]
+
+
+def get_precompile_warmups() -> list[tuple[ExperimentSettings, list[list[Schedule]]]]:
+    """
+    Gets the experiments that exercise every jitted kernel: the python engine with every combination of the strategies that have jitted rules, and the compiled engine, which compiles every strategy into a single kernel.
+
+    Returns:
+        list[tuple[ExperimentSettings, list[list[Schedule]]]]: The settings and schedule arrangements of each experiment.
+    """
+    warmups = []
+
+    for selection_type, fdf_type, fitness_landscape, genotypes in itertools.product(
+        *PRECOMPILE_STRATEGIES.values()
+    ):
+        recombination_method, mutation_method = genotypes
+        settings = ExperimentSettings(
+            file_stub="precompile",
+            selection_type=selection_type,
+            fdf_type=fdf_type,
+            fitness_landscape=fitness_landscape,
+            recombination_method=recombination_method,
+            mutation_method=mutation_method,
+        )
+        warmups.append((settings, [_create_arrangement(settings)]))
+
+    settings = ExperimentSettings(file_stub="precompile", engine="compiled")
+    warmups.append((settings, [_create_arrangement(settings)]))
+
+    return warmups
+
+
+def precompile() -> float:
+    """
+    Compiles every jitted kernel into the on-disk numba cache, so later processes (including process pool workers) load the kernels instead of compiling them.
+
+    Returns:
+        float: The time spent compiling, in seconds.
+    """
+    start = time.perf_counter()
+    random_streams.seed_stream(0)
+    warm_up(get_precompile_warmups())
+
+    return time.perf_counter() - start
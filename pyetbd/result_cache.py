@@ -0,0 +1,154 @@
+import functools
+import hashlib
+import json
+import os
+from importlib import metadata
+import numpy as np
+
+BLOCK_ARRAYS = ["emissions", "behavior", "reinforcement", "punishment"]
+
+
+@functools.cache
+def get_code_version() -> str:
+    """
+    Gets the version of the package together with a digest of its source, so cached results are never reused by different code, even by an edited checkout that kept its version number.
+
+    Returns:
+        str: The code version.
+    """
+    try:
+        version = metadata.version("pyetbd")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for root, dirs, files in os.walk(package_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, package_dir).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+
+    return f"{version}+{digest.hexdigest()[:16]}"
+
+
+def hash_inputs(payload: dict, arrays: list[np.ndarray]) -> str:
+    """
+    Hashes the inputs of a run into a cache key.
+
+    Args:
+        payload (dict): The JSON serializable inputs.
+        arrays (list[np.ndarray]): The array inputs, such as response classes and populations.
+
+    Returns:
+        str: The cache key.
+    """
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.tobytes())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A class representing a local cache of output blocks, addressed by the hash of everything that determines them.
+
+    Every entry is an '.npz' file holding an output block and the population at the end of it, so a run can carry on from a cached block. Reading an entry marks it as recently used, and the least recently used entries are removed once the cache is bigger than max_bytes. Entries are written atomically, so several processes can share the cache.
+
+    Args:
+        cache_dir (str): The directory of the cache. Created if it doesn't exist.
+        max_bytes (int, optional): The size the cache is kept under. Defaults to 1 GB.
+
+    Attributes:
+        cache_dir (str): The directory of the cache.
+        max_bytes (int): The size the cache is kept under.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2**30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """
+        Gets the path of an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            str: The path of the entry.
+        """
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def get(self, key: str) -> tuple[tuple, np.ndarray] | None:
+        """
+        Gets a cached output block.
+
+        Args:
+            key (str): The key of the block.
+
+        Returns:
+            tuple[tuple, np.ndarray] | None: The output block and the population at the end of it, or None if the block isn't cached.
+        """
+        path = self.get_path(key)
+        try:
+            with np.load(path) as entry:
+                block = tuple(entry[name] for name in BLOCK_ARRAYS)
+                population = entry["population"]
+
+            # mark the entry as recently used
+            os.utime(path)
+
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            # a missing, evicted or unreadable entry is a miss
+            return None
+
+        return block, population
+
+    def put(self, key: str, block: tuple, population: np.ndarray) -> None:
+        """
+        Caches an output block and removes the least recently used entries if the cache is too big.
+
+        Args:
+            key (str): The key of the block.
+            block (tuple): The output block.
+            population (np.ndarray): The population at the end of the block.
+        """
+        path = self.get_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, **dict(zip(BLOCK_ARRAYS, block)), population=population)
+
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache is no bigger than max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
@@ -2,11 +2,57 @@ import numpy as np
 from numba import njit
 
 
-@njit
+@njit(cache=True)
 def sample_linear_fdf(mean: float) -> int:
     return int(3 * mean * (1 - np.sqrt(1 - np.random.rand())) + 0.5)
 
 
-@njit
+@njit(cache=True)
 def sample_exponential_fdf(mean: float) -> int:
     return int(np.random.exponential(mean) + 0.5)
+
+
+@njit(cache=True)
+def _linear_fdf_cdf(fitness: float, mean: float) -> float:
+    if fitness <= 0:
+        return 0.0
+    if fitness >= 3 * mean:
+        return 1.0
+    return 1 - (1 - fitness / (3 * mean)) ** 2
+
+
+@njit(cache=True)
+def _exponential_fdf_cdf(fitness: float, mean: float) -> float:
+    if fitness <= 0:
+        return 0.0
+    return 1 - np.exp(-fitness / mean)
+
+
+@njit(cache=True)
+def linear_fdf_pmf(fitness: int, mean: float) -> float:
+    """Calculates the probability that sample_linear_fdf returns a fitness value.
+
+    Args:
+        fitness (int): the fitness value
+        mean (float): the mean of the FDF
+
+    Returns:
+        float: the probability of drawing the fitness value
+    """
+    return _linear_fdf_cdf(fitness + 0.5, mean) - _linear_fdf_cdf(fitness - 0.5, mean)
+
+
+@njit(cache=True)
+def exponential_fdf_pmf(fitness: int, mean: float) -> float:
+    """Calculates the probability that sample_exponential_fdf returns a fitness value.
+
+    Args:
+        fitness (int): the fitness value
+        mean (float): the mean of the FDF
+
+    Returns:
+        float: the probability of drawing the fitness value
+    """
+    return _exponential_fdf_cdf(fitness + 0.5, mean) - _exponential_fdf_cdf(
+        fitness - 0.5, mean
+    )
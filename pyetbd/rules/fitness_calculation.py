@@ -2,7 +2,7 @@ from numba import njit
 import numpy as np
 
 
-@njit
+@njit(cache=True)
 def get_circular_fitness_values(
     population: np.ndarray, emitted: int, high_pheno: int
 ) -> np.ndarray:
@@ -28,7 +28,7 @@ def get_circular_fitness_values(
     return fitness_values
 
 
-@njit
+@njit(cache=True)
 def get_linear_fitness_values(population: np.ndarray, emitted: int) -> np.ndarray:
     """Calculates the fitness values for a population based on a linear fitness landscape.
 
@@ -0,0 +1,339 @@
+import numpy as np
+from numba import njit
+from pyetbd.rules import (
+    fdfs,
+    fitness_calculation,
+    mutation,
+    punishment,
+    recombination,
+    selection,
+)
+
+# codes used to pass the strategy names from the input '.json' file to the compiled kernel
+FDF_CODES = {"linear_fdf": 0, "exponential_fdf": 1}
+LANDSCAPE_CODES = {"circular_landscape": 0, "linear_landscape": 1}
+SELECTION_CODES = {"fitness_search": 0, "fitness_exact": 1}
+RECOMBINATION_CODES = {"bitwise": 0, "bitwise_integer": 1}
+MUTATION_CODES = {"bit_flip": 0, "bit_flip_integer": 1}
+PUNISHMENT_CODES = {"rla": 0}
+
+# codes used to describe the schedules of an arrangement to the compiled kernel
+INTERVAL = 0
+RATIO = 1
+FIXED = 0
+RANDOM = 1
+
+
+@njit(cache=True)
+def run_schedules(
+    membership: int,
+    schedule_kinds: np.ndarray,
+    schedule_variabilities: np.ndarray,
+    schedule_means: np.ndarray,
+    schedule_is_reinforcement: np.ndarray,
+    counts: np.ndarray,
+    count_requirements: np.ndarray,
+) -> tuple[int, int]:
+    """Advances every schedule of an arrangement by one generation.
+
+    Interval schedules count every generation and ratio schedules count the responses in their response class. A schedule whose count has met its count requirement delivers its outcome to the next response in its response class, and then starts over with a new count requirement: the mean for fixed schedules and an exponential draw with that mean for random schedules.
+
+    Args:
+        membership (int): the response class membership of the emitted behavior, with bit i set when it is in the response class of schedule i
+        schedule_kinds (np.ndarray): INTERVAL or RATIO for each schedule
+        schedule_variabilities (np.ndarray): FIXED or RANDOM for each schedule
+        schedule_means (np.ndarray): the mean count requirement of each schedule
+        schedule_is_reinforcement (np.ndarray): whether each schedule delivers reinforcement (or punishment)
+        counts (np.ndarray): the count of each schedule, updated in place
+        count_requirements (np.ndarray): the current count requirement of each schedule, updated in place
+
+    Returns:
+        tuple[int, int]: the schedules that delivered reinforcement and the schedules that delivered punishment, with bit i set for schedule i
+    """
+    reinforced = 0
+    punished = 0
+
+    for i in range(schedule_kinds.shape[0]):
+        in_class = ((membership >> i) & 1) == 1
+        if schedule_kinds[i] == INTERVAL or in_class:
+            counts[i] += 1
+
+        if in_class and counts[i] >= count_requirements[i]:
+            if schedule_variabilities[i] == RANDOM:
+                count_requirements[i] = np.random.exponential(schedule_means[i])
+            else:
+                count_requirements[i] = schedule_means[i]
+            counts[i] = 0
+
+            if schedule_is_reinforcement[i]:
+                reinforced |= 1 << i
+            else:
+                punished |= 1 << i
+
+    return reinforced, punished
+
+
+@njit(cache=True)
+def _calculate_fitness(
+    population: np.ndarray, emitted: int, high_pheno: int, landscape: int
+) -> np.ndarray:
+    if landscape == 0:
+        return fitness_calculation.get_circular_fitness_values(
+            population, emitted, high_pheno
+        )
+
+    return fitness_calculation.get_linear_fitness_values(population, emitted)
+
+
+@njit(cache=True)
+def _select_parents(
+    population: np.ndarray,
+    fitness_values: np.ndarray,
+    fdf_mean: float,
+    fdf: int,
+    selection_code: int,
+) -> np.ndarray:
+    if selection_code == 1:
+        if fdf == 0:
+            return selection.fitness_exact_selection(
+                population, fitness_values, fdf_mean, fdfs.linear_fdf_pmf
+            )
+
+        return selection.fitness_exact_selection(
+            population, fitness_values, fdf_mean, fdfs.exponential_fdf_pmf
+        )
+
+    if fdf == 0:
+        return selection.fitness_search_selection(
+            population, fitness_values, fdf_mean, fdfs.sample_linear_fdf
+        )
+
+    return selection.fitness_search_selection(
+        population, fitness_values, fdf_mean, fdfs.sample_exponential_fdf
+    )
+
+
+@njit(cache=True)
+def _punish(
+    population: np.ndarray,
+    emitted: int,
+    low_pheno: int,
+    high_pheno: int,
+    fdf_mean: float,
+    fdf: int,
+    landscape: int,
+) -> None:
+    if fdf == 0:
+        punishment.rla_punishment(
+            population,
+            emitted,
+            fdf_mean,
+            fdfs.sample_linear_fdf,
+            landscape == 0,
+            low_pheno,
+            high_pheno,
+        )
+    else:
+        punishment.rla_punishment(
+            population,
+            emitted,
+            fdf_mean,
+            fdfs.sample_exponential_fdf,
+            landscape == 0,
+            low_pheno,
+            high_pheno,
+        )
+
+
+@njit(cache=True)
+def _run_generation(
+    population: np.ndarray,
+    row: int,
+    bin_length: int,
+    low_pheno: int,
+    high_pheno: int,
+    schedule_kinds: np.ndarray,
+    schedule_variabilities: np.ndarray,
+    schedule_means: np.ndarray,
+    schedule_is_reinforcement: np.ndarray,
+    response_class_table: np.ndarray,
+    counts: np.ndarray,
+    count_requirements: np.ndarray,
+    fdf_codes: np.ndarray,
+    fdf_means: np.ndarray,
+    landscape_codes: np.ndarray,
+    selection_codes: np.ndarray,
+    integer_genotypes: np.ndarray,
+    mut_rates: np.ndarray,
+    emissions: np.ndarray,
+    behavior: np.ndarray,
+    reinforcement: np.ndarray,
+    punishment: np.ndarray,
+) -> np.ndarray:
+    num_schedules = schedule_kinds.shape[0]
+
+    # emit the response
+    emitted = population[np.random.randint(0, population.shape[0])]
+    emissions[row] = emitted
+
+    # look up the response class membership for every schedule at once and run the schedules
+    membership = response_class_table[emitted]
+    reinforced_schedules, punished_schedules = run_schedules(
+        membership,
+        schedule_kinds,
+        schedule_variabilities,
+        schedule_means,
+        schedule_is_reinforcement,
+        counts,
+        count_requirements,
+    )
+    reinforced = reinforced_schedules != 0
+    punished = punished_schedules != 0
+
+    # count the outputs, delivering the settings of the last schedule that reinforced or punished
+    reinforcement_slot = 0
+    punishment_slot = 0
+    for i in range(num_schedules):
+        if (membership >> i) & 1:
+            behavior[row, i] += 1
+        if (reinforced_schedules >> i) & 1:
+            reinforcement[row, i] += 1
+            reinforcement_slot = i + 1
+        elif (punished_schedules >> i) & 1:
+            punishment[row, i] += 1
+            punishment_slot = i + 1
+
+    # run the reinforcement algorithm on the population
+    if reinforced:
+        fitness_values = _calculate_fitness(
+            population, emitted, high_pheno, landscape_codes[reinforcement_slot]
+        )
+        parents = _select_parents(
+            population,
+            fitness_values,
+            fdf_means[reinforcement_slot],
+            fdf_codes[reinforcement_slot],
+            selection_codes[reinforcement_slot],
+        )
+    else:
+        parents = selection.randomly_select_parents(population)
+
+    if integer_genotypes[reinforcement_slot]:
+        children = recombination.bitwise_integer_recombine(parents, bin_length)
+        new_population = mutation.bit_flip_integer_mutate(
+            children, bin_length, mut_rates[reinforcement_slot]
+        )
+    else:
+        offspring_genos = recombination.recombine_parents(
+            parents, bin_length, recombination.bitwise_combine
+        )
+        new_population = mutation.bit_flip_mutate(
+            offspring_genos, mut_rates[reinforcement_slot]
+        )
+
+    # run the punishment algorithm on the new population in place
+    if punished:
+        _punish(
+            new_population,
+            emitted,
+            low_pheno,
+            high_pheno,
+            fdf_means[punishment_slot],
+            fdf_codes[punishment_slot],
+            landscape_codes[punishment_slot],
+        )
+
+    return new_population
+
+
+@njit(cache=True)
+def run_generations(
+    population: np.ndarray,
+    first_gen: int,
+    last_gen: int,
+    bin_offset: int,
+    bin_width: int,
+    bin_length: int,
+    low_pheno: int,
+    high_pheno: int,
+    schedule_kinds: np.ndarray,
+    schedule_variabilities: np.ndarray,
+    schedule_means: np.ndarray,
+    schedule_is_reinforcement: np.ndarray,
+    response_class_table: np.ndarray,
+    counts: np.ndarray,
+    count_requirements: np.ndarray,
+    fdf_codes: np.ndarray,
+    fdf_means: np.ndarray,
+    landscape_codes: np.ndarray,
+    selection_codes: np.ndarray,
+    integer_genotypes: np.ndarray,
+    mut_rates: np.ndarray,
+    emissions: np.ndarray,
+    behavior: np.ndarray,
+    reinforcement: np.ndarray,
+    punishment: np.ndarray,
+) -> np.ndarray:
+    """Runs the emit -> schedule evaluation -> fitness -> selection -> recombination -> mutation -> punishment cycle for a range of generations.
+
+    The outputs are summed into row (gen + bin_offset) // bin_width, so the same kernel writes raw per-generation output (bin_width 1) or online bin sums that never store the individual generations. Emissions holds the last emission of each row.
+
+    The per-slot arrays (fdf_codes, fdf_means, landscape_codes, selection_codes, integer_genotypes and mut_rates) hold the experiment settings in slot 0 and the settings of schedule i in slot i + 1, so the kernel can switch to the settings of whichever schedule delivered reinforcement. A generation in which a punishment schedule delivers punishment runs the punishment rule (see rules.punishment) with the settings of that schedule on the new population in place, after the reinforcement algorithm.
+
+    Args:
+        population (np.ndarray): the population of the organism
+        first_gen (int): the first generation to run
+        last_gen (int): the generation to stop at (exclusive)
+        bin_offset (int): the offset of the first generation within its output bin
+        bin_width (int): the number of generations summed into each output row (1 for raw per-generation output)
+        bin_length (int): the length of the genotype
+        low_pheno (int): the lowest phenotype of the behaviors the punishment rule draws
+        high_pheno (int): the maximum possible phenotype
+        schedule_kinds (np.ndarray): INTERVAL or RATIO for each schedule
+        schedule_variabilities (np.ndarray): FIXED or RANDOM for each schedule
+        schedule_means (np.ndarray): the mean count requirement of each schedule
+        schedule_is_reinforcement (np.ndarray): whether each schedule delivers reinforcement (or punishment)
+        response_class_table (np.ndarray): a table with bit i of each phenotype's entry set when it is in the response class of schedule i
+        counts (np.ndarray): the count of each schedule, updated in place
+        count_requirements (np.ndarray): the current count requirement of each schedule, updated in place
+        fdf_codes (np.ndarray): the FDF code of each settings slot
+        fdf_means (np.ndarray): the FDF mean of each settings slot
+        landscape_codes (np.ndarray): the fitness landscape code of each settings slot
+        selection_codes (np.ndarray): the selection code of each settings slot
+        integer_genotypes (np.ndarray): whether each settings slot recombines and mutates integer genotypes
+        mut_rates (np.ndarray): the mutation rate of each settings slot
+        emissions (np.ndarray): the output array for the emitted behaviors
+        behavior (np.ndarray): the (rows, schedules) output array for response class membership
+        reinforcement (np.ndarray): the (rows, schedules) output array for delivered reinforcement
+        punishment (np.ndarray): the (rows, schedules) output array for delivered punishment
+
+    Returns:
+        np.ndarray: the population after the last generation
+    """
+    for gen in range(first_gen, last_gen):
+        population = _run_generation(
+            population,
+            (gen + bin_offset) // bin_width,
+            bin_length,
+            low_pheno,
+            high_pheno,
+            schedule_kinds,
+            schedule_variabilities,
+            schedule_means,
+            schedule_is_reinforcement,
+            response_class_table,
+            counts,
+            count_requirements,
+            fdf_codes,
+            fdf_means,
+            landscape_codes,
+            selection_codes,
+            integer_genotypes,
+            mut_rates,
+            emissions,
+            behavior,
+            reinforcement,
+            punishment,
+        )
+
+    return population
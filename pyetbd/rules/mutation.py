@@ -3,7 +3,7 @@ from numba import njit
 from pyetbd.utils import binary_converter as bc
 
 
-@njit
+@njit(cache=True)
 def bit_flip_mutate(children_genos: np.ndarray, mut_rate: float) -> np.ndarray:
     """Takes in an array of children genotypes and applies the mutation rule.
 
@@ -27,3 +27,26 @@ def bit_flip_mutate(children_genos: np.ndarray, mut_rate: float) -> np.ndarray:
     new_population = bc.convert_binary_to_decimal(mutated_population)
 
     return new_population
+
+
+@njit(cache=True)
+def bit_flip_integer_mutate(
+    children: np.ndarray, bin_length: int, mut_rate: float
+) -> np.ndarray:
+    """Takes in an array of children phenotypes and applies the mutation rule by flipping one random bit of the integer.
+
+    Args:
+        children (np.ndarray): an array of children phenotypes
+        bin_length (int): the length of the genotype
+        mut_rate (float): the mutation rates
+
+    Returns:
+        np.ndarray: the new population of phenotypes
+    """
+
+    new_population = children.copy()
+    for i in range(len(children)):
+        if np.random.rand() < mut_rate:
+            new_population[i] ^= 1 << np.random.randint(0, bin_length)
+
+    return new_population
@@ -1,2 +1,90 @@
-def rla_punishment():
-    ...
+from typing import Callable
+import numpy as np
+from numba import njit
+from pyetbd.rules import fdfs
+
+
+@njit(cache=True)
+def rla_punishment(
+    population: np.ndarray,
+    emitted: int,
+    fdf_mean: float,
+    sample_func: Callable,
+    circular: bool,
+    low_pheno: int,
+    high_pheno: int,
+) -> int:
+    """Applies the punishment rule to a population in place. For every behavior a distance is drawn from the FDF of the punishment schedule, and the behavior is replaced with a random phenotype if it is no further than that distance from the punished behavior. Behaviors close to the punished behavior are therefore likely to be replaced and distant ones are left alone, so punishment moves the population away from the punished behavior.
+
+    The distances are measured on the fitness landscape of the punishment schedule, and the random phenotypes are drawn from the same range as the initial population.
+
+    Args:
+        population (np.ndarray): a population of potential behaviors, updated in place
+        emitted (int): the punished behavior
+        fdf_mean (float): the mean of the FDF
+        sample_func (function): the function of the FDF to sample from
+        circular (bool): whether the distances are measured on a circular fitness landscape
+        low_pheno (int): the lowest phenotype of the random behaviors
+        high_pheno (int): the maximum possible phenotype (exclusive for the random behaviors)
+
+    Returns:
+        int: the number of behaviors replaced
+    """
+    replaced = 0
+    for i in range(len(population)):
+        distance = np.abs(population[i] - emitted)
+        if circular:
+            distance = min(distance, high_pheno - distance)
+
+        if distance <= sample_func(fdf_mean):
+            population[i] = np.random.randint(low_pheno, high_pheno)
+            replaced += 1
+
+    return replaced
+
+
+@njit(cache=True)
+def _linear_fdf_rla_punishment(
+    population: np.ndarray,
+    emitted: int,
+    fdf_mean: float,
+    circular: bool,
+    low_pheno: int,
+    high_pheno: int,
+) -> int:
+    return rla_punishment(
+        population,
+        emitted,
+        fdf_mean,
+        fdfs.sample_linear_fdf,
+        circular,
+        low_pheno,
+        high_pheno,
+    )
+
+
+@njit(cache=True)
+def _exponential_fdf_rla_punishment(
+    population: np.ndarray,
+    emitted: int,
+    fdf_mean: float,
+    circular: bool,
+    low_pheno: int,
+    high_pheno: int,
+) -> int:
+    return rla_punishment(
+        population,
+        emitted,
+        fdf_mean,
+        fdfs.sample_exponential_fdf,
+        circular,
+        low_pheno,
+        high_pheno,
+    )
+
+
+# punishment functions with the FDF bound at compile time, like the selection functions in rules.selection
+BOUND_RLA_PUNISHMENTS = {
+    fdfs.sample_linear_fdf: _linear_fdf_rla_punishment,
+    fdfs.sample_exponential_fdf: _exponential_fdf_rla_punishment,
+}
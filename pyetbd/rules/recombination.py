@@ -4,7 +4,7 @@ from numba import njit
 from pyetbd.utils import binary_converter as bc
 
 
-@njit
+@njit(cache=True)
 def recombine_parents(
     parents: np.ndarray, bin_length: int, recombination_method: Callable
 ) -> np.ndarray:
@@ -36,7 +36,7 @@ def recombine_parents(
     return children_genos
 
 
-@njit
+@njit(cache=True)
 def bitwise_combine(mother_geno: np.ndarray, father_geno: np.ndarray) -> np.ndarray:
     """Takes in two genotypes and recombines them bitwise.
 
@@ -57,3 +57,55 @@ def bitwise_combine(mother_geno: np.ndarray, father_geno: np.ndarray) -> np.ndar
             child_geno[i] = np.random.randint(0, 2)
 
     return child_geno
+
+
+@njit(cache=True)
+def bitwise_recombine(parents: np.ndarray, bin_length: int) -> np.ndarray:
+    """Takes in an array of parent pairs and recombines them with bitwise_combine.
+
+    Calling bitwise_combine directly (instead of passing it to recombine_parents from python) lets numba load the compiled code from the on-disk cache.
+
+    Args:
+        parents (np.ndarray): an array of parent pairs
+        bin_length (int): the length of the genotype
+
+    Returns:
+        np.ndarray: an array of children genotypes
+    """
+
+    children_genos = np.empty((parents.shape[0], bin_length), dtype=np.int8)
+
+    for i in range(parents.shape[0]):
+        mother_geno = bc.dec_to_bin(parents[i][0], bin_length)
+        father_geno = bc.dec_to_bin(parents[i][1], bin_length)
+
+        children_genos[i] = bitwise_combine(mother_geno, father_geno)
+
+    return children_genos
+
+
+@njit(cache=True)
+def bitwise_integer_recombine(parents: np.ndarray, bin_length: int) -> np.ndarray:
+    """Takes in an array of parent pairs and recombines them bitwise without converting them to binary arrays.
+
+    Bits shared by both parents are kept and the bits where the parents differ are taken from a random word, which is the integer equivalent of bitwise_combine.
+
+    Args:
+        parents (np.ndarray): an array of parent pairs
+        bin_length (int): the length of the genotype
+
+    Returns:
+        np.ndarray: an array of children phenotypes
+    """
+
+    children = np.empty(parents.shape[0], dtype=np.int64)
+
+    for i in range(parents.shape[0]):
+        mother = parents[i][0]
+        father = parents[i][1]
+
+        random_word = np.random.randint(0, 1 << bin_length)
+
+        children[i] = mother ^ ((mother ^ father) & random_word)
+
+    return children
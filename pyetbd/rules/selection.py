@@ -1,9 +1,10 @@
 from typing import Callable
 import numpy as np
 from numba import njit
+from pyetbd.rules import fdfs
 
 
-@njit
+@njit(cache=True)
 def fitness_search_selection(
     population: np.ndarray,
     fitness_values: np.ndarray,
@@ -12,6 +13,8 @@ def fitness_search_selection(
 ) -> np.ndarray:
     """This is a helper function for the fitness search selection strategies. It selects parents from the population based on their fitness using a search method. In this method, fitness values are drawn from the FDF and behaviors with matching fitness values are put into a pool. One parent is then randomly selected from the pool. This process is repeated until two parents are selected. This whole process is repeated until there are the same number of parent pairs as there are individuals in the population.
 
+    The pools are looked up in an index built once per call by build_fitness_index, so each draw takes constant time instead of a search over the whole population.
+
     Args:
         population (np.ndarray): a population of potential behaviors (comes from organism object)
         fitness_values (np.ndarray): an array of fitness values for the population
@@ -24,7 +27,33 @@ def fitness_search_selection(
     Returns:
         np.ndarray: An array of parent pairs that is the same length as the population
     """
+    return counted_fitness_search_selection(
+        population, fitness_values, fdf_mean, sample_func
+    )[0]
+
+
+@njit(cache=True)
+def counted_fitness_search_selection(
+    population: np.ndarray,
+    fitness_values: np.ndarray,
+    fdf_mean: float,
+    sample_func: Callable,
+) -> tuple[np.ndarray, int]:
+    """Selects parents like fitness_search_selection and also counts the fitness values drawn from the FDF, including the draws that matched no member of the population.
+
+    Args:
+        population (np.ndarray): a population of potential behaviors (comes from organism object)
+        fitness_values (np.ndarray): an array of fitness values for the population
+        fdf_mean (float): the mean of the FDF
+        sample_func (function): the function of the FDF to sample from
+
+    Returns:
+        tuple[np.ndarray, int]: An array of parent pairs that is the same length as the population and the number of FDF draws
+    """
     parents = np.empty((len(population), 2), dtype=np.int64)
+    bucket_starts, bucket_members = build_fitness_index(fitness_values)
+    draws = 0
+    max_fitness = len(bucket_starts) - 2
 
     for i in range(len(population)):
         j = 0
@@ -36,23 +65,174 @@ def fitness_search_selection(
                 print(
                     "Warning: Giddywhoaed in selection.py, fitness_search_selection ailed to find valid parents after 1,000,000 iterations. Bailing out to random selection. This might be because the FDF mean is too low or the mutation rate is too high."
                 )
-                return randomly_select_parents(population)
+                return randomly_select_parents(population), draws
 
             # draw a fitness value from the FDF
             drawn_fitness = sample_func(fdf_mean)
+            draws += 1
+
+            # skip fitness values no member of the population can have
+            if drawn_fitness < 0 or drawn_fitness > max_fitness:
+                continue
 
-            # find the indices of the population that match the drawn fitness
-            matching_indices = np.where(fitness_values == drawn_fitness)[0]
+            # find the bucket of the population that matches the drawn fitness
+            bucket_start = bucket_starts[drawn_fitness]
+            bucket_size = bucket_starts[drawn_fitness + 1] - bucket_start
 
             # if there are any matches, randomly select one and add it to the parents array
-            if len(matching_indices) > 0:
-                parents[i][j] = population[np.random.choice(matching_indices)]
+            if bucket_size > 0:
+                match = bucket_members[bucket_start + np.random.randint(0, bucket_size)]
+                parents[i][j] = population[match]
                 j += 1
 
+    return parents, draws
+
+
+@njit(cache=True)
+def fitness_exact_selection(
+    population: np.ndarray,
+    fitness_values: np.ndarray,
+    fdf_mean: float,
+    pmf_func: Callable,
+) -> np.ndarray:
+    """Selects parents from the population with the same distribution as fitness_search_selection, but without drawing until a match is found.
+
+    The probability mass of the FDF is computed only for the fitness values present in the population, and each parent's fitness value is drawn directly from it with an alias table. One parent is then randomly selected from the members with that fitness value.
+
+    Args:
+        population (np.ndarray): a population of potential behaviors (comes from organism object)
+        fitness_values (np.ndarray): an array of fitness values for the population
+        fdf_mean (float): the mean of the FDF
+        pmf_func (function): the probability mass function of the FDF
+
+    Returns:
+        np.ndarray: An array of parent pairs that is the same length as the population
+    """
+    bucket_starts, bucket_members = build_fitness_index(fitness_values)
+
+    # find the fitness values present in the population and their probability of being drawn from the FDF
+    present_fitness = np.empty(len(bucket_starts) - 1, dtype=np.int64)
+    weights = np.empty(len(bucket_starts) - 1, dtype=np.float64)
+    num_present = 0
+    for fitness in range(len(bucket_starts) - 1):
+        if bucket_starts[fitness + 1] > bucket_starts[fitness]:
+            present_fitness[num_present] = fitness
+            weights[num_present] = pmf_func(fitness, fdf_mean)
+            num_present += 1
+
+    # no fitness value in the population can be drawn from the FDF, so the search would never find a match
+    if weights[:num_present].sum() <= 0:
+        print(
+            "Warning: Giddywhoaed in selection.py, fitness_exact_selection found no fitness values in the population that can be drawn from the FDF. Bailing out to random selection. This might be because the FDF mean is too low or the mutation rate is too high."
+        )
+        return randomly_select_parents(population)
+
+    probabilities, aliases = build_alias_table(weights[:num_present])
+
+    parents = np.empty((len(population), 2), dtype=np.int64)
+    for i in range(len(population)):
+        for j in range(2):
+            # draw a fitness value present in the population from the alias table
+            column = np.random.randint(0, num_present)
+            if np.random.rand() >= probabilities[column]:
+                column = aliases[column]
+            fitness = present_fitness[column]
+
+            # randomly select one of the members with the drawn fitness value
+            bucket_start = bucket_starts[fitness]
+            bucket_size = bucket_starts[fitness + 1] - bucket_start
+            match = bucket_members[bucket_start + np.random.randint(0, bucket_size)]
+            parents[i][j] = population[match]
+
     return parents
 
 
-@njit
+@njit(cache=True)
+def build_alias_table(weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Builds an alias table (Vose's method) for sampling indices in proportion to their weights.
+
+    To sample, draw a column uniformly and keep it with probability probabilities[column], otherwise use aliases[column].
+
+    Args:
+        weights (np.ndarray): the non-negative weight of each index, with a positive sum
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the probability of keeping each column and the alias of each column
+    """
+
+    n = len(weights)
+    scaled = weights * n / weights.sum()
+    probabilities = np.ones(n, dtype=np.float64)
+    aliases = np.arange(n)
+
+    small = np.empty(n, dtype=np.int64)
+    large = np.empty(n, dtype=np.int64)
+    num_small = 0
+    num_large = 0
+    for i in range(n):
+        if scaled[i] < 1:
+            small[num_small] = i
+            num_small += 1
+        else:
+            large[num_large] = i
+            num_large += 1
+
+    while num_small > 0 and num_large > 0:
+        num_small -= 1
+        less = small[num_small]
+        num_large -= 1
+        more = large[num_large]
+
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+
+        # move the leftover weight of the larger column back into the right list
+        scaled[more] = scaled[more] + scaled[less] - 1
+        if scaled[more] < 1:
+            small[num_small] = more
+            num_small += 1
+        else:
+            large[num_large] = more
+            num_large += 1
+
+    # the columns left over are full up to rounding error, so they keep their probability of 1
+    return probabilities, aliases
+
+
+@njit(cache=True)
+def build_fitness_index(fitness_values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Builds an index from fitness value to the members of the population with that fitness value using a counting sort over the bounded fitness range.
+
+    Args:
+        fitness_values (np.ndarray): an array of fitness values for the population
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the bucket starts, where the members with fitness value f are bucket_members[bucket_starts[f]:bucket_starts[f + 1]], and the bucket members, which are in ascending order within each bucket
+    """
+
+    max_fitness = 0
+    for i in range(len(fitness_values)):
+        max_fitness = max(max_fitness, fitness_values[i])
+
+    # count the members with each fitness value
+    bucket_starts = np.zeros(max_fitness + 2, dtype=np.int64)
+    for i in range(len(fitness_values)):
+        bucket_starts[fitness_values[i] + 1] += 1
+
+    for f in range(max_fitness + 1):
+        bucket_starts[f + 1] += bucket_starts[f]
+
+    # place the members in their buckets
+    bucket_members = np.empty(len(fitness_values), dtype=np.int64)
+    bucket_fill = bucket_starts[:-1].copy()
+    for i in range(len(fitness_values)):
+        bucket_members[bucket_fill[fitness_values[i]]] = i
+        bucket_fill[fitness_values[i]] += 1
+
+    return bucket_starts, bucket_members
+
+
+@njit(cache=True)
 def randomly_select_parents(population: np.ndarray) -> np.ndarray:
     """Randomly selects parents from the population.
 
@@ -69,3 +249,73 @@ def randomly_select_parents(population: np.ndarray) -> np.ndarray:
         parents[i] = np.random.choice(population, 2)
 
     return parents
+
+
+@njit(cache=True)
+def _linear_fdf_search_selection(
+    population: np.ndarray, fitness_values: np.ndarray, fdf_mean: float
+) -> np.ndarray:
+    return fitness_search_selection(
+        population, fitness_values, fdf_mean, fdfs.sample_linear_fdf
+    )
+
+
+@njit(cache=True)
+def _exponential_fdf_search_selection(
+    population: np.ndarray, fitness_values: np.ndarray, fdf_mean: float
+) -> np.ndarray:
+    return fitness_search_selection(
+        population, fitness_values, fdf_mean, fdfs.sample_exponential_fdf
+    )
+
+
+@njit(cache=True)
+def _linear_fdf_counted_search_selection(
+    population: np.ndarray, fitness_values: np.ndarray, fdf_mean: float
+) -> tuple[np.ndarray, int]:
+    return counted_fitness_search_selection(
+        population, fitness_values, fdf_mean, fdfs.sample_linear_fdf
+    )
+
+
+@njit(cache=True)
+def _exponential_fdf_counted_search_selection(
+    population: np.ndarray, fitness_values: np.ndarray, fdf_mean: float
+) -> tuple[np.ndarray, int]:
+    return counted_fitness_search_selection(
+        population, fitness_values, fdf_mean, fdfs.sample_exponential_fdf
+    )
+
+
+@njit(cache=True)
+def _linear_fdf_exact_selection(
+    population: np.ndarray, fitness_values: np.ndarray, fdf_mean: float
+) -> np.ndarray:
+    return fitness_exact_selection(
+        population, fitness_values, fdf_mean, fdfs.linear_fdf_pmf
+    )
+
+
+@njit(cache=True)
+def _exponential_fdf_exact_selection(
+    population: np.ndarray, fitness_values: np.ndarray, fdf_mean: float
+) -> np.ndarray:
+    return fitness_exact_selection(
+        population, fitness_values, fdf_mean, fdfs.exponential_fdf_pmf
+    )
+
+
+# selection functions with the FDF bound at compile time
+# numba keys a function passed in from python by its address, so only these versions can be loaded from the on-disk cache by a new process
+BOUND_SEARCH_SELECTIONS = {
+    fdfs.sample_linear_fdf: _linear_fdf_search_selection,
+    fdfs.sample_exponential_fdf: _exponential_fdf_search_selection,
+}
+BOUND_COUNTED_SEARCH_SELECTIONS = {
+    fdfs.sample_linear_fdf: _linear_fdf_counted_search_selection,
+    fdfs.sample_exponential_fdf: _exponential_fdf_counted_search_selection,
+}
+BOUND_EXACT_SELECTIONS = {
+    fdfs.linear_fdf_pmf: _linear_fdf_exact_selection,
+    fdfs.exponential_fdf_pmf: _exponential_fdf_exact_selection,
+}
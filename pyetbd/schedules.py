@@ -18,6 +18,10 @@ class Schedule(ABC):
         self.count = 0
         self.current_count_requirement = 0
 
+        # set by bind_response_class_table to replace the scan over the response class with a table lookup
+        self.response_class_table: np.ndarray | None = None
+        self.response_class_mask = 0
+
     def _generate_response_class(self) -> None:
         possible_values = np.arange(
             self.settings.response_class_lower_bound,
@@ -43,7 +47,23 @@ class Schedule(ABC):
                 "Giddydowned: Response class generation failed. Not enough possible values to meet specified 'response_class_size'. Check your 'response_class_lower_bound', 'response_class_upper_bound', 'response_class_size', 'excluded_lower_bound', and 'excluded_upper_bound' settings."
             )
 
+    def bind_response_class_table(self, table: np.ndarray, bit: int) -> None:
+        """
+        Binds the schedule to the response class table of its arrangement.
+
+        Args:
+            table (np.ndarray): The table from build_response_class_table.
+            bit (int): The bit of the table that belongs to this schedule (its index in the arrangement).
+        """
+        self.response_class_table = table
+        self.response_class_mask = 1 << bit
+
     def in_response_class(self, emitted: int) -> bool:
+        if self.response_class_table is not None:
+            return emitted < len(self.response_class_table) and bool(
+                self.response_class_table[emitted] & self.response_class_mask
+            )
+
         return emitted in self.response_class
 
     def get_availability(self, emitted: int) -> bool:
@@ -62,6 +82,13 @@ class Schedule(ABC):
 
         return False
 
+    def reset(self) -> None:
+        """
+        Resets the count and draws a new count requirement, returning the schedule to the state it starts in.
+        """
+        self.count = 0
+        self.set_count_requirement()
+
     @abstractmethod
     def update_counter(self, emitted: int) -> None: ...
 
@@ -160,3 +187,29 @@ class RandomRatioSchedule(RandomSchedule, RatioSchedule):
     """
 
     ...
+
+
+def build_response_class_table(arrangement: list[Schedule], size: int) -> np.ndarray:
+    """
+    Builds a lookup table of response class membership for a schedule arrangement.
+
+    The table has one entry per phenotype, and bit i of an entry is set when the phenotype is in the response class of schedule i, so the membership for every schedule in the arrangement is found with a single index.
+
+    Args:
+        arrangement (list[Schedule]): The schedules in the arrangement.
+        size (int): The number of phenotypes the organism can emit.
+
+    Returns:
+        np.ndarray: The response class table.
+    """
+    if len(arrangement) > 63:
+        raise ValueError(
+            "Giddydowned: A schedule arrangement can have at most 63 schedules."
+        )
+
+    table = np.zeros(size, dtype=np.int64)
+    for i, schedule in enumerate(arrangement):
+        response_class = schedule.response_class[schedule.response_class < size]
+        table[response_class] |= 1 << i
+
+    return table
@@ -56,6 +56,14 @@ class ExperimentSettings(ScheduleSettings):
         low_pheno (int): The lower bound of the phenotype.
         high_pheno (int): The upper bound of the phenotype.
         schedules (list): A list of schedule settings.
+        engine (str): The engine used to run each schedule arrangement ("python" or "compiled").
+        output_format (str): The format of the per-generation output ("csv", "parquet", "feather" or "npy", a directory with one memory-mappable '.npy' file per column).
+        bin_width (int): The number of generations summed into each row of the summary workbook's Data sheet.
+        summary_only (bool): Whether to sum the outputs into bins as the experiment runs and only save the summary workbook, without storing or writing the individual generations.
+        checkpoint (bool): Whether to save a checkpoint that an interrupted run can be resumed from after every repetition and schedule arrangement.
+        checkpoint_gens (int): The number of generations between the checkpoints saved in the middle of a schedule arrangement, or 0 to only save them between schedule arrangements.
+        instrument (bool): Whether to time each phase of the run (emit, schedule evaluation, fitness calculation, selection, recombination, mutation, punishment and output) and count the FDF draws, and add the breakdown to the report of the experiment.
+        seed (int | None): The root seed of the random streams of every repetition and schedule arrangement. If None, the runs are not seeded.
     """
 
     gens: int = field(default_factory=lambda: DEFAULTS["gens"])
@@ -68,3 +76,11 @@ class ExperimentSettings(ScheduleSettings):
         default_factory=lambda: DEFAULTS["reinitialize_population"]
     )
     schedules: list = field(default_factory=list)
+    engine: str = field(default_factory=lambda: DEFAULTS["engine"])
+    seed: int | None = field(default_factory=lambda: DEFAULTS["seed"])
+    output_format: str = field(default_factory=lambda: DEFAULTS["output_format"])
+    bin_width: int = field(default_factory=lambda: DEFAULTS["bin_width"])
+    summary_only: bool = field(default_factory=lambda: DEFAULTS["summary_only"])
+    checkpoint: bool = field(default_factory=lambda: DEFAULTS["checkpoint"])
+    checkpoint_gens: int = field(default_factory=lambda: DEFAULTS["checkpoint_gens"])
+    instrument: bool = field(default_factory=lambda: DEFAULTS["instrument"])
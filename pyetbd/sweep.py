@@ -0,0 +1,328 @@
+import itertools
+import json
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any, Iterator
+from pyetbd.experiment import init_worker
+from pyetbd.experiment_runner import load_experiment
+from pyetbd.utils import random_streams, timer
+
+# pandas is only imported when the results are written or loaded
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def expand_values(values: list | dict) -> list:
+    """
+    Expands the values of a swept parameter.
+
+    The values are either a list, a range {"start", "stop", "step"} that stops before stop like Python's range, or an evenly spaced range {"start", "stop", "num"} that includes stop like np.linspace.
+
+    Args:
+        values (list | dict): The values or the range of the parameter.
+
+    Returns:
+        list: The values of the parameter.
+    """
+    if isinstance(values, list):
+        return values
+
+    if isinstance(values, dict) and {"start", "stop"} <= set(values):
+        start, stop = values["start"], values["stop"]
+        if "step" in values:
+            step = values["step"]
+            # stop slightly early so float ranges don't pick up an extra value from rounding errors
+            num = max(math.ceil((stop - start) / step - 1e-9), 0)
+            return [_round(start + i * step) for i in range(num)]
+
+        if "num" in values:
+            num = values["num"]
+            if num == 1:
+                return [start]
+            step = (stop - start) / (num - 1)
+            return [_round(start + i * step) for i in range(num)]
+
+    raise ValueError(
+        f"Giddydowned: {values} is not a list of values or a range with a start, a stop and a step or num."
+    )
+
+
+def _round(value: float) -> float:
+    # keep integer ranges as ints and drop the rounding errors of float ranges
+    return value if isinstance(value, int) else round(value, 10)
+
+
+def set_parameter(exp: dict, path: str, value: Any) -> None:
+    """
+    Sets a parameter of an experiment. The path is a setting name, or a dotted path into the schedules such as "schedules.0.1.mean" for the mean of the second schedule of the first arrangement.
+
+    Args:
+        exp (dict): The experiment settings.
+        path (str): The path of the parameter.
+        value (Any): The value of the parameter.
+    """
+    *keys, name = path.split(".")
+    target = exp
+    try:
+        for key in keys:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+
+        if isinstance(target, list):
+            target[int(name)] = value
+        else:
+            target[name] = value
+
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise ValueError(
+            f"Giddydowned: '{path}' is not a parameter of the sweep's base experiment."
+        )
+
+
+class Sweep:
+    """
+    A class representing a sweep over the settings of an experiment, which expands lazily into one experiment per point.
+
+    The points are the product of the "product" parameters, with the "zip" parameters varied together as one more axis of the product.
+
+    Args:
+        spec (dict): The sweep from the input file, with a "name", the "base" experiment settings, and the "product" and "zip" parameters with their values (see expand_values).
+
+    Attributes:
+        name (str): The name of the sweep, used for the results file and the file stub of every point.
+        base (dict): The settings of the experiment that every point changes.
+        product (dict[str, list]): The values of each parameter in the product.
+        zip (dict[str, list]): The values of each parameter that is zipped.
+        parameters (list[str]): The paths of the swept parameters.
+    """
+
+    def __init__(self, spec: dict):
+        self.name = spec["name"]
+        self.base = spec["base"]
+        self.product = {
+            path: expand_values(values)
+            for path, values in spec.get("product", {}).items()
+        }
+        self.zip = {
+            path: expand_values(values) for path, values in spec.get("zip", {}).items()
+        }
+        self.parameters = list(self.product) + list(self.zip)
+
+        if len({len(values) for values in self.zip.values()}) > 1:
+            raise ValueError(
+                f"Giddydowned: The zipped parameters of the '{self.name}' sweep must have the same number of values."
+            )
+
+        # check the paths before anything runs
+        for path in self.parameters:
+            set_parameter(deepcopy(self.base), path, None)
+
+    def __len__(self) -> int:
+        num_zipped = len(next(iter(self.zip.values()))) if self.zip else 1
+        return math.prod(len(values) for values in self.product.values()) * num_zipped
+
+    def __iter__(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        """
+        Iterates over the points of the sweep without building them all at once.
+
+        Yields:
+            tuple[int, dict[str, Any]]: The index of the point and the value of each swept parameter.
+        """
+        zipped = list(zip(*self.zip.values())) if self.zip else [()]
+        points = itertools.product(*self.product.values(), zipped)
+
+        for index, (*product_values, zip_values) in enumerate(points):
+            yield index, dict(zip(self.parameters, [*product_values, *zip_values]))
+
+    def get_experiment(self, index: int, point: dict[str, Any]) -> dict:
+        """
+        Gets the settings of the experiment at a point. The experiment is summary-only, so it keeps its bins in memory instead of writing any output.
+
+        Args:
+            index (int): The index of the point.
+            point (dict[str, Any]): The value of each swept parameter.
+
+        Returns:
+            dict: The experiment settings.
+        """
+        exp = deepcopy(self.base)
+        for path, value in point.items():
+            set_parameter(exp, path, value)
+
+        # every point gets its own file stub, and so its own random streams when the sweep is seeded
+        exp.update(
+            file_stub=f"{self.name}_{index}", summary_only=True, checkpoint=False
+        )
+        return exp
+
+
+class SweepRunner:
+    """
+    Class responsible for running the sweeps in an input file and saving the results of each sweep to one table.
+
+    The input file has a "sweeps" list of sweeps (see Sweep). The binned data of every point is appended to '<name>_sweep.csv' as the points finish, with the point index and the value of each swept parameter in front of the columns of the Data sheet, so load_sweep can index the results by the swept parameters.
+
+    Args:
+        input_file (str): The path to the input file containing the sweeps.
+        output_dir (str, optional): The directory where the results will be saved. Defaults to "".
+        log_progress (bool, optional): Flag indicating whether to log the progress of the sweeps. Defaults to True.
+        jobs (int, optional): The number of worker processes to run the points on. Defaults to 1, which runs every point serially in this process.
+    """
+
+    def __init__(
+        self,
+        input_file: str,
+        output_dir: str = "",
+        log_progress: bool = True,
+        jobs: int = 1,
+    ):
+        self.input_file = input_file
+        self.output_dir = output_dir
+        self.log_progress = log_progress
+        self.jobs = jobs
+
+        with open(self.input_file, "r") as f:
+            self.sweeps = [Sweep(spec) for spec in json.load(f)["sweeps"]]
+
+    def get_results_path(self, sweep: Sweep) -> str:
+        """
+        Gets the path of the results table of a sweep.
+
+        Args:
+            sweep (Sweep): The sweep.
+
+        Returns:
+            str: The path of the results table.
+        """
+        return f"{self.output_dir}{sweep.name}_sweep.csv"
+
+    @timer.timer
+    def giddyup(self) -> None:
+        """
+        Runs the sweeps.
+
+        The points are expanded as they are submitted, and at most twice as many points as there are workers are waiting to run or to be written at once.
+        """
+        for sweep in self.sweeps:
+            if self.jobs > 1:
+                # warm up the workers on the first point of the sweep
+                first_experiment = load_experiment(
+                    sweep.get_experiment(*next(iter(sweep)))
+                )
+                warmups = [
+                    (first_experiment.settings, first_experiment.schedule_arrangements)
+                ]
+                with ProcessPoolExecutor(
+                    max_workers=self.jobs, initializer=init_worker, initargs=(warmups,)
+                ) as executor:
+                    self._run_sweep(sweep, executor)
+
+            else:
+                self._run_sweep(sweep)
+
+        print("\U0001f434 Done Giddyupped! \U0001f434")
+
+    def _run_sweep(
+        self, sweep: Sweep, executor: ProcessPoolExecutor | None = None
+    ) -> None:
+        """
+        Runs the points of a sweep and writes their results in order.
+
+        Args:
+            sweep (Sweep): The sweep to run.
+            executor (ProcessPoolExecutor, optional): The process pool to run the points on. If not given, the points run serially in this process.
+        """
+        results_path = self.get_results_path(sweep)
+        if os.path.exists(results_path):
+            os.remove(results_path)
+
+        # without a seed, the forked workers would all start from the random state of this process
+        entropy = random_streams.get_entropy()
+        pending = deque()
+        for index, point in sweep:
+            exp = sweep.get_experiment(index, point)
+            if executor is None:
+                self._write_point(sweep, index, point, run_sweep_point(exp))
+                continue
+
+            pending.append(
+                (index, point, executor.submit(run_sweep_point, exp, entropy, index))
+            )
+            if len(pending) >= 2 * self.jobs:
+                index, point, future = pending.popleft()
+                self._write_point(sweep, index, point, future.result())
+
+        while pending:
+            index, point, future = pending.popleft()
+            self._write_point(sweep, index, point, future.result())
+
+    def _write_point(
+        self, sweep: Sweep, index: int, point: dict[str, Any], summary: "pd.DataFrame"
+    ) -> None:
+        """
+        Appends the results of a point to the results table of its sweep.
+
+        Args:
+            sweep (Sweep): The sweep.
+            index (int): The index of the point.
+            point (dict[str, Any]): The value of each swept parameter.
+            summary (pd.DataFrame): The binned data of the point.
+        """
+        results_path = self.get_results_path(sweep)
+
+        summary.insert(2, "Bin", summary.groupby(["Rep", "Sch"]).cumcount())
+        for i, path in enumerate(sweep.parameters):
+            summary.insert(i, path, point[path])
+        summary.insert(0, "Point", index)
+
+        summary.to_csv(
+            results_path,
+            mode="a",
+            header=not os.path.exists(results_path),
+            index=False,
+        )
+
+        if self.log_progress:
+            print(f"{sweep.name}: point {index + 1} of {len(sweep)} done")
+
+
+def run_sweep_point(
+    exp: dict, entropy: int | None = None, index: int = 0
+) -> "pd.DataFrame":
+    """
+    Runs the experiment of a sweep point, in a process pool worker or in this process.
+
+    Args:
+        exp (dict): The experiment settings of the point.
+        entropy (int, optional): The root seed of the points of a parallel sweep, from random_streams.get_entropy. When given, the point is run on its own stream, so unseeded points don't share the random state the workers start with. Seeded points reseed their own streams, so it doesn't change them. Defaults to None.
+        index (int, optional): The index of the point, which keys its stream. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: The binned data of the point.
+    """
+    if entropy is not None:
+        random_streams.seed_stream(entropy, index)
+
+    return load_experiment(exp).run_summary()
+
+
+def load_sweep(output_dir: str, name: str) -> "pd.DataFrame":
+    """
+    Loads the results table of a sweep, indexed by the swept parameters, the repetition, the schedule arrangement and the bin.
+
+    Args:
+        output_dir (str): The directory the results were saved in.
+        name (str): The name of the sweep.
+
+    Returns:
+        pd.DataFrame: The results.
+    """
+    import pandas as pd
+
+    results = pd.read_csv(f"{output_dir}{name}_sweep.csv")
+    index_columns = list(results.columns[: results.columns.get_loc("Bin") + 1])
+    index_columns.remove("Point")
+
+    return results.drop(columns="Point").set_index(index_columns).sort_index()
@@ -2,7 +2,7 @@ import numpy as np
 from numba import njit
 
 
-@njit
+@njit(cache=True)
 def dec_to_bin(num: int, bits: int) -> np.ndarray:
     binary = np.zeros(bits, dtype=np.int8)
     i = bits - 1
@@ -14,7 +14,7 @@ def dec_to_bin(num: int, bits: int) -> np.ndarray:
     return binary
 
 
-@njit
+@njit(cache=True)
 def bin_to_dec(binary: np.ndarray) -> int:
     num = 0
     for i in range(len(binary)):
@@ -23,7 +23,7 @@ def bin_to_dec(binary: np.ndarray) -> int:
     return num
 
 
-@njit
+@njit(cache=True)
 def bit_flip(binary: np.ndarray) -> np.ndarray:
     bit = np.random.randint(0, len(binary))
 
@@ -35,7 +35,7 @@ def bit_flip(binary: np.ndarray) -> np.ndarray:
     return binary
 
 
-@njit
+@njit(cache=True)
 def convert_binary_to_decimal(binaries: np.ndarray) -> np.ndarray:
     """Converts an array of binary numbers to an array of decimal numbers.
 
@@ -2,6 +2,6 @@ import numpy as np
 from numba import njit
 
 
-@njit
+@njit(cache=True)
 def sample_exponential(mean: float) -> float:
     return np.random.exponential(mean)
@@ -0,0 +1,113 @@
+import time
+
+# the phases of a generation in the order they run, then the compiled kernels and the output
+PHASES = [
+    "emit",
+    "schedules",
+    "fitness_calculation",
+    "selection",
+    "recombination",
+    "mutation",
+    "punishment",
+    "generations",
+    "output",
+]
+
+
+class Instrumentation:
+    """
+    A class that accumulates the time spent in and the number of calls of each phase of an experiment, like a stopwatch that is lapped at the end of every phase.
+
+    The python engine laps every phase of every generation. The compiled engine runs whole chunks of generations in one jitted call, so its generations are only timed as a whole, in the "generations" phase, with one call per generation. The "schedules" phase includes the response class lookup and counting the outputs of the generation into the output block, and the "selection" phase includes the random selection of parents in the generations without reinforcement. The "output" phase is the writing of the finished output blocks and of the summary workbook.
+
+    Attributes:
+        seconds (dict[str, float]): The time spent in each phase.
+        calls (dict[str, int]): The number of calls of each phase.
+        fdf_draws (int): The number of fitness values drawn from the FDF by the selections.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.fdf_draws = 0
+        self.last_lap = time.perf_counter()
+
+    def start(self) -> None:
+        """
+        Starts timing the next phase from now, so the time since the last lap isn't counted in any phase.
+        """
+        self.last_lap = time.perf_counter()
+
+    def lap(self, phase: str, calls: int = 1) -> None:
+        """
+        Adds the time since the last lap to a phase.
+
+        Args:
+            phase (str): The phase that just finished.
+            calls (int, optional): The number of calls of the phase since the last lap. Defaults to 1.
+        """
+        now = time.perf_counter()
+        self.seconds[phase] += now - self.last_lap
+        self.calls[phase] += calls
+        self.last_lap = now
+
+    def merge(self, other: "Instrumentation") -> None:
+        """
+        Adds the counters of another instrumentation, e.g. from a process pool worker.
+
+        Args:
+            other (Instrumentation): The instrumentation to add.
+        """
+        for phase in PHASES:
+            self.seconds[phase] += other.seconds[phase]
+            self.calls[phase] += other.calls[phase]
+        self.fdf_draws += other.fdf_draws
+
+    def get_phases(self) -> dict[str, dict]:
+        """
+        Gets the counters of the phases that ran.
+
+        Returns:
+            dict[str, dict]: The seconds, calls and microseconds per call of each phase that ran.
+        """
+        return {
+            phase: {
+                "seconds": self.seconds[phase],
+                "calls": self.calls[phase],
+                "us_per_call": self.seconds[phase] / self.calls[phase] * 1e6,
+            }
+            for phase in PHASES
+            if self.calls[phase] > 0
+        }
+
+
+def format_report(report: dict) -> str:
+    """
+    Formats the report of an experiment as text.
+
+    Args:
+        report (dict): The report from Experiment.get_report.
+
+    Returns:
+        str: The formatted report.
+    """
+    lines = [
+        f"{report['file_stub']}: {report['reps']} reps x {report['arrangements']} arrangements x {report['gens']} gens with the {report['engine']} engine",
+        f"Time elapsed: {report['seconds']:.3f} s ({report['gens_per_second']:,.0f} gens/s)",
+    ]
+
+    phases = report.get("phases")
+    if phases:
+        lines.append(
+            f"{'phase':<20} {'seconds':>10} {'share':>7} {'calls':>12} {'us/call':>10}"
+        )
+        for phase, counters in phases.items():
+            share = counters["seconds"] / report["seconds"] if report["seconds"] else 0
+            lines.append(
+                f"{phase:<20} {counters['seconds']:>10.3f} {share:>7.1%} {counters['calls']:>12,} {counters['us_per_call']:>10.2f}"
+            )
+
+        if "selection" in phases:
+            lines.append(f"FDF draws: {report['fdf_draws']:,}")
+
+    return "\n".join(lines)
@@ -0,0 +1,252 @@
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.shared_memory import SharedMemory
+from typing import TextIO
+import numpy as np
+
+
+class ProgressCounters:
+    """
+    A class representing the number of generations run in each (experiment, repetition, schedule arrangement), kept in shared memory.
+
+    A pickled copy, e.g. in the arguments of a work unit sent to a process pool worker, attaches to the same memory, so the workers update the counters the main process reads. Every slot is only written by the one process running its block, with a single aligned store, so the counters need no locks. A reader may see a slot a few generations behind.
+
+    Args:
+        num_slots (int): The number of slots.
+        name (str, optional): The name of the shared memory to attach to. Creates new shared memory if not given.
+
+    Attributes:
+        gens (np.ndarray): The number of generations run in each slot.
+    """
+
+    def __init__(self, num_slots: int, name: str | None = None):
+        self.num_slots = num_slots
+        self.owner = name is None
+        self.shared_memory = SharedMemory(
+            name=name, create=self.owner, size=max(num_slots, 1) * 8
+        )
+        self.gens = np.ndarray(
+            (num_slots,), dtype=np.int64, buffer=self.shared_memory.buf
+        )
+        if self.owner:
+            self.gens[:] = 0
+
+    def __reduce__(self):
+        return ProgressCounters, (self.num_slots, self.shared_memory.name)
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, and frees it if these are the counters that created it.
+        """
+        # the memory can't be closed while an array still views it
+        self.gens = None
+        self.shared_memory.close()
+        if self.owner:
+            self.shared_memory.unlink()
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Formats a duration as hours, minutes and seconds.
+
+    Args:
+        seconds (float): The duration.
+
+    Returns:
+        str: The formatted duration, or "--:--" if it isn't finite.
+    """
+    if not np.isfinite(seconds):
+        return "--:--"
+
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressMonitor:
+    """
+    A class that reports the progress of one or more experiments from their progress counters, with the throughput and ETA of each experiment and of all of them together.
+
+    The report is rendered by a background thread every interval seconds of wall-clock time, so the runs only have to update their counters. When the stream is a terminal, the report is a single status line that is rewritten in place; otherwise it is a plain log line every interval. The throughput is measured over the last window seconds.
+
+    Args:
+        tasks (list[tuple[str, int, int]]): The name, number of (repetition, schedule arrangement) blocks and generations per block of each experiment. The experiments get consecutive ranges of slots in the counters.
+        interval (float, optional): The seconds between reports. Defaults to 0.5 on a terminal and 10 otherwise.
+        stream (TextIO, optional): The stream to report to. Defaults to sys.stdout.
+        window (float, optional): The seconds the throughput is measured over. Defaults to 10.
+
+    Attributes:
+        counters (ProgressCounters): The progress counters of the experiments.
+        offsets (list[int]): The first slot of each experiment.
+    """
+
+    def __init__(
+        self,
+        tasks: list[tuple[str, int, int]],
+        interval: float | None = None,
+        stream: TextIO | None = None,
+        window: float = 10.0,
+    ):
+        self.stream = sys.stdout if stream is None else stream
+        self.is_tty = self.stream.isatty()
+        self.interval = (0.5 if self.is_tty else 10.0) if interval is None else interval
+        self.window = window
+
+        self.names = [name for name, _, _ in tasks]
+        self.offsets = [0]
+        for _, num_blocks, _ in tasks:
+            self.offsets.append(self.offsets[-1] + num_blocks)
+        self.totals = np.array(
+            [num_blocks * gens for _, num_blocks, gens in tasks], dtype=np.int64
+        )
+        self.counters = ProgressCounters(self.offsets[-1])
+
+        self.samples = deque()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.status_shown = False
+
+    def get_done(self) -> np.ndarray:
+        """
+        Gets the number of generations each experiment has run.
+
+        Returns:
+            np.ndarray: The generations run by each experiment.
+        """
+        return np.array(
+            [
+                self.counters.gens[start:end].sum()
+                for start, end in zip(self.offsets[:-1], self.offsets[1:])
+            ],
+            dtype=np.int64,
+        )
+
+    def get_status(self, now: float | None = None) -> str:
+        """
+        Samples the counters and gets the progress, throughput and ETA of the running experiments and, if there is more than one experiment, of all of them together.
+
+        Args:
+            now (float, optional): The time of the sample. Defaults to time.monotonic().
+
+        Returns:
+            str: The status.
+        """
+        now = time.monotonic() if now is None else now
+        done = np.minimum(self.get_done(), self.totals)
+
+        self.samples.append((now, done))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+
+        rates = np.array([self._get_rate(i) for i in range(len(done))])
+
+        parts = []
+        for i, name in enumerate(self.names):
+            # show the experiments that are running, or the only experiment
+            if 0 < done[i] < self.totals[i] or len(self.names) == 1:
+                parts.append(self._format_part(name, done[i], self.totals[i], rates[i]))
+
+        if len(self.names) > 1:
+            finished = int(np.sum(done == self.totals))
+            parts.append(
+                self._format_part(
+                    f"All ({finished}/{len(self.names)} done)",
+                    done.sum(),
+                    self.totals.sum(),
+                    rates.sum(),
+                )
+            )
+
+        return " | ".join(parts)
+
+    def _get_rate(self, index: int) -> float:
+        """
+        Gets the throughput of an experiment from the samples in the window: from the oldest sample, or from the first sample after the experiment started if it started within the window.
+
+        Args:
+            index (int): The index of the experiment.
+
+        Returns:
+            float: The generations per second.
+        """
+        now, done = self.samples[-1]
+        first_time, first_done = self.samples[0][0], self.samples[0][1][index]
+        for sample_time, sample_done in self.samples:
+            if sample_done[index] > 0:
+                if sample_time < now:
+                    first_time, first_done = sample_time, sample_done[index]
+                break
+
+        if now <= first_time:
+            return 0.0
+
+        return (done[index] - first_done) / (now - first_time)
+
+    def _format_part(self, name: str, done: int, total: int, rate: float) -> str:
+        percent = 100 * done / total if total else 100.0
+        eta = (total - done) / rate if rate > 0 else (0.0 if done == total else np.inf)
+        return f"{name}: {percent:.1f}% {rate:,.0f} gens/s ETA {format_duration(eta)}"
+
+    def render(self, now: float | None = None) -> None:
+        """
+        Reports the current status, in place of the last status line on a terminal.
+
+        Args:
+            now (float, optional): The time of the report. Defaults to time.monotonic().
+        """
+        status = self.get_status(now)
+        with self.lock:
+            if self.is_tty:
+                self.stream.write(f"\r\033[K{status}")
+                self.status_shown = True
+            else:
+                self.stream.write(f"[{time.strftime('%H:%M:%S')}] {status}\n")
+            self.stream.flush()
+
+    def write(self, text: str) -> None:
+        """
+        Prints a message without mixing it into the status line, which is redrawn by the next report.
+
+        Args:
+            text (str): The message.
+        """
+        with self.lock:
+            if self.status_shown:
+                self.stream.write("\r\033[K")
+                self.status_shown = False
+            self.stream.write(f"{text}\n")
+            self.stream.flush()
+
+    def start(self) -> None:
+        """
+        Starts reporting the progress in a background thread.
+        """
+        self.stopped.clear()
+        self.samples.clear()
+        self.get_status()
+        self.thread = threading.Thread(target=self._report, daemon=True)
+        self.thread.start()
+
+    def _report(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.render()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread, reports the final status and frees the counters.
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        self.render()
+        with self.lock:
+            # keep the final status line
+            if self.status_shown:
+                self.stream.write("\n")
+                self.status_shown = False
+        self.counters.close()
@@ -0,0 +1,84 @@
+import zlib
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _seed_numba(seed: int) -> None:
+    # numba keeps its own random state, separate from NumPy's global state
+    np.random.seed(seed)
+
+
+def get_stream_seed(seed: int, *key: int) -> int:
+    """Derives the seed of an independent random stream from a root seed and a key.
+
+    The key is used as the spawn key of a NumPy SeedSequence, so every key gets a statistically independent stream that does not depend on how many other streams were derived before it.
+
+    Args:
+        seed (int): the root seed from the settings
+        key (int): the key of the stream, e.g. the experiment, repetition and schedule arrangement
+
+    Returns:
+        int: the seed of the stream
+    """
+    return int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0])
+
+
+def seed_stream(seed: int, *key: int) -> None:
+    """Seeds the random state of NumPy and of the jitted rules with the stream for a key.
+
+    Args:
+        seed (int): the root seed from the settings
+        key (int): the key of the stream, e.g. the experiment, repetition and schedule arrangement
+    """
+    stream_seed = get_stream_seed(seed, *key)
+    np.random.seed(stream_seed)
+    _seed_numba(stream_seed)
+
+
+def get_entropy() -> int:
+    """Draws fresh entropy to use as the root seed of an unseeded run.
+
+    The workers of a process pool start with a copy of the random state of the main process, so without a seed they would all draw the same numbers. Seeding each work unit with seed_stream(get_entropy(), unit) in the main process's place gives every unit an independent stream instead.
+
+    Returns:
+        int: the entropy
+    """
+    return np.random.SeedSequence().entropy
+
+
+def get_experiment_key(file_stub: str) -> int:
+    """Gets the stream key of an experiment from its file stub, so an experiment gets the same streams wherever it is in the input file.
+
+    Args:
+        file_stub (str): the file stub of the experiment
+
+    Returns:
+        int: the key of the experiment
+    """
+    return zlib.crc32(file_stub.encode())
+
+
+def get_random_state() -> tuple:
+    """Gets the random state of NumPy and of the jitted rules, so a run can be continued later from exactly where it was.
+
+    Returns:
+        tuple: the NumPy state and the numba state
+    """
+    from numba import _helperlib
+
+    numba_state = _helperlib.rnd_get_state(_helperlib.rnd_get_np_state_ptr())
+    return np.random.get_state(), numba_state
+
+
+def set_random_state(state: tuple) -> None:
+    """Restores the random state of NumPy and of the jitted rules from get_random_state.
+
+    Args:
+        state (tuple): the NumPy state and the numba state
+    """
+    from numba import _helperlib
+
+    numpy_state, numba_state = state
+    np.random.set_state(numpy_state)
+    _helperlib.rnd_set_state(_helperlib.rnd_get_np_state_ptr(), numba_state)
@@ -21,4 +21,6 @@ setup(
         "pandas==2.1.0",
         "openpyxl==3.0.10",
     ],
+    extras_require={"columnar": ["pyarrow"]},
+    entry_points={"console_scripts": ["pyetbd=pyetbd.cli:main"]},
 )
@@ -0,0 +1,42 @@
+import unittest
+from pyetbd.algorithm import Algorithm
+from pyetbd.organisms import Organism
+from pyetbd.settings_classes import ScheduleSettings
+
+
+class TestAlgorithm(unittest.TestCase):
+    def setUp(self):
+        self.organism = Organism()
+        self.algorithm = Algorithm(self.organism)
+        self.schedule_settings = [ScheduleSettings(mean=20), ScheduleSettings(mean=40)]
+
+    def test_strategy_cache(self):
+        self.algorithm.bind_arrangement(self.schedule_settings)
+        self.assertEqual(len(self.algorithm.strategy_cache), 2)
+
+        # check that setting the same schedule twice reuses the strategy objects
+        self.algorithm.set_schedule(self.schedule_settings[0])
+        selection_strategy = self.algorithm.selection_strategy
+        self.algorithm.set_schedule(self.schedule_settings[1])
+        self.assertIsNot(self.algorithm.selection_strategy, selection_strategy)
+        self.algorithm.set_schedule(self.schedule_settings[0])
+        self.assertIs(self.algorithm.selection_strategy, selection_strategy)
+
+        self.assertEqual(len(self.algorithm.strategy_cache), 2)
+
+    def test_run(self):
+        self.organism.emit()
+        self.algorithm.run(
+            True, False, self.schedule_settings[0], self.schedule_settings[1]
+        )
+        self.assertEqual(len(self.organism.population), self.organism.pop_size)
+
+    def test_mismatched_genotypes(self):
+        with self.assertRaises(ValueError):
+            self.algorithm.set_schedule(
+                ScheduleSettings(recombination_method="bitwise_integer")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import numpy as np
+import pandas as pd
+from pyetbd.analysis import (
+    analyze_matching,
+    fit_matching,
+    get_log_ratios,
+    get_ratios,
+    get_run_counts,
+)
+from pyetbd.experiment_runner import load_experiment
+
+
+def make_summary(sensitivity: float, bias: float, reps: int = 3) -> pd.DataFrame:
+    # three bins per run, the first of which is off the matching line
+    rows = []
+    for rep in range(reps):
+        for sch, r1 in enumerate([10, 20, 40, 80]):
+            r2 = 40
+            b2 = 1000
+            b1 = round(b2 * bias * (r1 / r2) ** sensitivity) + rep
+            for bin in range(3):
+                first = bin == 0
+                rows.append(
+                    {
+                        "Rep": rep,
+                        "Sch": sch,
+                        "B1": 5 if first else b1,
+                        "R1": r1,
+                        "P1": 0,
+                        "B2": 500 if first else b2,
+                        "R2": r2,
+                        "P2": 0,
+                    }
+                )
+
+    return pd.DataFrame(rows)
+
+
+class TestAnalysis(unittest.TestCase):
+    def test_get_run_counts(self):
+        summary = make_summary(1.0, 1.0)
+        counts = get_run_counts(summary)
+        self.assertEqual(counts.responses.shape, (1, 3, 4, 3, 2))
+        self.assertIsNone(counts.points)
+        np.testing.assert_array_equal(counts.num_bins, 3)
+        self.assertEqual(counts.responses[0, 1, 2, 1, 1], 1000)
+
+        # per-generation output is binned by generation
+        output = pd.DataFrame(
+            {
+                "Rep": [0] * 4,
+                "Sch": [0] * 4,
+                "Gen": [0, 1, 2, 3],
+                "Emissions": [0] * 4,
+                "B1": [1, 0, 1, 1],
+                "R1": [0, 0, 1, 0],
+                "P1": [0] * 4,
+            }
+        )
+        counts = get_run_counts(output, bin_width=3)
+        np.testing.assert_array_equal(counts.responses[0, 0, 0, :, 0], [2, 1])
+        np.testing.assert_array_equal(counts.num_bins, [[[2]]])
+
+        with self.assertRaises(ValueError):
+            get_run_counts(output)
+
+    def test_fit_matching(self):
+        counts = get_run_counts(make_summary(0.8, 1.5))
+        log_b, log_r = get_log_ratios(counts, exclude_bins=1)
+        fit = fit_matching(log_b, log_r)
+        self.assertAlmostEqual(fit["sensitivity"][0], 0.8, places=2)
+        self.assertAlmostEqual(fit["bias"][0], np.log10(1.5), places=2)
+        self.assertGreater(fit["r_squared"][0], 0.99)
+        self.assertEqual(fit["n"][0], 12)
+
+        # the last bins are the same as leaving out the first bin
+        np.testing.assert_array_equal(get_log_ratios(counts, last_bins=2)[0], log_b)
+        # the first bin is off the line
+        fit = fit_matching(*get_log_ratios(counts))
+        self.assertLess(fit["sensitivity"][0], 0.8)
+
+        # a zero count leaves the run out
+        counts.responses[0, 0, 0, :, 1] = 0
+        fit = fit_matching(*get_log_ratios(counts, exclude_bins=1))
+        self.assertEqual(fit["n"][0], 11)
+
+    def test_analyze_sweep(self):
+        points = []
+        for a in [0.5, 1.0]:
+            summary = make_summary(a, 1.0, reps=5)
+            summary.insert(0, "a", a)
+            summary.insert(3, "Bin", summary.groupby(["Rep", "Sch"]).cumcount())
+            points.append(summary)
+        results = pd.concat(points).set_index(["a", "Rep", "Sch", "Bin"])
+
+        analysis = analyze_matching(results, exclude_bins=1, seed=1234)
+        self.assertEqual(list(analysis.index), [0.5, 1.0])
+        np.testing.assert_allclose(analysis["sensitivity"], [0.5, 1.0], atol=0.01)
+        self.assertTrue(
+            (analysis["sensitivity_low"] <= analysis["sensitivity"]).all()
+            and (analysis["sensitivity"] <= analysis["sensitivity_high"]).all()
+        )
+        self.assertTrue((analysis["bias_low"] <= analysis["bias_high"]).all())
+
+        # the intervals are reproducible with a seed
+        pd.testing.assert_frame_equal(
+            analysis, analyze_matching(results, exclude_bins=1, seed=1234)
+        )
+
+        ratios = get_ratios(results, exclude_bins=1)
+        self.assertEqual(ratios.index.names, ["a", "Rep", "Sch"])
+        self.assertEqual(len(ratios), 2 * 5 * 4)
+        self.assertAlmostEqual(ratios.loc[(1.0, 0, 0), "R1/R2"], 0.25)
+
+    def test_analyze_run(self):
+        second_class = {
+            "response_class_lower_bound": 512,
+            "response_class_upper_bound": 553,
+        }
+        exp = {
+            "file_stub": "analysis",
+            "reps": 2,
+            "gens": 2000,
+            "bin_width": 500,
+            "seed": 1234,
+            "summary_only": True,
+            "schedules": [
+                [{"mean": mean}, {"mean": 50 - mean, **second_class}]
+                for mean in [10, 25, 40]
+            ],
+        }
+        summary = load_experiment(exp).run_summary()
+        analysis = analyze_matching(summary, exclude_bins=1, num_samples=100, seed=1)
+
+        self.assertEqual(len(analysis), 1)
+        ratios = get_ratios(summary, exclude_bins=1)
+        # a run with exclusive preference has no ratio
+        self.assertEqual(len(ratios), 6)
+        self.assertEqual(analysis["n"].iloc[0], ratios.dropna().shape[0])
+        self.assertGreater(analysis["sensitivity"].iloc[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from pyetbd import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.results = benchmark.run_benchmarks(
+            benchmark.QUICK_BENCHMARK_GRID,
+            engines=["compiled"],
+            gens=20,
+            log_progress=False,
+        )
+
+    def test_run_benchmarks(self):
+        names = [result["benchmark"] for result in self.results["results"]]
+        self.assertEqual(
+            names,
+            [
+                "fitness_calculation",
+                "fitness_search_selection",
+                "fitness_exact_selection",
+                "recombination",
+                "bit_flip_mutate",
+                "binary_conversion",
+                "run_schedules",
+                "experiment_run",
+            ],
+        )
+        self.assertTrue(
+            all(result["seconds"] > 0 for result in self.results["results"])
+        )
+        self.assertGreater(self.results["results"][-1]["gens_per_second"], 0)
+        self.assertIn("code_version", self.results["environment"])
+
+    def test_save_and_compare_results(self):
+        path = os.path.join(tempfile.mkdtemp(), "results.json")
+        benchmark.save_results(self.results, path)
+        baseline = benchmark.load_results(path)
+        self.assertEqual(baseline, self.results)
+        self.assertEqual(benchmark.compare_results(baseline, self.results), [])
+
+        # check that a benchmark that got twice as slow is reported
+        slower_results = benchmark.load_results(path)
+        slower_results["results"][3]["seconds"] *= 2
+        [(result, ratio)] = benchmark.compare_results(baseline, slower_results)
+        self.assertEqual(result["benchmark"], "recombination")
+        self.assertAlmostEqual(ratio, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
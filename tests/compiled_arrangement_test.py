@@ -0,0 +1,127 @@
+import unittest
+import numpy as np
+from pyetbd.compiled_arrangement import CompiledArrangement, CompiledSchedules
+from pyetbd.organisms import Organism
+from pyetbd.schedules import (
+    FixedIntervalSchedule,
+    FixedRatioSchedule,
+    RandomIntervalSchedule,
+)
+from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
+
+
+class TestCompiledArrangement(unittest.TestCase):
+    def setUp(self):
+        self.settings = ExperimentSettings(file_stub="test")
+        self.organism = Organism()
+        self.arrangement = [
+            RandomIntervalSchedule(ScheduleSettings(mean=20)),
+            RandomIntervalSchedule(
+                ScheduleSettings(
+                    mean=120,
+                    response_class_lower_bound=512,
+                    response_class_upper_bound=553,
+                )
+            ),
+        ]
+
+    def test_run_outputs(self):
+        compiled_arrangement = CompiledArrangement(
+            self.arrangement, self.settings, self.organism
+        )
+        outputs = compiled_arrangement.create_outputs(2000)
+        compiled_arrangement.run(0, 1000, outputs)
+        compiled_arrangement.run(1000, 2000, outputs)
+        emissions, behavior, reinforcement, punishment = outputs
+
+        for i, schedule in enumerate(self.arrangement):
+            # check that the behavior output matches the response class of each schedule
+            expected_behavior = np.isin(emissions, schedule.response_class)
+            np.testing.assert_array_equal(behavior[:, i], expected_behavior)
+            # check that reinforcement is only delivered for responses in the response class
+            self.assertTrue(np.all(reinforcement[:, i] <= behavior[:, i]))
+
+        # check that no punishment is delivered by reinforcement schedules
+        self.assertEqual(punishment.sum(), 0)
+        self.assertEqual(len(self.organism.population), self.organism.pop_size)
+
+    def test_fixed_interval_schedule(self):
+        # every phenotype is in the response class, so every 5th generation is reinforced
+        schedule = FixedIntervalSchedule(
+            ScheduleSettings(
+                mean=5,
+                response_class_lower_bound=0,
+                response_class_upper_bound=1024,
+                response_class_size=1024,
+            )
+        )
+        compiled_arrangement = CompiledArrangement(
+            [schedule], self.settings, self.organism
+        )
+        outputs = compiled_arrangement.create_outputs(22)
+        compiled_arrangement.run(0, 22, outputs)
+        reinforcement = outputs[2]
+
+        expected_reinforcement = np.zeros(22, dtype=np.int8)
+        expected_reinforcement[4::5] = 1
+        np.testing.assert_array_equal(reinforcement[:, 0], expected_reinforcement)
+        # check that the schedule counter was written back to the schedule
+        self.assertEqual(schedule.count, 2)
+
+    def test_compiled_schedules(self):
+        # an FI 3 reinforcement schedule and an FR 2 punishment schedule
+        schedules = CompiledSchedules(
+            [
+                FixedIntervalSchedule(ScheduleSettings(mean=3)),
+                FixedRatioSchedule(
+                    ScheduleSettings(mean=2, is_reinforcement_schedule=False)
+                ),
+            ]
+        )
+        # responses in both classes, in neither class, in both, in the first class only, then in both
+        memberships = [0b11, 0b00, 0b11, 0b01, 0b11]
+        flags = [schedules.run(membership) for membership in memberships]
+
+        # the interval counts every generation, but only a response in its class collects the reinforcer
+        # the ratio only counts the responses in its class
+        self.assertEqual(flags, [(0, 0), (0, 0), (0b01, 0b10), (0, 0), (0, 0)])
+        np.testing.assert_array_equal(schedules.counts, [2, 1])
+
+        # check that the counts are written back to the schedules and read from them
+        schedules.store()
+        self.assertEqual([schedule.count for schedule in schedules.arrangement], [2, 1])
+        schedules.arrangement[0].count = 0
+        schedules.load()
+        np.testing.assert_array_equal(schedules.counts, [0, 1])
+
+    def test_binned_outputs(self):
+        # 22 generations binned by 10 from an offset of 3 go to rows 0 (7 generations), 1 and 2 (5 generations)
+        schedule = FixedIntervalSchedule(
+            ScheduleSettings(
+                mean=5,
+                response_class_lower_bound=0,
+                response_class_upper_bound=1024,
+                response_class_size=1024,
+            )
+        )
+        compiled_arrangement = CompiledArrangement(
+            [schedule], self.settings, self.organism
+        )
+        outputs = compiled_arrangement.create_outputs(3, np.int32)
+        compiled_arrangement.run(0, 12, outputs, 3, 10)
+        compiled_arrangement.run(12, 22, outputs, 3, 10)
+        behavior, reinforcement = outputs[1], outputs[2]
+
+        np.testing.assert_array_equal(behavior[:, 0], [7, 10, 5])
+        # generations 4, 9, 14 and 19 are reinforced
+        np.testing.assert_array_equal(reinforcement[:, 0], [1, 2, 1])
+        self.assertEqual(self.organism.emitted, outputs[0][2])
+
+    def test_unsupported_strategy(self):
+        self.settings.mutation_method = "not_a_method"
+        with self.assertRaises(ValueError):
+            CompiledArrangement(self.arrangement, self.settings, self.organism)
+
+
+if __name__ == "__main__":
+    unittest.main()
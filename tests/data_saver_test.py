@@ -0,0 +1,129 @@
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from pyetbd.data_saver import DataSaver, create_block
+from pyetbd.settings_classes import ExperimentSettings
+
+
+class TestDataSaver(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp() + "/"
+        self.settings = ExperimentSettings(
+            file_stub="test", reps=2, gens=1000, schedules=[[{}, {}], [{}, {}]]
+        )
+        self.data_saver = DataSaver(self.settings, self.output_dir)
+        self.data_saver.add_schedule_outputs(2)
+
+    def write_blocks(self, keys):
+        for rep, sch in keys:
+            emissions, behavior, reinforcement, punishment = create_block(1000, 2)
+            emissions[:] = rep * 10 + sch
+            behavior[:, 0] = 1
+            self.data_saver.write_block(
+                rep, sch, emissions, behavior, reinforcement, punishment
+            )
+
+    def read_csv(self):
+        return pd.read_csv(f"{self.output_dir}test.csv", index_col=0)
+
+    def test_stream_blocks(self):
+        # check that each block is flushed as soon as it is written
+        self.write_blocks([(0, 0)])
+        df = self.read_csv()
+        self.assertEqual(
+            list(df.columns),
+            ["Rep", "Sch", "Gen", "Emissions", "B1", "R1", "P1", "B2", "R2", "P2"],
+        )
+        self.assertEqual(len(df), 1000)
+        self.assertEqual(self.data_saver.pending_blocks, {})
+
+        # check that a block that finishes early is held until the blocks before it are flushed
+        self.write_blocks([(1, 0)])
+        self.assertEqual(len(self.read_csv()), 1000)
+        self.assertEqual(list(self.data_saver.pending_blocks), [(1, 0)])
+
+        self.write_blocks([(0, 1)])
+        df = self.read_csv()
+        self.assertEqual(len(df), 3000)
+        self.assertEqual(self.data_saver.pending_blocks, {})
+
+        # check that the rows are in order with a continuous index
+        np.testing.assert_array_equal(df.index, np.arange(3000))
+        np.testing.assert_array_equal(df["Emissions"].unique(), [0, 1, 10])
+        row = self.data_saver.get_row(1, 0, 10)
+        self.assertEqual(list(df.loc[row, ["Rep", "Sch", "Gen"]]), [1, 0, 10])
+
+    def test_save_data(self):
+        self.write_blocks([(1, 1), (0, 0), (1, 0), (0, 1)])
+        self.data_saver.save_data()
+
+        self.assertEqual(len(self.read_csv()), 4000)
+
+        # check that the 500 generation bins are summed without overflowing
+        formatted_df = pd.read_excel(f"{self.output_dir}test.xlsx", sheet_name="Data")
+        self.assertEqual(len(formatted_df), 8)
+        self.assertTrue(np.all(formatted_df["B1"] == 500))
+        self.assertTrue(np.all(formatted_df["B2"] == 0))
+
+    def test_save_incomplete_data(self):
+        self.write_blocks([(0, 0), (1, 1)])
+        with self.assertRaises(ValueError):
+            self.data_saver.save_data()
+
+    def test_bins_across_blocks(self):
+        # with 300 generations a block ends part way through a bin, which is then summed across blocks
+        self.settings.gens = 300
+        self.data_saver.add_schedule_outputs(1)
+        for rep in range(2):
+            for sch in range(2):
+                emissions, behavior, reinforcement, punishment = create_block(300, 1)
+                behavior[:] = 1
+                self.data_saver.write_block(
+                    rep, sch, emissions, behavior, reinforcement, punishment
+                )
+
+        formatted_df = self.data_saver._format_data()
+        df = self.read_csv()
+        df["bin"] = df.index // 500
+        expected_df = df.groupby(["Rep", "Sch", "bin"]).sum().reset_index()
+        np.testing.assert_array_equal(formatted_df["B1"], expected_df["B1"])
+
+    def test_get_block_layout(self):
+        self.assertEqual(self.data_saver.get_block_layout(1, 1), (0, 1, 1000))
+
+        # rep 0 sch 1 starts at global row 1000, which is 200 generations into a 400 generation bin
+        self.settings.summary_only = True
+        self.settings.bin_width = 400
+        self.assertEqual(self.data_saver.get_block_layout(0, 0), (0, 400, 3))
+        self.assertEqual(self.data_saver.get_block_layout(0, 1), (200, 400, 3))
+        self.assertEqual(self.data_saver.get_block_layout(1, 1), (200, 400, 3))
+        self.settings.gens = 700
+        self.assertEqual(self.data_saver.get_block_layout(0, 1), (300, 400, 3))
+
+    def test_save_summary_only(self):
+        self.settings.summary_only = True
+        self.data_saver.add_schedule_outputs(2)
+        self.assertIsNone(self.data_saver.writer)
+
+        for rep, sch in [(1, 1), (0, 0), (1, 0), (0, 1)]:
+            emissions, behavior, reinforcement, punishment = (
+                self.data_saver.create_block(rep, sch, 2)
+            )
+            self.assertEqual(behavior.dtype, np.int32)
+            behavior[:, 0] = 500
+            self.data_saver.write_block(
+                rep, sch, emissions, behavior, reinforcement, punishment
+            )
+
+        self.data_saver.save_data()
+
+        formatted_df = pd.read_excel(f"{self.output_dir}test.xlsx", sheet_name="Data")
+        self.assertEqual(len(formatted_df), 8)
+        self.assertEqual(list(formatted_df["Rep"]), [0, 0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual(list(formatted_df["Sch"]), [0, 0, 1, 1, 0, 0, 1, 1])
+        self.assertTrue(np.all(formatted_df["B1"] == 500))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+import io
+import json
+import os
+import unittest
+import tempfile
+from contextlib import redirect_stdout
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from pyetbd.experiment import Experiment, init_worker
+from pyetbd.schedules import RandomIntervalSchedule
+from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
+from pyetbd.utils import random_streams
+
+
+class TestExperiment(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp() + "/"
+        self.settings = ExperimentSettings(file_stub="test", reps=2, gens=50)
+        self.schedule_arrangements = [
+            [
+                RandomIntervalSchedule(ScheduleSettings(mean=20)),
+                RandomIntervalSchedule(
+                    ScheduleSettings(
+                        mean=120,
+                        response_class_lower_bound=512,
+                        response_class_upper_bound=553,
+                    )
+                ),
+            ]
+            for _ in range(3)
+        ]
+
+    def tearDown(self):
+        # seeded runs leave the global random state seeded, so reseed it from fresh entropy for the other tests
+        random_streams.seed_stream(np.random.SeedSequence().entropy)
+
+    def read_output(self):
+        return pd.read_csv(f"{self.output_dir}test.csv", index_col=0)
+
+    def test_get_work_units(self):
+        experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        self.assertEqual(len(experiment.get_work_units()), 6)
+
+        self.settings.reinitialize_population = False
+        self.assertEqual(experiment.get_work_units(), [(0, [0, 1, 2]), (1, [0, 1, 2])])
+
+    def test_run_parallel(self):
+        experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        with ProcessPoolExecutor(
+            max_workers=2,
+            initializer=init_worker,
+            initargs=([(self.settings, self.schedule_arrangements)],),
+        ) as executor:
+            experiment.run(executor)
+
+        data_output = self.read_output()
+        # check that every block was written in the same row order as a serial run
+        self.assertEqual(len(data_output), 2 * 3 * 50)
+        emissions = data_output["Emissions"].to_numpy().reshape(2, 3, 50)
+        self.assertTrue(np.all(emissions.any(axis=2)))
+        for rep in range(2):
+            for sch in range(3):
+                behavior = np.isin(
+                    emissions[rep, sch],
+                    self.schedule_arrangements[sch][0].response_class,
+                )
+                np.testing.assert_array_equal(
+                    data_output["B1"].to_numpy().reshape(2, 3, 50)[rep, sch], behavior
+                )
+
+    def test_unseeded_parallel_reps_differ(self):
+        self.settings.reps = 4
+        self.settings.reinitialize_population = False
+        experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        with ProcessPoolExecutor(
+            max_workers=4,
+            initializer=init_worker,
+            initargs=([(self.settings, self.schedule_arrangements)],),
+        ) as executor, redirect_stdout(io.StringIO()) as output:
+            experiment.run(executor)
+
+        # the repetitions don't carry their state over like in a serial run
+        self.assertIn("Warning: Without a seed", output.getvalue())
+
+        # the workers are copies of this process, so they'd share its random state without a stream of their own
+        emissions = self.read_output()["Emissions"].to_numpy().reshape(4, 3, 50)
+        self.assertGreater(len(set(emissions[:, 0, 0])), 1)
+        self.assertGreater(len({tuple(rep) for rep in emissions[:, 0]}), 1)
+
+    def test_seeded_work_unit(self):
+        self.settings.seed = 1234
+        experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        experiment.run()
+        emissions = self.read_output()["Emissions"].to_numpy().reshape(2, 3, 50)
+
+        # check that a single unit run in isolation gives bit-identical output
+        isolated_experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        [(rep, sch, block)] = isolated_experiment.run_work_unit(1, [2])
+        np.testing.assert_array_equal(block[0], emissions[1, 2])
+
+        # check that every unit gets its own stream
+        self.assertFalse(np.array_equal(emissions[0, 0], emissions[1, 0]))
+
+    def test_seeded_parallel_matches_serial(self):
+        self.settings.seed = 1234
+        self.settings.reinitialize_population = False
+        serial_experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        serial_experiment.run()
+        serial_output = self.read_output()
+
+        parallel_experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        with ProcessPoolExecutor(max_workers=2) as executor, redirect_stdout(
+            io.StringIO()
+        ) as output:
+            parallel_experiment.run(executor)
+
+        pd.testing.assert_frame_equal(self.read_output(), serial_output)
+        self.assertNotIn("Warning", output.getvalue())
+
+    def test_unknown_engine(self):
+        self.settings.engine = "batched"
+        experiment = Experiment(
+            self.settings, self.schedule_arrangements, False, self.output_dir
+        )
+        with self.assertRaises(ValueError):
+            experiment.run()
+
+    def test_instrumented_run(self):
+        self.settings.seed = 1234
+
+        for engine in ["python", "compiled"]:
+            self.settings.engine = engine
+            self.settings.instrument = False
+            experiment = Experiment(
+                self.settings, self.schedule_arrangements, False, self.output_dir
+            )
+            experiment.run()
+            expected_output = self.read_output()
+            self.assertNotIn("phases", experiment.report)
+
+            self.settings.instrument = True
+            experiment = Experiment(
+                self.settings, self.schedule_arrangements, False, self.output_dir
+            )
+            experiment.run()
+
+            # check that instrumenting the run doesn't change its output
+            pd.testing.assert_frame_equal(self.read_output(), expected_output)
+
+            phases = experiment.report["phases"]
+            if engine == "python":
+                for phase in ["emit", "schedules", "selection", "mutation"]:
+                    self.assertEqual(phases[phase]["calls"], 2 * 3 * 50)
+                # every reinforced generation selects 2 parents per member with at least one draw each
+                reinforcers = self.read_output()[["R1", "R2"]].to_numpy().sum()
+                self.assertEqual(phases["fitness_calculation"]["calls"], reinforcers)
+                self.assertGreaterEqual(
+                    experiment.report["fdf_draws"], reinforcers * 2 * 100
+                )
+            else:
+                self.assertEqual(phases["generations"]["calls"], 2 * 3 * 50)
+                self.assertNotIn("emit", phases)
+
+            # the 6 blocks and the summary workbook
+            self.assertEqual(phases["output"]["calls"], 7)
+            with open(f"{self.output_dir}test_report.json") as f:
+                self.assertEqual(json.load(f)["phases"].keys(), phases.keys())
+
+    def test_summary_only_matches_data_sheet(self):
+        # 730 generations end part way through a 200 generation bin, so the blocks start at different offsets within their bins
+        self.settings.seed = 1234
+        self.settings.gens = 730
+        self.settings.bin_width = 200
+
+        for engine in ["python", "compiled"]:
+            self.settings.engine = engine
+            self.settings.summary_only = False
+            Experiment(
+                self.settings, self.schedule_arrangements, False, self.output_dir
+            ).run()
+            expected_df = pd.read_excel(
+                f"{self.output_dir}test.xlsx", sheet_name="Data"
+            )
+
+            self.settings.summary_only = True
+            experiment = Experiment(
+                self.settings, self.schedule_arrangements, False, self.output_dir
+            )
+            experiment.run()
+            summary_df = pd.read_excel(f"{self.output_dir}test.xlsx", sheet_name="Data")
+
+            self.assertIsNone(experiment.data_saver.writer)
+            pd.testing.assert_frame_equal(summary_df, expected_df)
+            self.assertGreater(summary_df["B1"].sum(), 0)
+
+    def test_resume_matches_uninterrupted(self):
+        self.settings.checkpoint = True
+        self.settings.checkpoint_gens = 20
+
+        for engine in ["python", "compiled"]:
+            self.settings.engine = engine
+            random_streams.seed_stream(1234)
+            experiment = Experiment(
+                self.settings,
+                deepcopy(self.schedule_arrangements),
+                False,
+                self.output_dir,
+            )
+            experiment.run()
+            expected_output = self.read_output()
+            # check that the checkpoint is removed once the run finishes
+            self.assertFalse(os.path.exists(experiment.get_checkpoint_path()))
+
+            # interrupt the run before its 6th checkpoint, after the block of rep 0 sch 1 was written
+            random_streams.seed_stream(1234)
+            experiment = Experiment(
+                self.settings,
+                deepcopy(self.schedule_arrangements),
+                False,
+                self.output_dir,
+            )
+            save_checkpoint = experiment._save_checkpoint
+            checkpoints = []
+
+            def interrupt(*args):
+                checkpoints.append(args[:2])
+                if len(checkpoints) == 6:
+                    raise KeyboardInterrupt
+
+                save_checkpoint(*args)
+
+            experiment._save_checkpoint = interrupt
+            with self.assertRaises(KeyboardInterrupt):
+                experiment.run()
+            self.assertEqual(
+                checkpoints, [(0, 20), (0, 40), (1, 0), (1, 20), (1, 40), (2, 0)]
+            )
+            self.assertEqual(len(self.read_output()), 100)
+
+            # resume from the mid-block checkpoint with a different random state and fresh schedules
+            random_streams.seed_stream(5678)
+            resumed_experiment = Experiment(
+                self.settings,
+                deepcopy(self.schedule_arrangements),
+                False,
+                self.output_dir,
+            )
+            resumed_experiment.run(resume=True)
+            pd.testing.assert_frame_equal(self.read_output(), expected_output)
+
+        with self.assertRaises(ValueError):
+            resumed_experiment.run(resume=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
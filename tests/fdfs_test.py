@@ -38,6 +38,20 @@ class TestFDFs(unittest.TestCase):
         plt.hist(samples, bins=100, density=True, histtype="step")
         plt.show()
 
+    def test_fdf_pmfs(self):
+        mean = 10.0
+        for sample_func, pmf_func in [
+            (fdfs.sample_linear_fdf, fdfs.linear_fdf_pmf),
+            (fdfs.sample_exponential_fdf, fdfs.exponential_fdf_pmf),
+        ]:
+            samples = np.array([sample_func(mean) for _ in range(100000)])
+            pmf = np.array([pmf_func(fitness, mean) for fitness in range(1000)])
+
+            # check that the pmf sums to 1 and matches the frequency of each sampled value
+            self.assertAlmostEqual(pmf.sum(), 1.0)
+            frequencies = np.bincount(samples, minlength=1000)[:1000] / len(samples)
+            np.testing.assert_allclose(frequencies, pmf, atol=0.005)
+
     def test_sample_exponential_fdf_distribution(self):
         mean = 10.0
         samples = np.array([fdfs.sample_exponential_fdf(mean) for _ in range(10000)])
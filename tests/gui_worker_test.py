@@ -0,0 +1,96 @@
+import json
+import os
+import queue
+import tempfile
+import unittest
+import numpy as np
+from pyetbd.gui_worker import downsample_rates, start_run
+
+
+def get_messages(process, messages) -> list[tuple]:
+    received = []
+    while True:
+        try:
+            received.append(messages.get(timeout=0.1))
+        except queue.Empty:
+            if not process.is_alive():
+                break
+            continue
+
+        if received[-1][0] in ["done", "error"]:
+            break
+
+    process.join(timeout=60)
+    return received
+
+
+class TestGUIWorker(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp() + "/"
+        self.input_file = f"{self.output_dir}gui.json"
+
+    def write_input(self, gens: int) -> None:
+        experiment = {
+            "file_stub": "gui",
+            "reps": 1,
+            "gens": gens,
+            "seed": 1234,
+            "schedules": [[{"mean": 5}, {"mean": 10}]],
+        }
+        with open(self.input_file, "w") as f:
+            json.dump({"experiments": [experiment]}, f)
+
+    def test_downsample_rates(self):
+        counts = np.ones((10, 2), dtype=np.int8)
+        counts[:, 1] = 0
+        counts[::2, 1] = 4
+
+        gens, rates = downsample_rates(counts, 7, 5, points=3)
+        # groups of 3, 3 and 1 rows of 5 generations
+        np.testing.assert_array_equal(gens, [7.5, 22.5, 32.5])
+        np.testing.assert_allclose(rates[:, 0], [0.2, 0.2, 0.2])
+        np.testing.assert_allclose(rates[:, 1], [8 / 15, 4 / 15, 4 / 5])
+
+        gens, rates = downsample_rates(counts, 0, 5)
+        self.assertEqual(gens.shape, (0,))
+        self.assertEqual(rates.shape, (0, 2))
+
+    def test_run(self):
+        self.write_input(2000)
+        process, messages = start_run(self.input_file, self.output_dir)
+        received = get_messages(process, messages)
+
+        self.assertEqual(received[-1], ("done",))
+        progress = [message for message in received if message[0] == "progress"]
+        self.assertGreater(len(progress), 0)
+        # the final report is of the finished run
+        _, status, fraction, rates = progress[-1]
+        self.assertEqual(fraction, 1.0)
+        self.assertIn("100.0%", status)
+        self.assertEqual(len(rates["responses"]), 2)
+        self.assertEqual(len(rates["gens"]), len(rates["reinforcers"][0]))
+        self.assertTrue(os.path.exists(f"{self.output_dir}gui.xlsx"))
+
+    def test_error(self):
+        process, messages = start_run(f"{self.output_dir}missing.json", self.output_dir)
+        received = get_messages(process, messages)
+
+        self.assertEqual(received[-1][0], "error")
+        self.assertIn("FileNotFoundError", received[-1][1])
+
+    def test_cancel(self):
+        self.write_input(1_000_000)
+        process, messages = start_run(self.input_file, self.output_dir)
+
+        # wait for the run to start before cancelling it
+        while messages.get(timeout=120)[0] != "progress":
+            pass
+        process.terminate()
+        process.join(timeout=10)
+
+        self.assertFalse(process.is_alive())
+        self.assertFalse(os.path.exists(f"{self.output_dir}gui.xlsx"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import subprocess
+import sys
+
+
+def get_imported_modules(module: str, candidates: list[str]) -> list[str]:
+    """Imports a module in a fresh interpreter and returns which of the candidate modules it pulled in."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {candidates!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    output = result.stdout.strip()
+    return output.split(",") if output else []
+
+
+class TestImportTime(unittest.TestCase):
+    def test_package_import(self):
+        # importing the package or building the command line interface shouldn't load anything heavy
+        for module in ["pyetbd", "pyetbd.cli"]:
+            self.assertEqual(
+                get_imported_modules(
+                    module, ["numba", "pandas", "openpyxl", "pyetbd.experiment"]
+                ),
+                [],
+            )
+
+    def test_runner_import(self):
+        # pandas and openpyxl are only needed once the data is saved
+        self.assertEqual(
+            get_imported_modules("pyetbd.experiment_runner", ["pandas", "openpyxl"]),
+            [],
+        )
+
+    def test_gui_import(self):
+        try:
+            import tkinter
+        except ImportError:
+            self.skipTest("tkinter is not installed")
+
+        # the GUI only imports the runner when experiments are run
+        self.assertEqual(
+            get_imported_modules("pyetbd.experiment_gui", ["numba", "pandas"]), []
+        )
+
+    def test_import_time(self):
+        # guard the startup time of the command line interface with python's import time profiler,
+        # relative to pandas in the same interpreter so that the bound doesn't depend on the machine;
+        # the command line interface is imported first so that any shared dependencies count against it
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import pyetbd.cli, pandas"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cumulative_us = {}
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() in ["pyetbd.cli", "pandas"]:
+                cumulative_us[fields[2].strip()] = int(fields[1])
+
+        self.assertLess(cumulative_us["pyetbd.cli"], 0.5 * cumulative_us["pandas"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from pyetbd.rules.mutation import bit_flip_mutate
+from pyetbd.rules.mutation import bit_flip_mutate, bit_flip_integer_mutate
 from pyetbd.utils import binary_converter
 
 # set up logging
@@ -36,6 +36,29 @@ class TestMutation(unittest.TestCase):
             np.mean(num_mutations_list), mut_rate * children_genos.shape[0], delta=0.05
         )
 
+    def test_bit_flip_integer_mutate(self):
+        children = np.random.randint(0, 1024, size=100)
+        mut_rate = 0.1
+        num_mutations_list = []
+
+        for _ in range(10000):
+            mutated_children = bit_flip_integer_mutate(children, 10, mut_rate)
+
+            # check that mutated children differ from their original by exactly one bit
+            flipped = mutated_children[mutated_children != children] ^ (
+                children[mutated_children != children]
+            )
+            self.assertTrue(np.all(flipped & (flipped - 1) == 0))
+
+            num_mutations_list.append(len(flipped))
+
+        logger.debug(f"Mutation Rate: {mut_rate}")
+        logger.debug(f"Mean Number of Integer Mutations: {np.mean(num_mutations_list)}")
+        # check that the number of mutations is approximately equal to the mutation rate
+        self.assertAlmostEqual(
+            np.mean(num_mutations_list), mut_rate * children.shape[0], delta=0.15
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
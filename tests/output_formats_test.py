@@ -0,0 +1,111 @@
+import unittest
+import importlib.util
+import tempfile
+import numpy as np
+import pandas as pd
+from pyetbd.data_saver import DataSaver, create_block
+from pyetbd.output_formats import get_output_writer, load_output
+from pyetbd.settings_classes import ExperimentSettings
+
+
+class TestOutputFormats(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp() + "/"
+
+    def create_data_saver(self, output_format, file_stub=None):
+        settings = ExperimentSettings(
+            file_stub=file_stub or f"test_{output_format}",
+            reps=2,
+            gens=700,
+            schedules=[[{}, {}], [{}, {}]],
+            output_format=output_format,
+        )
+        return DataSaver(settings, self.output_dir)
+
+    def write_blocks(self, data_saver, keys):
+        for rep, sch in keys:
+            rng = np.random.default_rng(rep * 2 + sch)
+            emissions, behavior, reinforcement, punishment = create_block(700, 2)
+            emissions[:] = rng.integers(0, 1024, 700)
+            behavior[:] = rng.integers(0, 2, (700, 2))
+            reinforcement[:] = behavior * rng.integers(0, 2, (700, 2))
+            data_saver.write_block(
+                rep, sch, emissions, behavior, reinforcement, punishment
+            )
+
+    def save_experiment(self, output_format):
+        data_saver = self.create_data_saver(output_format)
+        data_saver.add_schedule_outputs(2)
+        self.write_blocks(data_saver, [(0, 0), (0, 1), (1, 0), (1, 1)])
+        data_saver.save_data()
+        return data_saver
+
+    def check_resume(self, output_format):
+        self.save_experiment(output_format)
+        expected_df = load_output(
+            self.output_dir, f"test_{output_format}", output_format
+        ).copy()
+
+        # write a block after the checkpoint, as if the run was interrupted before the next checkpoint
+        data_saver = self.create_data_saver(output_format, "test_resume")
+        data_saver.add_schedule_outputs(2)
+        self.write_blocks(data_saver, [(0, 0)])
+        checkpoint = data_saver.get_checkpoint()
+        self.write_blocks(data_saver, [(0, 1)])
+
+        resumed_data_saver = self.create_data_saver(output_format, "test_resume")
+        resumed_data_saver.resume(checkpoint)
+        self.write_blocks(resumed_data_saver, [(0, 1), (1, 0), (1, 1)])
+        resumed_data_saver.save_data()
+
+        df = load_output(self.output_dir, "test_resume", output_format).copy()
+        pd.testing.assert_frame_equal(df, expected_df)
+
+    def check_format(self, output_format):
+        self.save_experiment("csv")
+        self.save_experiment(output_format)
+
+        # check that the output has the same rows, columns and values as the csv output
+        csv_df = load_output(self.output_dir, "test_csv")
+        df = load_output(self.output_dir, f"test_{output_format}", output_format)
+        self.assertEqual(list(df.columns), list(csv_df.columns))
+        np.testing.assert_array_equal(df.to_numpy(), csv_df.to_numpy())
+        self.assertEqual(df["B1"].dtype, np.int8)
+
+        # check that the summary workbook is the same
+        pd.testing.assert_frame_equal(
+            pd.read_excel(f"{self.output_dir}test_{output_format}.xlsx", "Data"),
+            pd.read_excel(f"{self.output_dir}test_csv.xlsx", "Data"),
+        )
+
+    def test_npy(self):
+        self.check_format("npy")
+        # check that the columns are memory-mapped
+        df = load_output(self.output_dir, "test_npy", "npy")
+        self.assertIsInstance(df["Emissions"].values.base, np.memmap)
+
+    def test_resume_csv(self):
+        self.check_resume("csv")
+
+    def test_resume_npy(self):
+        self.check_resume("npy")
+
+    @unittest.skipIf(
+        importlib.util.find_spec("pyarrow") is None, "pyarrow is not installed"
+    )
+    def test_parquet(self):
+        self.check_format("parquet")
+
+    @unittest.skipIf(
+        importlib.util.find_spec("pyarrow") is None, "pyarrow is not installed"
+    )
+    def test_feather(self):
+        self.check_format("feather")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            get_output_writer("xls")
+
+
+if __name__ == "__main__":
+    unittest.main()
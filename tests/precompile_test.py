@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+from pyetbd.precompile import get_precompile_warmups
+
+
+class TestPrecompile(unittest.TestCase):
+    def test_precompile_warmups(self):
+        warmups = get_precompile_warmups()
+        # 16 python engine strategy combinations plus the compiled engine
+        self.assertEqual(len(warmups), 17)
+        self.assertEqual(warmups[-1][0].engine, "compiled")
+
+        # check that every phenotype is reinforced and punished so every rule runs
+        for settings, [arrangement] in warmups:
+            reinforcement_schedule, punishment_schedule = arrangement
+            self.assertEqual(
+                reinforcement_schedule.settings.selection_type, settings.selection_type
+            )
+            self.assertTrue(reinforcement_schedule.settings.is_reinforcement_schedule)
+            self.assertFalse(punishment_schedule.settings.is_reinforcement_schedule)
+            np.testing.assert_array_equal(
+                np.sort(reinforcement_schedule.response_class),
+                np.arange(settings.high_pheno + 1),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
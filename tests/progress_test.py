@@ -0,0 +1,102 @@
+import io
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pyetbd.experiment import Experiment
+from pyetbd.schedules import RandomIntervalSchedule
+from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
+from pyetbd.utils.progress import ProgressCounters, ProgressMonitor, format_duration
+
+
+def set_counter(counters: ProgressCounters, slot: int, gen: int) -> None:
+    counters.gens[slot] = gen
+    counters.close()
+
+
+class TerminalStream(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestProgress(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.monitor = ProgressMonitor(
+            [("exp1", 2, 100), ("exp2", 3, 100)], stream=self.stream
+        )
+
+    def tearDown(self):
+        if self.monitor.counters.gens is not None:
+            self.monitor.counters.close()
+
+    def test_counters_shared_with_worker(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(set_counter, self.monitor.counters, 3, 42).result()
+
+        self.assertEqual(self.monitor.counters.gens[3], 42)
+        np.testing.assert_array_equal(self.monitor.get_done(), [0, 42])
+
+    def test_get_status(self):
+        self.monitor.get_status(now=0.0)
+        self.monitor.counters.gens[:2] = [100, 50]
+        status = self.monitor.get_status(now=1.0)
+
+        # only the running experiment is shown, then all of them together
+        self.assertEqual(
+            status,
+            "exp1: 75.0% 150 gens/s ETA 0:00:00 | All (0/2 done): 30.0% 150 gens/s ETA 0:00:02",
+        )
+        self.assertEqual(format_duration(3723), "1:02:03")
+        self.assertEqual(format_duration(np.inf), "--:--")
+
+    def test_render_log_lines(self):
+        # a stream that isn't a terminal gets plain log lines
+        self.monitor.render()
+        self.monitor.write("Saving data...")
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("All (0/2 done): 0.0%", lines[0])
+        self.assertNotIn("\033", self.stream.getvalue())
+        self.assertEqual(lines[1], "Saving data...")
+
+    def test_render_status_line(self):
+        stream = TerminalStream()
+        monitor = ProgressMonitor([("exp1", 1, 100)], stream=stream)
+        monitor.render()
+        monitor.write("Saving data...")
+        monitor.render()
+        monitor.stop()
+
+        # the status line is rewritten in place and cleared before a message
+        self.assertEqual(
+            stream.getvalue(),
+            "\r\033[Kexp1: 0.0% 0 gens/s ETA --:--"
+            "\r\033[KSaving data...\n"
+            "\r\033[Kexp1: 0.0% 0 gens/s ETA --:--"
+            "\r\033[Kexp1: 0.0% 0 gens/s ETA --:--\n",
+        )
+
+    def test_experiment_progress(self):
+        settings = ExperimentSettings(file_stub="test", reps=2, gens=50)
+        schedule_arrangements = [
+            [RandomIntervalSchedule(ScheduleSettings(mean=20))] for _ in range(2)
+        ]
+        experiment = Experiment(
+            settings, schedule_arrangements, True, tempfile.mkdtemp() + "/"
+        )
+        monitor = ProgressMonitor([experiment.get_progress_task()], stream=self.stream)
+        experiment.set_progress(monitor.counters, 0, monitor)
+        experiment.data_saver.add_schedule_outputs(1)
+
+        # check that the workers count the generations of every block
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            experiment._run_parallel(executor)
+        np.testing.assert_array_equal(monitor.counters.gens, [50] * 4)
+
+        monitor.stop()
+        self.assertIn("test: 100.0%", self.stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
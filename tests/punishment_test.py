@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from pyetbd.experiment_runner import load_experiment
+from pyetbd.rules import fdfs
+from pyetbd.rules.punishment import BOUND_RLA_PUNISHMENTS, rla_punishment
+
+
+class TestPunishment(unittest.TestCase):
+    def test_rla_punishment(self):
+        # the punished behavior is always replaced
+        population = np.full(100, 500)
+        replaced = rla_punishment(
+            population, 500, 10, fdfs.sample_linear_fdf, True, 0, 1023
+        )
+        self.assertEqual(replaced, 100)
+        self.assertTrue(np.all((population >= 0) & (population < 1023)))
+
+        # behaviors further than the largest draw of the linear FDF (3 * mean) are left alone
+        population = np.full(100, 100)
+        replaced = rla_punishment(
+            population, 500, 10, fdfs.sample_linear_fdf, True, 0, 1023
+        )
+        self.assertEqual(replaced, 0)
+        np.testing.assert_array_equal(population, 100)
+
+    def test_circular_distance(self):
+        punish = BOUND_RLA_PUNISHMENTS[fdfs.sample_linear_fdf]
+        # 1020 is 8 away from 5 on the circular landscape and 1015 away on the linear one
+        circular_replaced = 0
+        linear_replaced = 0
+        for _ in range(100):
+            circular_replaced += punish(np.full(100, 1020), 5, 10, True, 0, 1023)
+            linear_replaced += punish(np.full(100, 1020), 5, 10, False, 0, 1023)
+
+        self.assertGreater(circular_replaced, 0)
+        self.assertEqual(linear_replaced, 0)
+
+    def test_punishment_suppresses_behavior(self):
+        # concurrent equal reinforcement schedules with punishment for the first response class
+        schedules = [
+            {"mean": 20},
+            {
+                "mean": 20,
+                "response_class_lower_bound": 512,
+                "response_class_upper_bound": 553,
+            },
+            {"mean": 5, "is_reinforcement_schedule": False},
+        ]
+        for engine in ["python", "compiled"]:
+            exp = {
+                "file_stub": "punishment",
+                "reps": 2,
+                "gens": 3000,
+                "bin_width": 3000,
+                "seed": 1234,
+                "summary_only": True,
+                "engine": engine,
+                "schedules": [schedules],
+            }
+            summary = load_experiment(exp).run_summary()
+
+            self.assertTrue((summary["P3"] > 0).all())
+            self.assertTrue((summary["B1"] * 3 < summary["B2"]).all(), engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
 import unittest
 import numpy as np
-from pyetbd.rules.recombination import recombine_parents, bitwise_combine
+from pyetbd.rules.recombination import (
+    recombine_parents,
+    bitwise_combine,
+    bitwise_integer_recombine,
+)
+from pyetbd.utils import binary_converter
 import logging
 
 # Create a custom logger
@@ -50,6 +55,33 @@ class TestRecombination(unittest.TestCase):
 
         np.testing.assert_array_equal(actual_children_genos, expected_children_genos)
 
+    def test_bitwise_integer_recombine(self):
+        parents = np.array([[4, 4], [981, 981]], dtype=np.int64)
+        bin_length = 10
+
+        expected_children = np.array([4, 981], dtype=np.int64)
+        actual_children = bitwise_integer_recombine(parents, bin_length)
+
+        np.testing.assert_array_equal(actual_children, expected_children)
+
+    def test_bitwise_integer_recombine_matches_bitwise(self):
+        parents = np.array([[0b1010101010, 0b0011001100]] * 10000, dtype=np.int64)
+        bin_length = 10
+
+        binary_children = binary_converter.convert_binary_to_decimal(
+            recombine_parents(parents, bin_length, bitwise_combine)
+        )
+        integer_children = bitwise_integer_recombine(parents, bin_length)
+
+        # check that each bit of the children is set with the same frequency
+        for bit in range(bin_length):
+            binary_frequency = np.mean((binary_children >> bit) & 1)
+            integer_frequency = np.mean((integer_children >> bit) & 1)
+            logger.debug(
+                f"Bit {bit}: bitwise {binary_frequency}, bitwise_integer {integer_frequency}"
+            )
+            self.assertAlmostEqual(binary_frequency, integer_frequency, delta=0.03)
+
 
 if __name__ == "__main__":
     unittest.main()
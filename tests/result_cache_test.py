@@ -0,0 +1,110 @@
+import os
+import time
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+from pyetbd.data_saver import create_block
+from pyetbd.experiment import Experiment
+from pyetbd.result_cache import ResultCache
+from pyetbd.schedules import RandomIntervalSchedule
+from pyetbd.settings_classes import ExperimentSettings, ScheduleSettings
+from pyetbd.utils import random_streams
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp() + "/"
+        self.cache = ResultCache(tempfile.mkdtemp())
+        self.settings = ExperimentSettings(
+            file_stub="test", reps=2, gens=200, seed=1234, reinitialize_population=False
+        )
+
+    def tearDown(self):
+        random_streams.seed_stream(np.random.SeedSequence().entropy)
+
+    def create_arrangements(self, means):
+        return [
+            [
+                RandomIntervalSchedule(ScheduleSettings(mean=mean)),
+                RandomIntervalSchedule(
+                    ScheduleSettings(
+                        mean=120,
+                        response_class_lower_bound=512,
+                        response_class_upper_bound=553,
+                    )
+                ),
+            ]
+            for mean in means
+        ]
+
+    def run_experiment(self, means, result_cache):
+        # the response classes are drawn from the seeded stream, as they are when an input file is loaded
+        random_streams.seed_stream(1234)
+        experiment = Experiment(
+            self.settings,
+            self.create_arrangements(means),
+            False,
+            self.output_dir,
+            result_cache,
+        )
+        experiment.run()
+        return pd.read_csv(f"{self.output_dir}test.csv", index_col=0)
+
+    def test_put_get(self):
+        block = create_block(10, 2)
+        block[0][:] = 7
+        population = np.arange(100)
+        self.assertIsNone(self.cache.get("key"))
+
+        self.cache.put("key", block, population)
+        cached_block, cached_population = self.cache.get("key")
+        for cached_array, array in zip(cached_block, block):
+            np.testing.assert_array_equal(cached_array, array)
+            self.assertEqual(cached_array.dtype, array.dtype)
+        np.testing.assert_array_equal(cached_population, population)
+
+    def test_evict_least_recently_used(self):
+        for key in ["a", "b", "c"]:
+            self.cache.put(key, create_block(1000, 2), np.arange(100))
+            time.sleep(0.01)
+        entry_size = os.path.getsize(self.cache.get_path("a"))
+
+        # reading "a" makes "b" the least recently used entry
+        time.sleep(0.01)
+        self.cache.get("a")
+        self.cache.max_bytes = 2 * entry_size
+        self.cache.evict()
+
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_reuse_arrangements(self):
+        expected_output = self.run_experiment([20, 30, 40], None)
+        pd.testing.assert_frame_equal(
+            self.run_experiment([20, 30, 40], self.cache), expected_output
+        )
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 6)
+
+        # check that a cached run gives the same output
+        pd.testing.assert_frame_equal(
+            self.run_experiment([20, 30, 40], self.cache), expected_output
+        )
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 6)
+
+        # the population carries over, so editing the second arrangement reruns it and the arrangement after it
+        edited_output = self.run_experiment([20, 5, 40], self.cache)
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 10)
+        pd.testing.assert_frame_equal(
+            edited_output, self.run_experiment([20, 5, 40], None)
+        )
+
+        # check that unseeded runs aren't cached
+        self.settings.seed = None
+        self.run_experiment([50, 60, 70], self.cache)
+        self.assertEqual(len(os.listdir(self.cache.cache_dir)), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,16 @@
+import copy
 import unittest
+import numpy as np
+from pyetbd.compiled_arrangement import CompiledSchedules
 from pyetbd.settings_classes import ScheduleSettings
 from pyetbd.schedules import (
     FixedIntervalSchedule,
     FixedRatioSchedule,
     RandomIntervalSchedule,
     RandomRatioSchedule,
+    build_response_class_table,
 )
+from pyetbd.utils import random_streams
 
 
 class TestSchedules(unittest.TestCase):
@@ -92,6 +97,87 @@ class TestSchedules(unittest.TestCase):
             self.assertFalse(reinforced)
             self.assertTrue(schedule.count == 0)
 
+    def test_build_response_class_table(self):
+        arrangement = [
+            FixedIntervalSchedule(self.schedule_data),
+            FixedIntervalSchedule(
+                ScheduleSettings(
+                    mean=5,
+                    response_class_lower_bound=500,
+                    response_class_upper_bound=541,
+                )
+            ),
+        ]
+        table = build_response_class_table(arrangement, 1024)
+
+        for emitted in range(1024):
+            for i, schedule in enumerate(arrangement):
+                self.assertEqual(
+                    bool(table[emitted] >> i & 1), emitted in schedule.response_class
+                )
+
+        # check that bound schedules give the same membership as the response class scan
+        for i, schedule in enumerate(arrangement):
+            schedule.bind_response_class_table(table, i)
+            for emitted in [0, 470, 471, 499, 500, 511, 512, 540, 541, 1023]:
+                self.assertEqual(
+                    schedule.in_response_class(emitted),
+                    emitted in schedule.response_class,
+                )
+
+    def test_compiled_schedules_agree(self):
+        # Schedule.run and rules.generation.run_schedules implement the same state
+        # machine; they must stay in step for the python engine's checkpoints
+        random_streams.seed_stream(1234)
+        arrangement = [
+            FixedIntervalSchedule(self.schedule_data),
+            FixedRatioSchedule(ScheduleSettings(mean=3)),
+            RandomIntervalSchedule(
+                ScheduleSettings(
+                    mean=8,
+                    response_class_lower_bound=500,
+                    response_class_upper_bound=541,
+                )
+            ),
+            RandomRatioSchedule(
+                ScheduleSettings(
+                    mean=4,
+                    response_class_lower_bound=490,
+                    response_class_upper_bound=531,
+                    is_reinforcement_schedule=False,
+                )
+            ),
+        ]
+        compiled = CompiledSchedules(copy.deepcopy(arrangement))
+        table = build_response_class_table(arrangement, 1024)
+        behaviors = np.random.default_rng(1234).integers(450, 560, size=2000)
+
+        random_streams.seed_stream(1234, 1)
+        expected = [
+            [schedule.run(int(emitted)) for schedule in arrangement]
+            for emitted in behaviors
+        ]
+
+        random_streams.seed_stream(1234, 1)
+        for emitted, flags in zip(behaviors, expected):
+            reinforced, punished = compiled.run(int(table[emitted]))
+            delivered = reinforced | punished
+            self.assertEqual(
+                [bool(delivered >> i & 1) for i in range(len(arrangement))], flags
+            )
+            self.assertEqual(reinforced & punished, 0)
+            self.assertEqual(punished & ~(1 << 3), 0)
+
+        compiled.store()
+        for schedule, compiled_schedule in zip(arrangement, compiled.arrangement):
+            self.assertEqual(schedule.count, compiled_schedule.count)
+            self.assertEqual(
+                schedule.current_count_requirement,
+                compiled_schedule.current_count_requirement,
+            )
+        # both paths delivered a meaningful number of consequences
+        self.assertTrue(all(sum(column) > 10 for column in zip(*expected)))
+
 
 if __name__ == "__main__":
     unittest.main()
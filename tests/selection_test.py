@@ -1,9 +1,17 @@
 import unittest
 import numpy as np
 import logging
-from pyetbd.rules.selection import fitness_search_selection, randomly_select_parents
+from pyetbd.rules.selection import (
+    fitness_search_selection,
+    counted_fitness_search_selection,
+    randomly_select_parents,
+    build_fitness_index,
+    build_alias_table,
+    fitness_exact_selection,
+)
 from pyetbd.rules.fitness_calculation import get_circular_fitness_values
-from pyetbd.rules.fdfs import sample_linear_fdf
+from pyetbd.rules.fdfs import sample_linear_fdf, linear_fdf_pmf
+from pyetbd.utils import random_streams
 
 # set up logging
 logger = logging.getLogger(__name__)
@@ -44,6 +52,90 @@ class TestSelection(unittest.TestCase):
             self.assertIn(parents[i][0], expected_possible_parents)
             self.assertIn(parents[i][1], expected_possible_parents)
 
+    def test_counted_fitness_search_selection(self):
+        # the jitted rules have their own random state, which seed_stream seeds too
+        random_streams.seed_stream(1234)
+        expected_parents = fitness_search_selection(
+            self.population, self.fitness_values, self.fdf_mean, self.sample_func
+        )
+
+        # check that counting the draws doesn't change the selection
+        random_streams.seed_stream(1234)
+        parents, draws = counted_fitness_search_selection(
+            self.population, self.fitness_values, self.fdf_mean, self.sample_func
+        )
+        np.testing.assert_array_equal(parents, expected_parents)
+
+        # every parent takes at least one draw, and draws that match no member are counted too
+        self.assertGreaterEqual(draws, 2 * len(self.population))
+
+        # reseed from fresh entropy for the other tests
+        random_streams.seed_stream(np.random.SeedSequence().entropy)
+
+    def test_fitness_exact_selection(self):
+        parents = fitness_exact_selection(
+            self.population, self.fitness_values, self.fdf_mean, linear_fdf_pmf
+        )
+
+        self.assertEqual(parents.shape, (len(self.population), 2))
+
+        expected_possible_parents = np.array([1, 2, 5, 10, 20])
+        for i in range(len(parents)):
+            self.assertIn(parents[i][0], expected_possible_parents)
+            self.assertIn(parents[i][1], expected_possible_parents)
+
+    def test_fitness_exact_selection_matches_search(self):
+        population = np.arange(0, 60, 3)
+        fitness_values = get_circular_fitness_values(population, 0, 1023)
+        fdf_mean = 10.0
+
+        search_parents = np.concatenate(
+            [
+                fitness_search_selection(
+                    population, fitness_values, fdf_mean, sample_linear_fdf
+                ).ravel()
+                for _ in range(3000)
+            ]
+        )
+        exact_parents = np.concatenate(
+            [
+                fitness_exact_selection(
+                    population, fitness_values, fdf_mean, linear_fdf_pmf
+                ).ravel()
+                for _ in range(3000)
+            ]
+        )
+
+        # check that each member is selected with the same frequency by both methods
+        for member in population:
+            search_frequency = np.mean(search_parents == member)
+            exact_frequency = np.mean(exact_parents == member)
+            logger.debug(
+                f"Member {member}: search {search_frequency}, exact {exact_frequency}"
+            )
+            self.assertAlmostEqual(search_frequency, exact_frequency, delta=0.01)
+
+    def test_build_alias_table(self):
+        weights = np.array([0.1, 0.0, 0.4, 0.2, 0.3])
+        probabilities, aliases = build_alias_table(weights)
+
+        # check that the table gives each index its share of the weight
+        shares = probabilities / len(weights)
+        for column in range(len(weights)):
+            shares[aliases[column]] += (1 - probabilities[column]) / len(weights)
+        np.testing.assert_allclose(shares, weights / weights.sum())
+
+    def test_build_fitness_index(self):
+        bucket_starts, bucket_members = build_fitness_index(self.fitness_values)
+
+        self.assertEqual(len(bucket_starts), max(self.fitness_values) + 2)
+        # check that each bucket holds the members with that fitness value in ascending order
+        for fitness in range(max(self.fitness_values) + 1):
+            bucket = bucket_members[bucket_starts[fitness] : bucket_starts[fitness + 1]]
+            np.testing.assert_array_equal(
+                bucket, np.where(self.fitness_values == fitness)[0]
+            )
+
     def test_randomly_select_parents(self):
         parents = randomly_select_parents(self.population)
         self.assertEqual(parents.shape, (len(self.population), 2))
@@ -0,0 +1,127 @@
+import json
+import unittest
+import tempfile
+import pandas as pd
+from pyetbd.experiment_runner import load_experiment
+from pyetbd.sweep import (
+    Sweep,
+    SweepRunner,
+    expand_values,
+    load_sweep,
+    run_sweep_point,
+    set_parameter,
+)
+from pyetbd.utils import random_streams
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp() + "/"
+        self.spec = {
+            "name": "test",
+            "base": {
+                "reps": 2,
+                "gens": 30,
+                "bin_width": 10,
+                "seed": 1234,
+                "schedules": [[{"mean": 5}, {"mean": 10}]],
+            },
+            "product": {
+                "fdf_mean": [50, 100],
+                "pop_size": {"start": 20, "stop": 60, "step": 20},
+            },
+            "zip": {"schedules.0.0.mean": [5, 6], "schedules.0.1.mean": [10, 12]},
+        }
+
+    def test_expand_values(self):
+        self.assertEqual(expand_values([1, 3]), [1, 3])
+        self.assertEqual(expand_values({"start": 0, "stop": 10, "step": 5}), [0, 5])
+        self.assertEqual(
+            expand_values({"start": 0.1, "stop": 0.4, "step": 0.1}), [0.1, 0.2, 0.3]
+        )
+        self.assertEqual(
+            expand_values({"start": 0, "stop": 1, "num": 5}), [0, 0.25, 0.5, 0.75, 1]
+        )
+        with self.assertRaises(ValueError):
+            expand_values({"start": 0, "stop": 1})
+
+    def test_set_parameter(self):
+        exp = {"fdf_mean": 50, "schedules": [[{"mean": 5}, {}]]}
+        set_parameter(exp, "fdf_mean", 100)
+        set_parameter(exp, "schedules.0.1.mean", 20)
+        self.assertEqual(
+            exp, {"fdf_mean": 100, "schedules": [[{"mean": 5}, {"mean": 20}]]}
+        )
+
+        with self.assertRaises(ValueError):
+            set_parameter(exp, "schedules.1.0.mean", 20)
+
+    def test_points(self):
+        sweep = Sweep(self.spec)
+        points = list(sweep)
+        self.assertEqual(len(sweep), 8)
+        self.assertEqual(len(points), 8)
+        self.assertEqual(
+            points[1],
+            (
+                1,
+                {
+                    "fdf_mean": 50,
+                    "pop_size": 20,
+                    "schedules.0.0.mean": 6,
+                    "schedules.0.1.mean": 12,
+                },
+            ),
+        )
+
+        exp = sweep.get_experiment(*points[1])
+        self.assertEqual(exp["file_stub"], "test_1")
+        self.assertEqual(exp["schedules"], [[{"mean": 6}, {"mean": 12}]])
+        self.assertTrue(exp["summary_only"])
+        # check that the base experiment is left alone
+        self.assertEqual(self.spec["base"]["schedules"], [[{"mean": 5}, {"mean": 10}]])
+
+        self.spec["zip"]["schedules.0.1.mean"] = [10]
+        with self.assertRaises(ValueError):
+            Sweep(self.spec)
+
+    def test_run_sweep(self):
+        del self.spec["zip"]
+        input_file = f"{self.output_dir}sweep.json"
+        with open(input_file, "w") as f:
+            json.dump({"sweeps": [self.spec]}, f)
+
+        SweepRunner(input_file, self.output_dir, False).giddyup()
+        results = load_sweep(self.output_dir, "test")
+
+        self.assertEqual(
+            results.index.names, ["fdf_mean", "pop_size", "Rep", "Sch", "Bin"]
+        )
+        # 4 points of 2 reps with 3 bins each
+        self.assertEqual(len(results), 4 * 2 * 3)
+        self.assertTrue((results["B1"] <= 10).all())
+
+        # check that a point gives the same bins when it is run on its own
+        sweep = Sweep(self.spec)
+        index, point = list(sweep)[3]
+        experiment = load_experiment(sweep.get_experiment(index, point))
+        self.assertEqual(experiment.organism.pop_size, point["pop_size"])
+        summary = experiment.run_summary()
+        point_results = results.loc[(point["fdf_mean"], point["pop_size"])]
+        pd.testing.assert_series_equal(
+            point_results["B1"].reset_index(drop=True), summary["B1"], check_names=False
+        )
+
+    def test_unseeded_point_streams(self):
+        del self.spec["base"]["seed"]
+        exp = Sweep(self.spec).get_experiment(*next(iter(Sweep(self.spec))))
+        entropy = random_streams.get_entropy()
+
+        # the points of a parallel sweep get their own streams instead of the state the workers start with
+        summary = run_sweep_point(exp, entropy, 0)
+        pd.testing.assert_frame_equal(run_sweep_point(exp, entropy, 0), summary)
+        self.assertFalse(run_sweep_point(exp, entropy, 1).equals(summary))
+
+
+if __name__ == "__main__":
+    unittest.main()